@@ -0,0 +1,355 @@
+"""
+Calendario Laboral
+
+Este módulo traduce horas de trabajo acumuladas de un recurso a fechas
+reales según su HorarioTrabajo: días laborables de la semana, jornada y
+descanso, y a la inversa cuenta las horas laborables de cualquier rango
+de fechas. Cada horario distinto se compila una sola vez en un patrón
+semanal de horas acumuladas, y las fechas de inicio y fin de miles de
+asignaciones se obtienen con una búsqueda binaria vectorizada
+(np.searchsorted) en lugar de aritmética de fechas por asignación.
+
+Los feriados globales y las ausencias de cada recurso se guardan como
+intervalos no laborables ordenados y fusionados, con las horas perdidas
+acumuladas; descontarlos en una consulta cuesta una búsqueda binaria,
+O(log n) en la cantidad de intervalos.
+
+Lo usan la distribución de recursos, el optimizador y el cálculo de
+capacidad, de modo que todos calculan las mismas horas y fechas para la
+misma carga.
+
+Autor: Equipo de Desarrollo
+Fecha: 2025-07-07
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+import numpy as np
+
+from domain.models.recurso import Recurso, HorarioTrabajo
+
+
+# Horario de los recursos sin horario propio: 8 horas diarias de lunes a
+# viernes, coherente con Recurso.horas_disponibles_dia y horas_disponibles_semana
+HORARIO_POR_DEFECTO = HorarioTrabajo(
+    hora_inicio=time(8, 0),
+    hora_fin=time(16, 0),
+    dias_semana={0, 1, 2, 3, 4},
+    horas_descanso=0.0
+)
+
+_SEGUNDOS_DIA = 86400
+_SEGUNDOS_SEMANA = 7 * _SEGUNDOS_DIA
+
+
+@dataclass
+class PatronSemanal:
+    """
+    Tramos laborables de una semana tipo, desde el lunes a las 00:00.
+
+    Attributes:
+        inicios: Segundo de la semana en que empieza cada tramo (n_tramos,)
+        acumuladas_inicio: Horas trabajadas en la semana al empezar cada tramo (n_tramos,)
+        acumuladas_fin: Horas trabajadas en la semana al terminar cada tramo (n_tramos,)
+        horas_semana: Horas laborables de la semana
+    """
+    inicios: np.ndarray
+    acumuladas_inicio: np.ndarray
+    acumuladas_fin: np.ndarray
+    horas_semana: float
+
+    def horas_hasta(self, segundos: np.ndarray) -> np.ndarray:
+        """
+        Horas trabajadas desde un lunes a las 00:00 hasta cada segundo dado.
+
+        Los segundos pueden abarcar varias semanas o ser negativos; las
+        fechas repetidas se evalúan una sola vez.
+        """
+        valores, inversa = np.unique(np.asarray(segundos, dtype=float), return_inverse=True)
+        semanas = np.floor(valores / _SEGUNDOS_SEMANA)
+        resto = valores - semanas * _SEGUNDOS_SEMANA
+        longitudes = (self.acumuladas_fin - self.acumuladas_inicio) * 3600
+        en_semana = np.clip(resto[:, None] - self.inicios, 0, longitudes).sum(axis=1) / 3600
+        return (semanas * self.horas_semana + en_semana)[inversa.ravel()].reshape(np.shape(segundos))
+
+
+def compilar_horario(horario: HorarioTrabajo) -> PatronSemanal:
+    """
+    Compila un horario en su patrón semanal de horas acumuladas.
+
+    El descanso se toma a mitad de la jornada, de modo que cada día
+    laborable aporta hasta dos tramos.
+
+    Args:
+        horario: Horario de trabajo
+
+    Returns:
+        PatronSemanal: Patrón con los tramos en orden cronológico
+    """
+    inicio = horario.hora_inicio.hour * 3600 + horario.hora_inicio.minute * 60 + horario.hora_inicio.second
+    fin = horario.hora_fin.hour * 3600 + horario.hora_fin.minute * 60 + horario.hora_fin.second
+    jornada = max(0, fin - inicio)
+    descanso = min(max(0.0, horario.horas_descanso) * 3600, jornada)
+    medio = inicio + jornada / 2
+
+    tramos_dia = [(inicio, medio - descanso / 2), (medio + descanso / 2, fin)]
+    tramos = [(dia * _SEGUNDOS_DIA + a, dia * _SEGUNDOS_DIA + b)
+              for dia in sorted(horario.dias_semana)
+              for a, b in tramos_dia if b > a]
+
+    inicios = np.array([a for a, _ in tramos], dtype=float)
+    longitudes = np.array([(b - a) / 3600 for a, b in tramos], dtype=float)
+    acumuladas_fin = np.cumsum(longitudes)
+
+    return PatronSemanal(
+        inicios=inicios,
+        acumuladas_inicio=acumuladas_fin - longitudes,
+        acumuladas_fin=acumuladas_fin,
+        horas_semana=float(acumuladas_fin[-1]) if tramos else 0.0
+    )
+
+
+@dataclass
+class _PerfilLaboral:
+    """
+    Patrón semanal de un recurso con sus intervalos no laborables.
+
+    Las horas "efectivas" son las del patrón menos las que caen en los
+    intervalos no laborables, contadas desde el lunes inicial.
+
+    Attributes:
+        patron: Patrón semanal del horario
+        inicios: Segundo, desde el lunes inicial, en que empieza cada intervalo (n_intervalos,)
+        fines: Segundo en que termina cada intervalo (n_intervalos,)
+        efectivas_inicio: Horas efectivas al empezar cada intervalo (n_intervalos,)
+        perdidas_acumuladas: Horas del patrón perdidas hasta el fin de cada intervalo (n_intervalos,)
+        horas_previas: Horas efectivas hasta fecha_inicio
+    """
+    patron: PatronSemanal
+    inicios: np.ndarray
+    fines: np.ndarray
+    efectivas_inicio: np.ndarray
+    perdidas_acumuladas: np.ndarray
+    horas_previas: float = 0.0
+
+    def horas_efectivas(self, segundos: np.ndarray) -> np.ndarray:
+        """Horas efectivas desde el lunes inicial hasta cada segundo."""
+        horas = self.patron.horas_hasta(segundos)
+        if self.inicios.shape[0] == 0:
+            return horas
+
+        # Intervalos ya terminados y, si el segundo cae dentro de uno, el efectivo se queda en su inicio
+        k = np.searchsorted(self.fines, segundos, side='right')
+        perdidas = np.concatenate(([0.0], self.perdidas_acumuladas))[k]
+        siguiente = np.minimum(k, self.inicios.shape[0] - 1)
+        dentro = (k < self.inicios.shape[0]) & (self.inicios[siguiente] < segundos)
+        return np.where(dentro, self.efectivas_inicio[siguiente], horas - perdidas)
+
+    def horas_patron(self, efectivas: np.ndarray, es_inicio: bool) -> np.ndarray:
+        """
+        Convierte horas efectivas en horas del patrón, saltando los intervalos no laborables.
+
+        Un inicio que cae al comienzo de un intervalo se mueve a su final;
+        un fin se queda antes del intervalo.
+        """
+        if self.inicios.shape[0] == 0:
+            return efectivas
+        k = np.searchsorted(self.efectivas_inicio, efectivas, side='right' if es_inicio else 'left')
+        return efectivas + np.concatenate(([0.0], self.perdidas_acumuladas))[k]
+
+
+def _compilar_perfil(patron: PatronSemanal,
+                     intervalos: List[Tuple[float, float]],
+                     segundo_inicio: float) -> _PerfilLaboral:
+    """
+    Fusiona los intervalos no laborables y acumula las horas que quitan al patrón.
+
+    Args:
+        patron: Patrón semanal del horario
+        intervalos: Intervalos no laborables en segundos desde el lunes inicial
+        segundo_inicio: Segundo de fecha_inicio desde el lunes inicial
+
+    Returns:
+        _PerfilLaboral: Perfil con los intervalos ordenados y sin solapes
+    """
+    fusionados: List[List[float]] = []
+    for a, b in sorted(intervalo for intervalo in intervalos if intervalo[1] > intervalo[0]):
+        if fusionados and a <= fusionados[-1][1]:
+            fusionados[-1][1] = max(fusionados[-1][1], b)
+        else:
+            fusionados.append([a, b])
+
+    inicios = np.array([a for a, _ in fusionados], dtype=float)
+    fines = np.array([b for _, b in fusionados], dtype=float)
+    perdidas = patron.horas_hasta(fines) - patron.horas_hasta(inicios)
+    perdidas_acumuladas = np.cumsum(perdidas)
+
+    perfil = _PerfilLaboral(
+        patron=patron,
+        inicios=inicios,
+        fines=fines,
+        efectivas_inicio=patron.horas_hasta(inicios) - (perdidas_acumuladas - perdidas),
+        perdidas_acumuladas=perdidas_acumuladas
+    )
+    perfil.horas_previas = float(perfil.horas_efectivas(np.array([segundo_inicio]))[0])
+    return perfil
+
+
+class CalendarioLaboral:
+    """
+    Línea de tiempo laborable de un conjunto de recursos a partir de una fecha.
+
+    La hora de trabajo h de un recurso es la hora laborable número h
+    contada desde fecha_inicio en su horario, sin contar los feriados ni
+    sus ausencias. Los recursos con el mismo horario y sin ausencias
+    propias comparten perfil y se resuelven en una sola búsqueda.
+    """
+
+    def __init__(self,
+                 recursos: List[Recurso],
+                 fecha_inicio: datetime,
+                 feriados: Optional[Sequence[date]] = None,
+                 ausencias: Optional[Dict[str, Sequence[Tuple[datetime, datetime]]]] = None):
+        """
+        Compila el horario y los intervalos no laborables de cada recurso.
+
+        Args:
+            recursos: Lista de recursos
+            fecha_inicio: Momento desde el que se cuentan las horas de trabajo
+            feriados: Días no laborables para todos los recursos
+            ausencias: Intervalos (inicio, fin) no laborables de cada recurso, por ID
+        """
+        self._recursos = recursos
+        lunes = datetime.combine((fecha_inicio - timedelta(days=fecha_inicio.weekday())).date(), time())
+        self._lunes = np.datetime64(lunes, 'us')
+        segundo_inicio = (fecha_inicio - lunes).total_seconds()
+        ausencias = ausencias or {}
+
+        # Los feriados son días completos, comunes a todos los recursos
+        dias_feriados = sorted(set(f.date() if isinstance(f, datetime) else f for f in (feriados or [])))
+        intervalos_feriados = [((datetime.combine(f, time()) - lunes).total_seconds(),
+                                (datetime.combine(f, time()) - lunes).total_seconds() + _SEGUNDOS_DIA)
+                               for f in dias_feriados]
+
+        # Un perfil por horario distinto, salvo los recursos con ausencias propias
+        self._perfiles: List[_PerfilLaboral] = []
+        indice_perfil: Dict[Tuple, int] = {}
+        patrones: Dict[Tuple, PatronSemanal] = {}
+        perfil_de_recurso = []
+        for recurso in recursos:
+            horario = recurso.horario or HORARIO_POR_DEFECTO
+            clave_horario = (horario.hora_inicio, horario.hora_fin, frozenset(horario.dias_semana), horario.horas_descanso)
+            propias = tuple((inicio, fin) for inicio, fin in ausencias.get(recurso.id, ()))
+            clave = (clave_horario, propias)
+            if clave not in indice_perfil:
+                if clave_horario not in patrones:
+                    patrones[clave_horario] = compilar_horario(horario)
+                intervalos = intervalos_feriados + [((inicio - lunes).total_seconds(), (fin - lunes).total_seconds())
+                                                    for inicio, fin in propias]
+                indice_perfil[clave] = len(self._perfiles)
+                self._perfiles.append(_compilar_perfil(patrones[clave_horario], intervalos, segundo_inicio))
+            perfil_de_recurso.append(indice_perfil[clave])
+        self._perfil_de_recurso = np.array(perfil_de_recurso, dtype=int)
+
+    def fechas(self,
+               recursos: np.ndarray,
+               horas_inicio: np.ndarray,
+               horas_fin: np.ndarray) -> Tuple[List[datetime], List[datetime]]:
+        """
+        Calcula las fechas de inicio y fin de un lote de asignaciones.
+
+        Un inicio que cae al final de un tramo se mueve al comienzo del
+        siguiente; un fin que cae al comienzo de un tramo se queda al final
+        del anterior.
+
+        Args:
+            recursos: Índice del recurso de cada asignación
+            horas_inicio: Horas de trabajo del recurso antes de la asignación
+            horas_fin: Horas de trabajo del recurso al terminarla
+
+        Returns:
+            Tuple[List[datetime], List[datetime]]: Fechas de inicio y de fin
+
+        Raises:
+            ValueError: Si algún recurso no tiene horas laborables en su horario
+        """
+        recursos = np.asarray(recursos, dtype=int)
+        horas_inicio = np.asarray(horas_inicio, dtype=float)
+        horas_fin = np.asarray(horas_fin, dtype=float)
+        inicios = np.empty(recursos.shape[0], dtype='datetime64[us]')
+        fines = np.empty(recursos.shape[0], dtype='datetime64[us]')
+
+        perfiles = self._perfil_de_recurso[recursos]
+        for p in np.unique(perfiles):
+            perfil = self._perfiles[p]
+            seleccion = perfiles == p
+            if perfil.patron.horas_semana <= 0:
+                nombre = self._recursos[recursos[seleccion][0]].nombre
+                raise ValueError(f"El recurso {nombre} no tiene horas laborables en su horario")
+
+            inicio = perfil.horas_patron(perfil.horas_previas + horas_inicio[seleccion], True)
+            fin = perfil.horas_patron(perfil.horas_previas + horas_fin[seleccion], False)
+            inicios[seleccion] = self._ubicar(perfil.patron, inicio, True)
+            fines[seleccion] = self._ubicar(perfil.patron, fin, False)
+
+        fines = np.maximum(inicios, fines)
+        return inicios.tolist(), fines.tolist()
+
+    def horas_hasta(self, recursos: np.ndarray, fechas: np.ndarray) -> np.ndarray:
+        """
+        Calcula las horas de trabajo de cada recurso hasta cada fecha.
+
+        Es la inversa de fechas(): las horas laborables del recurso entre
+        fecha_inicio y la fecha dada, negativas si la fecha es anterior.
+        recursos y fechas se combinan con broadcasting.
+
+        Args:
+            recursos: Índice del recurso de cada consulta
+            fechas: Fecha de cada consulta (datetime64)
+
+        Returns:
+            np.ndarray: Horas de trabajo hasta cada fecha, con la forma combinada
+        """
+        recursos, fechas = np.broadcast_arrays(np.asarray(recursos, dtype=int),
+                                               np.asarray(fechas, dtype='datetime64[us]'))
+        segundos = (fechas - self._lunes) / np.timedelta64(1, 's')
+        horas = np.empty(recursos.shape, dtype=float)
+
+        perfiles = self._perfil_de_recurso[recursos]
+        for p in np.unique(perfiles):
+            perfil = self._perfiles[p]
+            seleccion = perfiles == p
+            horas[seleccion] = perfil.horas_efectivas(segundos[seleccion]) - perfil.horas_previas
+
+        return horas
+
+    def horas_disponibles(self, recursos: np.ndarray, desde: np.ndarray, hasta: np.ndarray) -> np.ndarray:
+        """
+        Calcula las horas laborables de cada recurso en un rango de fechas.
+
+        Args:
+            recursos: Índice del recurso de cada consulta
+            desde: Inicio de cada rango (datetime64)
+            hasta: Fin de cada rango (datetime64)
+
+        Returns:
+            np.ndarray: Horas laborables en cada rango, con la forma combinada
+        """
+        return np.maximum(self.horas_hasta(recursos, hasta) - self.horas_hasta(recursos, desde), 0.0)
+
+    def _ubicar(self, patron: PatronSemanal, horas: np.ndarray, es_inicio: bool) -> np.ndarray:
+        """Convierte horas del patrón acumuladas desde el lunes inicial en fechas."""
+        if es_inicio:
+            semanas = np.floor(horas / patron.horas_semana)
+            resto = horas - semanas * patron.horas_semana
+            tramos = np.searchsorted(patron.acumuladas_fin, resto, side='right')
+        else:
+            semanas = np.ceil(horas / patron.horas_semana) - 1
+            resto = horas - semanas * patron.horas_semana
+            tramos = np.searchsorted(patron.acumuladas_fin, resto, side='left')
+        tramos = np.minimum(tramos, patron.inicios.shape[0] - 1)
+
+        segundos = (semanas * _SEGUNDOS_SEMANA + patron.inicios[tramos] +
+                    (resto - patron.acumuladas_inicio[tramos]) * 3600)
+        return self._lunes + np.rint(segundos * 1e6).astype(np.int64).astype('timedelta64[us]')
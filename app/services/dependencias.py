@@ -0,0 +1,217 @@
+"""
+Grafo de Dependencias
+
+Este módulo compila Proceso.dependencias en un grafo dirigido acíclico
+sobre los índices de una lista de procesos. Sobre él calcula, en
+O(V+E), el orden topológico con detección de ciclos y la ruta crítica
+(inicio temprano, inicio tardío y holgura de cada proceso), y deja las
+listas de predecesores listas para que la distribución y el optimizador
+no inicien un proceso antes de que terminen los suyos.
+
+Las dependencias a procesos que no están en la lista (por ejemplo, ya
+completados) no restringen la planificación y se ignoran.
+
+Autor: Equipo de Desarrollo
+Fecha: 2025-07-07
+"""
+
+from typing import Dict, List, Optional, Sequence
+from dataclasses import dataclass
+import heapq
+import numpy as np
+
+from domain.models.proceso import Proceso
+
+
+@dataclass
+class GrafoDependencias:
+    """
+    Dependencias entre los procesos de una lista, por índice.
+
+    Attributes:
+        predecesores: Procesos que deben terminar antes de cada proceso
+        sucesores: Procesos que esperan a cada proceso
+        orden: Índices de los procesos en orden topológico
+    """
+    predecesores: List[List[int]]
+    sucesores: List[List[int]]
+    orden: List[int]
+
+    @property
+    def tiene_dependencias(self) -> bool:
+        """Si algún proceso depende de otro de la lista."""
+        return any(self.predecesores)
+
+
+@dataclass
+class RutaCritica:
+    """
+    Resultado del método de la ruta crítica sobre las duraciones.
+
+    Attributes:
+        inicio_temprano: Hora más temprana de inicio de cada proceso (n_procesos,)
+        inicio_tardio: Hora más tardía de inicio sin retrasar el total (n_procesos,)
+        holgura: Diferencia entre ambos inicios (n_procesos,)
+        duracion: Horas del camino más largo
+        ruta: Índices de los procesos del camino más largo, en orden
+    """
+    inicio_temprano: np.ndarray
+    inicio_tardio: np.ndarray
+    holgura: np.ndarray
+    duracion: float
+    ruta: List[int]
+
+
+def compilar_dependencias(procesos: List[Proceso]) -> GrafoDependencias:
+    """
+    Construye el grafo de dependencias y lo ordena topológicamente.
+
+    Args:
+        procesos: Lista de procesos
+
+    Returns:
+        GrafoDependencias: Grafo con los procesos en orden topológico
+
+    Raises:
+        ValueError: Si las dependencias forman un ciclo
+    """
+    posiciones: Dict[str, int] = {p.id: i for i, p in enumerate(procesos)}
+    predecesores: List[List[int]] = [[] for _ in procesos]
+    sucesores: List[List[int]] = [[] for _ in procesos]
+
+    for i, proceso in enumerate(procesos):
+        for dependencia in dict.fromkeys(proceso.dependencias):
+            k = posiciones.get(dependencia)
+            if k is not None:
+                predecesores[i].append(k)
+                sucesores[k].append(i)
+
+    grafo = GrafoDependencias(predecesores=predecesores, sucesores=sucesores, orden=[])
+    grafo.orden = ordenar_topologicamente(grafo, procesos=procesos)
+    return grafo
+
+
+def ordenar_topologicamente(grafo: GrafoDependencias,
+                            rango: Optional[Sequence[int]] = None,
+                            procesos: Optional[List[Proceso]] = None) -> List[int]:
+    """
+    Ordena los procesos de modo que cada uno quede después de sus predecesores.
+
+    Algoritmo de Kahn: entre los procesos listos se toma primero el de
+    menor rango, así el orden respeta la preferencia dada siempre que las
+    dependencias lo permitan.
+
+    Args:
+        grafo: Grafo de dependencias
+        rango: Preferencia de cada proceso, menor primero (por defecto, su índice)
+        procesos: Procesos del grafo, para nombrar los del ciclo en el error
+
+    Returns:
+        List[int]: Índices de los procesos en orden topológico
+
+    Raises:
+        ValueError: Si las dependencias forman un ciclo
+    """
+    n = len(grafo.predecesores)
+    rango = list(range(n)) if rango is None else list(rango)
+    pendientes = [len(p) for p in grafo.predecesores]
+
+    listos = [(rango[i], i) for i in range(n) if pendientes[i] == 0]
+    heapq.heapify(listos)
+    orden: List[int] = []
+
+    while listos:
+        _, i = heapq.heappop(listos)
+        orden.append(i)
+        for k in grafo.sucesores[i]:
+            pendientes[k] -= 1
+            if pendientes[k] == 0:
+                heapq.heappush(listos, (rango[k], k))
+
+    if len(orden) < n:
+        en_ciclo = [i for i in range(n) if pendientes[i] > 0]
+        nombres = [procesos[i].id if procesos else str(i) for i in en_ciclo[:10]]
+        raise ValueError(f"Las dependencias forman un ciclo; no pueden ordenarse los procesos: {', '.join(nombres)}"
+                         + (" ..." if len(en_ciclo) > 10 else ""))
+
+    return orden
+
+
+def sucesores_transitivos(grafo: GrafoDependencias, indices: Sequence[int]) -> List[int]:
+    """
+    Reúne los procesos que dependen, directa o indirectamente, de los dados.
+
+    Args:
+        grafo: Grafo de dependencias
+        indices: Procesos de partida
+
+    Returns:
+        List[int]: Índices de los sucesores alcanzables, sin los de partida
+            salvo que alguno dependa de otro
+    """
+    alcanzados = set()
+    frontera = list(indices)
+    while frontera:
+        for k in grafo.sucesores[frontera.pop()]:
+            if k not in alcanzados:
+                alcanzados.add(k)
+                frontera.append(k)
+    return sorted(alcanzados)
+
+
+def calcular_ruta_critica(grafo: GrafoDependencias, duraciones: np.ndarray) -> RutaCritica:
+    """
+    Calcula la ruta crítica sin considerar la disponibilidad de recursos.
+
+    Un paso hacia adelante en orden topológico da el inicio temprano de
+    cada proceso y uno hacia atrás el inicio tardío; los procesos sin
+    holgura forman la ruta crítica.
+
+    Args:
+        grafo: Grafo de dependencias
+        duraciones: Horas de cada proceso (n_procesos,)
+
+    Returns:
+        RutaCritica: Inicios, holguras y procesos del camino más largo
+    """
+    n = len(grafo.orden)
+    if n == 0:
+        vacio = np.empty(0)
+        return RutaCritica(inicio_temprano=vacio, inicio_tardio=vacio, holgura=vacio, duracion=0.0, ruta=[])
+
+    duracion = [float(d) for d in duraciones]
+    temprano = [0.0] * n
+    fin_temprano = [0.0] * n
+    for i in grafo.orden:
+        temprano[i] = max((fin_temprano[k] for k in grafo.predecesores[i]), default=0.0)
+        fin_temprano[i] = temprano[i] + duracion[i]
+
+    total = max(fin_temprano)
+    tardio = [0.0] * n
+    for i in reversed(grafo.orden):
+        tardio[i] = min((tardio[k] for k in grafo.sucesores[i]), default=total) - duracion[i]
+
+    inicio_temprano = np.array(temprano)
+    inicio_tardio = np.array(tardio)
+    holgura = np.maximum(inicio_tardio - inicio_temprano, 0.0)
+
+    # Reconstruir el camino desde el proceso que termina último, siguiendo predecesores sin holgura
+    tolerancia = 1e-9 * max(total, 1.0)
+    actual = int(np.argmax(fin_temprano))
+    ruta = [actual]
+    while grafo.predecesores[actual]:
+        anterior = next((k for k in grafo.predecesores[actual]
+                         if abs(fin_temprano[k] - temprano[actual]) <= tolerancia and holgura[k] <= tolerancia), None)
+        if anterior is None:
+            break
+        actual = anterior
+        ruta.append(actual)
+    ruta.reverse()
+
+    return RutaCritica(
+        inicio_temprano=inicio_temprano,
+        inicio_tardio=inicio_tardio,
+        holgura=holgura,
+        duracion=total,
+        ruta=ruta
+    )
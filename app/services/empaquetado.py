@@ -0,0 +1,180 @@
+"""
+Empaquetado de Procesos en Recursos
+
+Este módulo calcula cuántos procesos caben realmente en las horas de un
+conjunto de recursos empaquetando sus duraciones reales, en lugar de
+dividir las horas por una duración promedio, y respetando la
+compatibilidad de habilidades.
+
+Una relajación que junta las horas de todos los recursos da la cota
+superior: los procesos más cortos cuya suma cabe en ese total. Esos
+candidatos se empaquetan con First-Fit Decreasing, del más largo al más
+corto en el primer recurso compatible con horas suficientes, y el resto
+se intenta ubicar en los huecos que quedan. El empaquetado es factible,
+así que su cantidad de procesos es una cota inferior del máximo; si
+coincide con la cota superior, el resultado es exacto.
+
+Autor: Equipo de Desarrollo
+Fecha: 2025-07-07
+"""
+
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+import numpy as np
+
+from domain.models.proceso import Proceso
+from domain.models.recurso import Recurso
+from app.services.problema_compilado import ProcesosCompilados, compilar_procesos, indexar_habilidades
+
+
+@dataclass
+class EmpaquetadoProcesos:
+    """
+    Resultado de empaquetar procesos en las horas de los recursos.
+
+    Attributes:
+        recurso_de_proceso: Recurso asignado a cada proceso, -1 si no cabe (n_procesos,)
+        procesos_por_recurso: Procesos empaquetados en cada recurso (n_recursos,)
+        horas_por_recurso: Horas ocupadas de cada recurso (n_recursos,)
+        sin_recurso_compatible: Procesos que ningún recurso puede ejecutar por habilidades
+        cota_superior: Máximo de procesos que podría caber con cualquier empaquetado
+    """
+    recurso_de_proceso: np.ndarray
+    procesos_por_recurso: np.ndarray
+    horas_por_recurso: np.ndarray
+    sin_recurso_compatible: int
+    cota_superior: int
+
+    @property
+    def total_procesos(self) -> int:
+        """Cantidad de procesos empaquetados."""
+        return int(self.procesos_por_recurso.sum())
+
+    @property
+    def es_exacto(self) -> bool:
+        """Si el empaquetado alcanza la cota superior y es por lo tanto óptimo."""
+        return self.total_procesos == self.cota_superior
+
+
+def empaquetar_procesos(procesos: List[Proceso],
+                        recursos: List[Recurso],
+                        horas_por_recurso: np.ndarray,
+                        procesos_compilados: Optional[ProcesosCompilados] = None) -> EmpaquetadoProcesos:
+    """
+    Empaqueta las duraciones de los procesos en las horas de cada recurso.
+
+    Un recurso es compatible con un proceso si el proceso no tiene
+    requisitos o si el recurso cubre alguno de ellos, igual que en
+    compilar_problema.
+
+    Args:
+        procesos: Lista de procesos
+        recursos: Lista de recursos
+        horas_por_recurso: Horas disponibles de cada recurso (n_recursos,)
+        procesos_compilados: Compilación previa de los mismos procesos, en
+            el mismo orden (por defecto se compila aquí)
+
+    Returns:
+        EmpaquetadoProcesos: Asignación de procesos a recursos y cotas
+    """
+    if procesos_compilados is None:
+        procesos_compilados = compilar_procesos(procesos)
+    duraciones = np.maximum(procesos_compilados.duraciones, 0.0)
+    capacidad = np.asarray(horas_por_recurso, dtype=float)
+    grupos, compatibles = _agrupar_por_compatibilidad(procesos_compilados, recursos)
+
+    # Cota superior: los procesos más cortos que caben solos en algún recurso compatible, con las horas de todos juntas
+    mayor_compatible = np.array([capacidad[c].max() if c.any() else -np.inf for c in compatibles])
+    con_recurso = np.array([c.any() for c in compatibles], dtype=bool)
+    crecientes = np.argsort(duraciones, kind='stable')
+    crecientes = crecientes[duraciones[crecientes] <= mayor_compatible[grupos[crecientes]]]
+    cota_superior = int(np.searchsorted(np.cumsum(duraciones[crecientes]), capacidad.sum() + 1e-9, side='right'))
+
+    # First-Fit Decreasing de los candidatos y luego primer ajuste del resto, del más corto al más largo
+    restante = capacidad.copy()
+    recurso_de_proceso = np.full(len(procesos), -1, dtype=int)
+    candidatos = crecientes[:cota_superior]
+    _primer_ajuste(candidatos[::-1], duraciones, grupos, compatibles, restante, recurso_de_proceso)
+    pendientes = crecientes[recurso_de_proceso[crecientes] < 0]
+    _primer_ajuste(pendientes, duraciones, grupos, compatibles, restante, recurso_de_proceso)
+
+    empaquetados = recurso_de_proceso >= 0
+    procesos_por_recurso = np.bincount(recurso_de_proceso[empaquetados], minlength=len(recursos))
+
+    return EmpaquetadoProcesos(
+        recurso_de_proceso=recurso_de_proceso,
+        procesos_por_recurso=procesos_por_recurso,
+        horas_por_recurso=capacidad - restante,
+        sin_recurso_compatible=int((~con_recurso[grupos]).sum()),
+        cota_superior=cota_superior
+    )
+
+
+def _primer_ajuste(orden: np.ndarray,
+                   duraciones: np.ndarray,
+                   grupos: np.ndarray,
+                   compatibles: List[np.ndarray],
+                   restante: np.ndarray,
+                   recurso_de_proceso: np.ndarray) -> None:
+    """
+    Ubica cada proceso, en el orden dado, en el primer recurso compatible donde quepa.
+
+    Actualiza restante y recurso_de_proceso en el lugar.
+
+    Args:
+        orden: Índices de los procesos a ubicar
+        duraciones: Horas de cada proceso (n_procesos,)
+        grupos: Grupo de compatibilidad de cada proceso (n_procesos,)
+        compatibles: Recursos compatibles de cada grupo (n_recursos,)
+        restante: Horas libres de cada recurso (n_recursos,)
+        recurso_de_proceso: Recurso de cada proceso, -1 si no está ubicado (n_procesos,)
+    """
+    # Las horas libres solo disminuyen: si un proceso de un grupo no cupo, uno no más corto tampoco cabe
+    menor_rechazo = np.full(len(compatibles), np.inf)
+    for i in orden:
+        g = grupos[i]
+        if duraciones[i] >= menor_rechazo[g]:
+            continue
+        candidatos = compatibles[g] & (restante >= duraciones[i])
+        j = int(np.argmax(candidatos))
+        if candidatos[j]:
+            restante[j] -= duraciones[i]
+            recurso_de_proceso[i] = j
+        else:
+            menor_rechazo[g] = duraciones[i]
+
+
+def _agrupar_por_compatibilidad(procesos_compilados: ProcesosCompilados,
+                                recursos: List[Recurso]) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """
+    Agrupa los procesos con los mismos requisitos y calcula sus recursos compatibles.
+
+    Args:
+        procesos_compilados: Procesos compilados
+        recursos: Lista de recursos
+
+    Returns:
+        Tuple[np.ndarray, List[np.ndarray]]: Grupo de cada proceso (n_procesos,)
+            y recursos compatibles de cada grupo (n_recursos,)
+    """
+    indice = indexar_habilidades(recursos)
+    nombres = {k: requisito for requisito, k in procesos_compilados.requisitos.items()}
+    requeridas = procesos_compilados.requeridas
+
+    grupo_de_requisitos: Dict[Tuple[int, ...], int] = {}
+    grupos = np.empty(requeridas.shape[0], dtype=int)
+    compatibles: List[np.ndarray] = []
+    for i in range(requeridas.shape[0]):
+        clave = tuple(sorted(requeridas.indices[requeridas.indptr[i]:requeridas.indptr[i + 1]]))
+        if clave not in grupo_de_requisitos:
+            if clave:
+                compatible = np.zeros(len(recursos), dtype=bool)
+                for k in clave:
+                    compatible[indice.recursos_con(nombres[k])] = True
+            else:
+                compatible = np.ones(len(recursos), dtype=bool)
+            grupo_de_requisitos[clave] = len(compatibles)
+            compatibles.append(compatible)
+        grupos[i] = grupo_de_requisitos[clave]
+
+    return grupos, compatibles
@@ -0,0 +1,197 @@
+"""
+Modelo Lineal de Asignación
+
+Este módulo construye el modelo de programación lineal (o entera) para
+asignar procesos a recursos directamente en formato disperso de SciPy.
+Solo se crean variables para los pares proceso-recurso permitidos, de
+modo que la memoria crece con el número de no ceros y no con la
+cuadrícula completa n_procesos x n_recursos.
+
+Principios SOLID aplicados:
+- Single Responsibility: Solo construye el modelo matemático
+- Open/Closed: Nuevas familias de restricciones se agregan como métodos
+- Dependency Inversion: Trabaja sobre arreglos NumPy, no sobre entidades
+
+Autor: Equipo de Desarrollo
+Fecha: 2025-07-07
+"""
+
+from typing import List, Optional
+from dataclasses import dataclass
+import numpy as np
+from scipy import sparse
+
+
+@dataclass
+class ModeloAsignacion:
+    """
+    Modelo lineal de asignación listo para linprog/milp.
+    
+    Attributes:
+        c: Coeficientes de la función objetivo (n_vars,)
+        A_eq: Matriz de igualdades en formato CSR
+        b_eq: Lado derecho de las igualdades
+        A_ub: Matriz de desigualdades (<=) en formato CSR
+        b_ub: Lado derecho de las desigualdades
+        procesos: Índice de proceso de cada variable (n_vars,)
+        recursos: Índice de recurso de cada variable (n_vars,)
+        forma: (n_procesos, n_recursos) de la cuadrícula original
+    """
+    c: np.ndarray
+    A_eq: sparse.csr_matrix
+    b_eq: np.ndarray
+    A_ub: sparse.csr_matrix
+    b_ub: np.ndarray
+    procesos: np.ndarray
+    recursos: np.ndarray
+    forma: tuple
+    
+    @property
+    def num_variables(self) -> int:
+        """Número de variables de decisión del modelo."""
+        return self.c.shape[0]
+    
+    def a_matriz(self, x: np.ndarray) -> np.ndarray:
+        """
+        Expande un vector solución a la matriz (n_procesos, n_recursos).
+        
+        Args:
+            x: Valores de las variables del modelo
+        
+        Returns:
+            np.ndarray: Matriz densa con ceros en los pares sin variable
+        """
+        matriz = np.zeros(self.forma)
+        matriz[self.procesos, self.recursos] = x
+        return matriz
+    
+    def a_asignacion(self, x: np.ndarray, umbral: float = 0.5) -> np.ndarray:
+        """
+        Convierte un vector solución en el recurso elegido por proceso.
+        
+        Args:
+            x: Valores de las variables del modelo
+            umbral: Valor mínimo para considerar una variable activa
+        
+        Returns:
+            np.ndarray: Índice de recurso por proceso (-1 = sin asignar)
+        """
+        asignacion = np.full(self.forma[0], -1)
+        activas = x > umbral
+        asignacion[self.procesos[activas]] = self.recursos[activas]
+        return asignacion
+
+
+class ConstructorModeloAsignacion:
+    """
+    Constructor incremental del modelo de asignación disperso.
+    
+    La variable k representa x_ij para el k-ésimo par permitido
+    (en orden fila-mayor); los pares incompatibles no tienen variable, así
+    que no hacen falta filas de compatibilidad. Un límite de horas por
+    recurso se expresa en la capacidad que recibe agregar_capacidad.
+    Cada familia de restricciones se arma con
+    aritmética de índices vectorizada en formato COO y se convierte a
+    CSR al construir el modelo.
+    
+    Ejemplo:
+        modelo = (ConstructorModeloAsignacion(costos, duraciones, permitido)
+                  .agregar_asignacion_unica()
+                  .agregar_capacidad(capacidad)
+                  .construir())
+    """
+    
+    def __init__(self,
+                 costos: np.ndarray,
+                 duraciones: np.ndarray,
+                 permitido: Optional[np.ndarray] = None):
+        """
+        Inicializa el constructor.
+        
+        Args:
+            costos: Costo de asignar el proceso i al recurso j (n_procesos, n_recursos)
+            duraciones: Horas de cada proceso (n_procesos,)
+            permitido: Pares con variable de decisión; por defecto todos
+        """
+        self._forma = costos.shape
+        if permitido is None:
+            permitido = np.ones(self._forma, dtype=bool)
+        
+        self._procesos, self._recursos = np.nonzero(permitido)
+        self._c = costos[self._procesos, self._recursos]
+        self._duraciones = np.asarray(duraciones, dtype=float)
+        
+        self._filas_eq: List[sparse.coo_matrix] = []
+        self._b_eq: List[np.ndarray] = []
+        self._filas_ub: List[sparse.coo_matrix] = []
+        self._b_ub: List[np.ndarray] = []
+    
+    @property
+    def num_variables(self) -> int:
+        """Número de variables de decisión."""
+        return self._c.shape[0]
+    
+    def agregar_asignacion_unica(self) -> "ConstructorModeloAsignacion":
+        """
+        Agrega Σ_j x_ij = 1 para cada proceso.
+        
+        Returns:
+            ConstructorModeloAsignacion: El propio constructor
+        """
+        num_procesos = self._forma[0]
+        self._agregar_bloque(self._filas_eq, self._b_eq,
+                             np.ones(self.num_variables), self._procesos,
+                             num_procesos, np.ones(num_procesos))
+        return self
+    
+    def agregar_capacidad(self, capacidad: np.ndarray) -> "ConstructorModeloAsignacion":
+        """
+        Agrega Σ_i d_i x_ij <= capacidad_j para cada recurso.
+        
+        Args:
+            capacidad: Horas disponibles por recurso (n_recursos,)
+        
+        Returns:
+            ConstructorModeloAsignacion: El propio constructor
+        """
+        self._agregar_bloque(self._filas_ub, self._b_ub,
+                             self._duraciones[self._procesos], self._recursos,
+                             self._forma[1], np.asarray(capacidad, dtype=float))
+        return self
+    
+    def construir(self) -> ModeloAsignacion:
+        """
+        Construye el modelo en formato CSR.
+        
+        Returns:
+            ModeloAsignacion: Modelo listo para resolver
+        """
+        return ModeloAsignacion(
+            c=self._c,
+            A_eq=self._apilar(self._filas_eq),
+            b_eq=np.concatenate(self._b_eq) if self._b_eq else np.zeros(0),
+            A_ub=self._apilar(self._filas_ub),
+            b_ub=np.concatenate(self._b_ub) if self._b_ub else np.zeros(0),
+            procesos=self._procesos,
+            recursos=self._recursos,
+            forma=self._forma
+        )
+    
+    def _agregar_bloque(self,
+                       bloques: List[sparse.coo_matrix],
+                       lados_derechos: List[np.ndarray],
+                       valores: np.ndarray,
+                       filas: np.ndarray,
+                       num_filas: int,
+                       lado_derecho: np.ndarray) -> None:
+        """Agrega un bloque de filas con un no cero por variable."""
+        bloque = sparse.coo_matrix((valores, (filas, np.arange(self.num_variables))),
+                                   shape=(num_filas, self.num_variables))
+        bloques.append(bloque)
+        lados_derechos.append(lado_derecho)
+    
+    def _apilar(self, bloques: List[sparse.coo_matrix]) -> sparse.csr_matrix:
+        """Apila bloques COO en una sola matriz CSR."""
+        if not bloques:
+            return sparse.csr_matrix((0, self.num_variables))
+        return sparse.vstack(bloques, format='csr')
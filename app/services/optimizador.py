@@ -15,23 +15,40 @@ Autor: Equipo de Desarrollo
 Fecha: 2025-07-07
 """
 
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator, Union
+from dataclasses import dataclass, field, replace
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
 import logging
+import math
+import multiprocessing
 from enum import Enum
 import numpy as np
-from scipy.optimize import linprog
+from scipy.optimize import linprog, milp, Bounds, LinearConstraint, linear_sum_assignment
 import random
+import heapq
+import time
+import os
+import queue
+import threading
 
 from domain.models.proceso import Proceso, NivelPrioridad
 from domain.models.recurso import Recurso
 from app.use_cases.distribuir_recursos import AsignacionRecurso, EstrategiaDistribucion
+from app.services.modelo_asignacion import ConstructorModeloAsignacion, ModeloAsignacion
+from app.services.calendario import CalendarioLaboral
+from app.services.problema_compilado import ProblemaCompilado, compilar_problema
+from app.services.dependencias import compilar_dependencias, ordenar_topologicamente
 
 
 # Configuración de logging
 logger = logging.getLogger(__name__)
 
+# Estado de los procesos trabajadores, instalado una sola vez por _inicializar_trabajador:
+# el evento de detención compartido con el padre y el problema compilado
+_evento_detencion_trabajador: Optional[Any] = None
+_datos_trabajador: Optional["ProblemaCompilado"] = None
+
 
 class AlgoritmoOptimizacion(Enum):
     """
@@ -64,6 +81,17 @@ class ParametrosOptimizacion:
         peso_tiempo: Peso del tiempo en la función objetivo
         peso_eficiencia: Peso de la eficiencia en la función objetivo
         semilla_aleatoria: Semilla para reproducibilidad
+        max_nodos: Número máximo de nodos a explorar (ramificación y acotación y MILP)
+        gap_optimalidad: Gap relativo aceptado para dar por óptima una solución entera
+        tiempo_limite_segundos: Plazo de reloj desde el inicio de la optimización; al vencer se devuelve el mejor incumbente (None = sin límite)
+        programacion_entera: Si LINEAL resuelve el modelo binario (MILP) en lugar de redondear la relajación (opcional: el MILP tarda más pero no pierde procesos al redondear)
+        num_trabajadores: Procesos en paralelo (reinicios de recocido simulado o islas del genético)
+        intervalo_migracion: Generaciones entre migraciones de élites entre islas
+        num_migrantes: Individuos élite que migra cada isla
+        detectar_asignacion: Si LINEAL y BRANCH_AND_BOUND resuelven directamente las instancias con estructura de asignación
+        fecha_inicio: Fecha desde la que se calendarizan las asignaciones (None = al iniciar la optimización)
+        feriados: Días no laborables para todos los recursos al calendarizar
+        ausencias: Intervalos (inicio, fin) en que cada recurso no trabaja, por ID de recurso
     """
     algoritmo: AlgoritmoOptimizacion = AlgoritmoOptimizacion.GREEDY
     max_iteraciones: int = 1000
@@ -72,6 +100,17 @@ class ParametrosOptimizacion:
     peso_tiempo: float = 0.3
     peso_eficiencia: float = 0.3
     semilla_aleatoria: Optional[int] = None
+    max_nodos: int = 100000
+    gap_optimalidad: float = 1e-4
+    tiempo_limite_segundos: Optional[float] = None
+    programacion_entera: bool = False
+    num_trabajadores: int = 1
+    intervalo_migracion: int = 20
+    num_migrantes: int = 2
+    detectar_asignacion: bool = True
+    fecha_inicio: Optional[datetime] = None
+    feriados: Optional[List[date]] = None
+    ausencias: Optional[Dict[str, List[Tuple[datetime, datetime]]]] = None
 
 
 @dataclass
@@ -86,6 +125,7 @@ class SolucionOptimizada:
         iteraciones: Número de iteraciones realizadas
         convergencia: Si el algoritmo convergió
         metricas: Métricas adicionales de la solución
+        trazas_convergencia: Mejor valor objetivo a lo largo de la búsqueda, una lista por trabajador
     """
     asignaciones: List[AsignacionRecurso]
     valor_objetivo: float
@@ -93,6 +133,61 @@ class SolucionOptimizada:
     iteraciones: int
     convergencia: bool
     metricas: Dict[str, Any]
+    trazas_convergencia: List[List[float]] = field(default_factory=list)
+
+
+@dataclass
+class SolucionParcial:
+    """
+    Incumbente mejorado reportado durante una optimización en curso.
+    
+    Attributes:
+        valor_objetivo: Valor objetivo del incumbente según el algoritmo en curso
+        tiempo_transcurrido: Segundos desde el inicio de la optimización
+        iteracion: Iteración, generación o nodo en que se encontró
+        asignacion: Índice de recurso por proceso (-1 = sin asignar)
+    """
+    valor_objetivo: float
+    tiempo_transcurrido: float
+    iteracion: int
+    asignacion: np.ndarray
+
+
+class _ArbolMaximos:
+    """
+    Árbol de segmentos de máximos sobre la carga de cada recurso.
+    
+    Permite actualizar una carga y consultar el makespan (carga máxima)
+    en O(log n_recursos).
+    """
+    
+    def __init__(self, valores: List[float]):
+        self._tamaño = 1
+        while self._tamaño < len(valores):
+            self._tamaño *= 2
+        self._nodos = [float('-inf')] * (2 * self._tamaño)
+        self._nodos[self._tamaño:self._tamaño + len(valores)] = valores
+        for k in range(self._tamaño - 1, 0, -1):
+            self._nodos[k] = max(self._nodos[2 * k], self._nodos[2 * k + 1])
+    
+    @property
+    def maximo(self) -> float:
+        """Carga máxima actual."""
+        return self._nodos[1]
+    
+    def actualizar(self, posicion: int, valor: float) -> None:
+        """Cambia la carga de un recurso y propaga el máximo hacia la raíz."""
+        nodos = self._nodos
+        k = posicion + self._tamaño
+        nodos[k] = valor
+        k >>= 1
+        while k:
+            nuevo = max(nodos[2 * k], nodos[2 * k + 1])
+            if nodos[k] == nuevo:
+                # Los ancestros no cambian
+                break
+            nodos[k] = nuevo
+            k >>= 1
 
 
 class OptimizadorRecursos:
@@ -104,24 +199,41 @@ class OptimizadorRecursos:
     y minimizando costos y tiempos.
     """
     
+    _TAMAÑO_POBLACION_GENETICO = 50
+    
     def __init__(self):
         """
         Inicializa el optimizador.
         """
         self._logger = logging.getLogger(self.__class__.__name__)
         self._random = random.Random()
+        self._rng = np.random.default_rng()
+        self._callback: Optional[Callable[[SolucionParcial], Optional[bool]]] = None
+        self._inicio_optimizacion: Optional[float] = None
+        self._detenido = False
+        self._evento_detencion: Optional[Any] = None
+        self._fecha_inicio: Optional[datetime] = None
+        self._feriados: Optional[List[date]] = None
+        self._ausencias: Optional[Dict[str, List[Tuple[datetime, datetime]]]] = None
     
     def optimizar_asignaciones(self, 
                               procesos: List[Proceso], 
                               recursos: List[Recurso],
-                              parametros: ParametrosOptimizacion) -> SolucionOptimizada:
+                              parametros: ParametrosOptimizacion,
+                              callback: Optional[Callable[[SolucionParcial], Optional[bool]]] = None) -> SolucionOptimizada:
         """
         Optimiza las asignaciones de recursos a procesos.
         
+        La optimización es interrumpible: cada vez que el algoritmo mejora
+        su incumbente se invoca callback con una SolucionParcial; si el
+        callback devuelve True, o si vence parametros.tiempo_limite_segundos,
+        el algoritmo se detiene y devuelve el mejor incumbente encontrado.
+        
         Args:
             procesos: Lista de procesos a asignar
             recursos: Lista de recursos disponibles
             parametros: Parámetros de optimización
+            callback: Función opcional que recibe cada incumbente mejorado
             
         Returns:
             SolucionOptimizada: Solución optimizada encontrada
@@ -132,30 +244,57 @@ class OptimizadorRecursos:
         """
         try:
             inicio = datetime.now()
+            self._callback = callback
+            self._inicio_optimizacion = time.monotonic()
+            self._detenido = False
+            self._evento_detencion = None
+            self._fecha_inicio = parametros.fecha_inicio or inicio
+            self._feriados = parametros.feriados
+            self._ausencias = parametros.ausencias
             
             # Configurar semilla aleatoria
             if parametros.semilla_aleatoria is not None:
                 self._random.seed(parametros.semilla_aleatoria)
                 np.random.seed(parametros.semilla_aleatoria)
+                self._rng = np.random.default_rng(parametros.semilla_aleatoria)
             
             self._logger.info(f"Iniciando optimización con algoritmo {parametros.algoritmo.value}")
             
             # Validar entrada
             self._validar_entrada(procesos, recursos, parametros)
             
+            # Compilar el problema una sola vez para todos los algoritmos
+            datos = compilar_problema(procesos, recursos, parametros.peso_costo, 
+                                      parametros.peso_tiempo, parametros.peso_eficiencia)
+            
+            # Las instancias con estructura de asignación se resuelven de forma exacta y directa
+            solucion = None
+            if (parametros.detectar_asignacion and 
+                parametros.algoritmo in (AlgoritmoOptimizacion.LINEAL, AlgoritmoOptimizacion.BRANCH_AND_BOUND)):
+                solucion = self._optimizar_estructura_asignacion(procesos, recursos, datos, parametros)
+            
             # Ejecutar algoritmo específico
-            if parametros.algoritmo == AlgoritmoOptimizacion.LINEAL:
-                solucion = self._optimizar_lineal(procesos, recursos, parametros)
-            elif parametros.algoritmo == AlgoritmoOptimizacion.GENETICO:
-                solucion = self._optimizar_genetico(procesos, recursos, parametros)
-            elif parametros.algoritmo == AlgoritmoOptimizacion.SIMULATED_ANNEALING:
-                solucion = self._optimizar_simulated_annealing(procesos, recursos, parametros)
-            elif parametros.algoritmo == AlgoritmoOptimizacion.GREEDY:
-                solucion = self._optimizar_greedy(procesos, recursos, parametros)
-            elif parametros.algoritmo == AlgoritmoOptimizacion.BRANCH_AND_BOUND:
-                solucion = self._optimizar_branch_and_bound(procesos, recursos, parametros)
-            else:
-                raise ValueError(f"Algoritmo no soportado: {parametros.algoritmo}")
+            if solucion is None:
+                if parametros.algoritmo == AlgoritmoOptimizacion.LINEAL:
+                    solucion = self._optimizar_lineal(procesos, recursos, datos, parametros)
+                elif parametros.algoritmo == AlgoritmoOptimizacion.GENETICO:
+                    if parametros.num_trabajadores > 1:
+                        solucion = self._optimizar_genetico_islas(procesos, recursos, datos, parametros)
+                    else:
+                        solucion = self._optimizar_genetico(procesos, recursos, datos, parametros)
+                elif parametros.algoritmo == AlgoritmoOptimizacion.SIMULATED_ANNEALING:
+                    if parametros.num_trabajadores > 1:
+                        solucion = self._optimizar_reinicios_paralelos(procesos, recursos, datos, parametros)
+                    else:
+                        solucion = self._optimizar_simulated_annealing(procesos, recursos, datos, parametros)
+                elif parametros.algoritmo == AlgoritmoOptimizacion.GREEDY:
+                    solucion = self._optimizar_greedy(procesos, recursos, datos, parametros)
+                elif parametros.algoritmo == AlgoritmoOptimizacion.BRANCH_AND_BOUND:
+                    solucion = self._optimizar_branch_and_bound(procesos, recursos, datos, parametros)
+                else:
+                    raise ValueError(f"Algoritmo no soportado: {parametros.algoritmo}")
+            
+            solucion.metricas.setdefault("metodo_resolucion", parametros.algoritmo.value)
             
             # Calcular tiempo de ejecución
             tiempo_ejecucion = (datetime.now() - inicio).total_seconds()
@@ -168,6 +307,106 @@ class OptimizadorRecursos:
             self._logger.error(f"Error en optimización: {str(e)}")
             raise RuntimeError(f"Error optimizando asignaciones: {str(e)}")
     
+    def iterar_soluciones(self, 
+                          procesos: List[Proceso], 
+                          recursos: List[Recurso],
+                          parametros: ParametrosOptimizacion) -> Iterator[Union[SolucionParcial, SolucionOptimizada]]:
+        """
+        Ejecuta la optimización en segundo plano y produce sus incumbentes.
+        
+        Produce una SolucionParcial por cada mejora y, al final, la
+        SolucionOptimizada completa. Si el consumidor deja de iterar
+        (por ejemplo, porque la solución ya es suficientemente buena), la
+        optimización se detiene en el siguiente punto de control.
+        
+        Args:
+            procesos: Lista de procesos a asignar
+            recursos: Lista de recursos disponibles
+            parametros: Parámetros de optimización
+            
+        Yields:
+            Union[SolucionParcial, SolucionOptimizada]: Incumbentes y solución final
+            
+        Raises:
+            ValueError: Si los datos de entrada son inválidos
+            RuntimeError: Si ocurre un error durante la optimización
+        """
+        cola: "queue.Queue[Any]" = queue.Queue()
+        
+        def ejecutar() -> None:
+            try:
+                cola.put(self.optimizar_asignaciones(procesos, recursos, parametros, cola.put))
+            except Exception as e:
+                cola.put(e)
+        
+        hilo = threading.Thread(target=ejecutar, daemon=True)
+        hilo.start()
+        try:
+            while True:
+                elemento = cola.get()
+                if isinstance(elemento, Exception):
+                    raise elemento
+                yield elemento
+                if isinstance(elemento, SolucionOptimizada):
+                    return
+        finally:
+            self._detener()
+    
+    def _reportar_incumbente(self, asignacion: np.ndarray, valor: float, iteracion: int) -> None:
+        """Notifica un incumbente mejorado al callback; si este devuelve True se detiene la búsqueda."""
+        if self._callback is None:
+            return
+        parcial = SolucionParcial(
+            valor_objetivo=float(valor),
+            tiempo_transcurrido=time.monotonic() - self._inicio_optimizacion,
+            iteracion=int(iteracion),
+            asignacion=np.array(asignacion, copy=True)
+        )
+        if self._callback(parcial):
+            self._detener()
+    
+    def _detener(self) -> None:
+        """Pide detener la optimización, también a los procesos trabajadores en curso."""
+        self._detenido = True
+        if self._evento_detencion is not None:
+            self._evento_detencion.set()
+    
+    def _crear_ejecutor(self, num_trabajadores: int, datos: ProblemaCompilado) -> ProcessPoolExecutor:
+        """
+        Crea el grupo de procesos trabajadores de esta optimización.
+        
+        Cada trabajador recibe al arrancar el problema compilado, que así
+        no viaja con cada tarea, y un evento compartido que _detener activa,
+        de modo que los trabajadores en curso terminan en su siguiente punto
+        de control en lugar de completar su ejecución.
+        
+        Args:
+            num_trabajadores: Trabajadores que se quieren ejecutar en paralelo
+            datos: Problema compilado que usan todas las tareas
+            
+        Returns:
+            ProcessPoolExecutor: Ejecutor con el problema y el evento de detención instalados
+        """
+        self._evento_detencion = multiprocessing.Event()
+        if self._detenido:
+            self._evento_detencion.set()
+        return ProcessPoolExecutor(max_workers=min(num_trabajadores, os.cpu_count() or 1), 
+                                   initializer=_inicializar_trabajador, 
+                                   initargs=(self._evento_detencion, datos))
+    
+    def _tiempo_restante(self, parametros: ParametrosOptimizacion) -> Optional[float]:
+        """Segundos que quedan hasta el plazo (None = sin límite)."""
+        if parametros.tiempo_limite_segundos is None or self._inicio_optimizacion is None:
+            return None
+        return parametros.tiempo_limite_segundos - (time.monotonic() - self._inicio_optimizacion)
+    
+    def _debe_detenerse(self, parametros: ParametrosOptimizacion) -> bool:
+        """Indica si venció el plazo o se pidió detener la optimización."""
+        if self._detenido or (self._evento_detencion is not None and self._evento_detencion.is_set()):
+            return True
+        restante = self._tiempo_restante(parametros)
+        return restante is not None and restante <= 0
+    
     def _validar_entrada(self, 
                         procesos: List[Proceso], 
                         recursos: List[Recurso], 
@@ -195,6 +434,24 @@ class OptimizadorRecursos:
         if parametros.tolerancia <= 0:
             raise ValueError("La tolerancia debe ser mayor a 0")
         
+        if parametros.max_nodos <= 0:
+            raise ValueError("El número máximo de nodos debe ser mayor a 0")
+        
+        if parametros.gap_optimalidad < 0:
+            raise ValueError("El gap de optimalidad no puede ser negativo")
+        
+        if parametros.tiempo_limite_segundos is not None and parametros.tiempo_limite_segundos <= 0:
+            raise ValueError("El tiempo límite debe ser mayor a 0")
+        
+        if parametros.num_trabajadores <= 0:
+            raise ValueError("El número de trabajadores debe ser mayor a 0")
+        
+        if parametros.intervalo_migracion <= 0:
+            raise ValueError("El intervalo de migración debe ser mayor a 0")
+        
+        if not 0 <= parametros.num_migrantes < self._TAMAÑO_POBLACION_GENETICO:
+            raise ValueError("El número de migrantes debe estar entre 0 y el tamaño de la población")
+        
         # Validar pesos
         total_pesos = parametros.peso_costo + parametros.peso_tiempo + parametros.peso_eficiencia
         if abs(total_pesos - 1.0) > 1e-6:
@@ -203,6 +460,7 @@ class OptimizadorRecursos:
     def _optimizar_greedy(self, 
                          procesos: List[Proceso], 
                          recursos: List[Recurso], 
+                         datos: ProblemaCompilado, 
                          parametros: ParametrosOptimizacion) -> SolucionOptimizada:
         """
         Optimiza usando algoritmo voraz (greedy).
@@ -210,30 +468,18 @@ class OptimizadorRecursos:
         Args:
             procesos: Lista de procesos
             recursos: Lista de recursos
+            datos: Problema compilado
             parametros: Parámetros de optimización
             
         Returns:
             SolucionOptimizada: Solución encontrada
         """
         # Ordenar procesos por prioridad y ratio eficiencia/costo
-        procesos_ordenados = self._ordenar_procesos_greedy(procesos, recursos, parametros)
+        orden = self._ordenar_procesos_greedy(datos, parametros)
         
-        asignaciones = []
-        recursos_ocupados = {r.id: 0.0 for r in recursos}
-        
-        for proceso in procesos_ordenados:
-            # Encontrar el mejor recurso para este proceso
-            mejor_recurso, mejor_puntuacion = self._encontrar_mejor_recurso_greedy(
-                proceso, recursos, recursos_ocupados, parametros
-            )
-            
-            if mejor_recurso:
-                # Crear asignación
-                asignacion = self._crear_asignacion_optimizada(
-                    proceso, mejor_recurso, recursos_ocupados[mejor_recurso.id]
-                )
-                asignaciones.append(asignacion)
-                recursos_ocupados[mejor_recurso.id] += proceso.tiempo_estimado_horas
+        # Cada proceso va al recurso factible de menor puntuación
+        asignacion = self._asignacion_greedy(datos)
+        asignaciones = self._construir_asignaciones(asignacion, procesos, recursos, orden)
         
         # Calcular valor objetivo
         valor_objetivo = self._calcular_valor_objetivo(asignaciones, parametros)
@@ -250,217 +496,498 @@ class OptimizadorRecursos:
     def _optimizar_genetico(self, 
                            procesos: List[Proceso], 
                            recursos: List[Recurso], 
+                           datos: ProblemaCompilado, 
                            parametros: ParametrosOptimizacion) -> SolucionOptimizada:
         """
         Optimiza usando algoritmo genético.
         
+        La población se mantiene como un arreglo entero de forma
+        (tamaño_poblacion, n_procesos) donde cada gen es el índice del
+        recurso asignado. El fitness de toda la población se evalúa en
+        bloque con NumPy y solo el mejor cromosoma se decodifica a
+        asignaciones al final. La inicialización y la mutación eligen cada
+        gen entre los recursos factibles de su proceso, y el cruce uniforme
+        conserva genes completos, así que ningún individuo deja sin asignar
+        un proceso que tiene recurso factible.
+        
         Args:
             procesos: Lista de procesos
             recursos: Lista de recursos
+            datos: Problema compilado
             parametros: Parámetros de optimización
             
         Returns:
             SolucionOptimizada: Solución encontrada
         """
-        # Parámetros del algoritmo genético
-        tamaño_poblacion = 50
-        tasa_cruce = 0.8
-        tasa_mutacion = 0.1
-        
         # Inicializar población
-        poblacion = self._inicializar_poblacion(procesos, recursos, tamaño_poblacion)
+        poblacion = self._inicializar_poblacion(datos, self._TAMAÑO_POBLACION_GENETICO)
         
-        mejor_solucion = None
-        mejor_valor = float('inf')
+        _, mejor_individuo, mejor_valor, traza, _ = self._evolucionar_poblacion(
+            poblacion, datos, parametros, parametros.max_iteraciones
+        )
         
-        for iteracion in range(parametros.max_iteraciones):
-            # Evaluar población
-            valores_fitness = []
-            for individuo in poblacion:
-                asignaciones = self._decodificar_individuo(individuo, procesos, recursos)
-                valor = self._calcular_valor_objetivo(asignaciones, parametros)
-                valores_fitness.append(valor)
-                
-                # Actualizar mejor solución
-                if valor < mejor_valor:
-                    mejor_valor = valor
-                    mejor_solucion = asignaciones
-            
-            # Selección
-            poblacion_seleccionada = self._seleccion_torneo(poblacion, valores_fitness)
+        # Solo el cromosoma ganador se decodifica a asignaciones
+        mejor_solucion = []
+        if mejor_individuo is not None:
+            mejor_solucion = self._decodificar_individuo(mejor_individuo, datos, procesos, recursos)
+        
+        return SolucionOptimizada(
+            asignaciones=mejor_solucion,
+            valor_objetivo=mejor_valor,
+            tiempo_ejecucion=0.0,
+            iteraciones=len(traza),
+            convergencia=abs(mejor_valor) < parametros.tolerancia,
+            metricas=self._calcular_metricas_solucion(mejor_solucion),
+            trazas_convergencia=[traza]
+        )
+    
+    def _optimizar_genetico_islas(self, 
+                                 procesos: List[Proceso], 
+                                 recursos: List[Recurso], 
+                                 datos: ProblemaCompilado, 
+                                 parametros: ParametrosOptimizacion) -> SolucionOptimizada:
+        """
+        Optimiza usando el modelo de islas del algoritmo genético.
+        
+        Cada trabajador evoluciona una isla con su propio generador
+        aleatorio, derivado de semilla_aleatoria. Cada intervalo_migracion
+        generaciones las islas se sincronizan y, en anillo, los mejores
+        individuos de cada isla reemplazan a los peores de la siguiente.
+        Como la migración es síncrona, el resultado es reproducible.
+        
+        Args:
+            procesos: Lista de procesos
+            recursos: Lista de recursos
+            datos: Problema compilado
+            parametros: Parámetros de optimización
             
-            # Cruce
-            nueva_poblacion = []
-            for i in range(0, len(poblacion_seleccionada), 2):
-                padre1 = poblacion_seleccionada[i]
-                padre2 = poblacion_seleccionada[i+1] if i+1 < len(poblacion_seleccionada) else poblacion_seleccionada[0]
+        Returns:
+            SolucionOptimizada: Mejor solución entre todas las islas
+        """
+        num_islas = parametros.num_trabajadores
+        generadores = [np.random.default_rng(semilla) for semilla in self._derivar_semillas(parametros)]
+        poblaciones = [
+            self._inicializar_poblacion(datos, self._TAMAÑO_POBLACION_GENETICO, generador)
+            for generador in generadores
+        ]
+        
+        mejores_individuos = [None] * num_islas
+        mejores_valores = [float('inf')] * num_islas
+        trazas: List[List[float]] = [[] for _ in range(num_islas)]
+        generacion = 0
+        convergio = False
+        
+        with self._crear_ejecutor(num_islas, datos) as ejecutor:
+            while generacion < parametros.max_iteraciones and not convergio and not self._debe_detenerse(parametros):
+                generaciones = min(parametros.intervalo_migracion, parametros.max_iteraciones - generacion)
+                parametros_trabajador = self._parametros_trabajador(parametros)
+                futuros = [
+                    ejecutor.submit(_evolucionar_isla, parametros_trabajador, 
+                                    poblaciones[k], generadores[k], generaciones)
+                    for k in range(num_islas)
+                ]
+                mejor_anterior = min(mejores_valores)
                 
-                if self._random.random() < tasa_cruce:
-                    hijo1, hijo2 = self._cruce_uniforme(padre1, padre2)
-                else:
-                    hijo1, hijo2 = padre1.copy(), padre2.copy()
+                for k, futuro in enumerate(futuros):
+                    poblacion, individuo, valor, traza, convergio_isla, generador = futuro.result()
+                    poblaciones[k] = poblacion
+                    generadores[k] = generador
+                    trazas[k].extend(min(v, mejores_valores[k]) for v in traza)
+                    if valor < mejores_valores[k]:
+                        mejores_valores[k] = valor
+                        mejores_individuos[k] = individuo
+                    convergio = convergio or convergio_isla
                 
-                nueva_poblacion.extend([hijo1, hijo2])
-            
-            # Mutación
-            for individuo in nueva_poblacion:
-                if self._random.random() < tasa_mutacion:
-                    self._mutar_individuo(individuo, len(recursos))
-            
-            poblacion = nueva_poblacion
-            
-            # Verificar convergencia
-            if iteracion > 100 and abs(mejor_valor) < parametros.tolerancia:
-                break
+                generacion += generaciones
+                if min(mejores_valores) < mejor_anterior:
+                    k = int(np.argmin(mejores_valores))
+                    self._reportar_incumbente(self._genes_factibles(mejores_individuos[k], datos), 
+                                              mejores_valores[k], generacion)
+                if generacion < parametros.max_iteraciones:
+                    self._migrar_elites(poblaciones, datos, parametros)
+        
+        ganadora = int(np.argmin(mejores_valores))
+        mejor_solucion = []
+        if mejores_individuos[ganadora] is not None:
+            mejor_solucion = self._decodificar_individuo(mejores_individuos[ganadora], datos, procesos, recursos)
+        
+        metricas = self._calcular_metricas_solucion(mejor_solucion)
+        metricas.update({
+            "num_trabajadores": num_islas,
+            "trabajador_ganador": ganadora,
+            "valores_por_trabajador": mejores_valores
+        })
         
         return SolucionOptimizada(
-            asignaciones=mejor_solucion or [],
-            valor_objetivo=mejor_valor,
+            asignaciones=mejor_solucion,
+            valor_objetivo=mejores_valores[ganadora],
             tiempo_ejecucion=0.0,
-            iteraciones=iteracion + 1,
-            convergencia=abs(mejor_valor) < parametros.tolerancia,
-            metricas=self._calcular_metricas_solucion(mejor_solucion or [])
+            iteraciones=generacion,
+            convergencia=abs(mejores_valores[ganadora]) < parametros.tolerancia,
+            metricas=metricas,
+            trazas_convergencia=trazas
         )
     
+    def _optimizar_reinicios_paralelos(self, 
+                                      procesos: List[Proceso], 
+                                      recursos: List[Recurso], 
+                                      datos: ProblemaCompilado, 
+                                      parametros: ParametrosOptimizacion) -> SolucionOptimizada:
+        """
+        Ejecuta reinicios independientes del recocido simulado en paralelo.
+        
+        Cada trabajador usa una semilla derivada de semilla_aleatoria y
+        gana la solución con menor valor objetivo.
+        
+        Args:
+            procesos: Lista de procesos
+            recursos: Lista de recursos
+            datos: Problema compilado
+            parametros: Parámetros de optimización
+            
+        Returns:
+            SolucionOptimizada: Mejor solución entre todos los reinicios
+        """
+        semillas = self._derivar_semillas(parametros)
+        parametros_trabajador = self._parametros_trabajador(parametros)
+        soluciones: List[Optional[SolucionOptimizada]] = [None] * len(semillas)
+        mejor_valor = float('inf')
+        
+        with self._crear_ejecutor(len(semillas), datos) as ejecutor:
+            futuros = {
+                ejecutor.submit(_ejecutar_reinicio, procesos, recursos, parametros_trabajador, semilla): k
+                for k, semilla in enumerate(semillas)
+            }
+            # Cada reinicio terminado que mejora el incumbente se reporta de inmediato
+            for futuro in as_completed(futuros):
+                k = futuros[futuro]
+                soluciones[k] = futuro.result()
+                if soluciones[k].valor_objetivo < mejor_valor:
+                    mejor_valor = soluciones[k].valor_objetivo
+                    self._reportar_incumbente(self._vector_asignacion(soluciones[k].asignaciones, datos), 
+                                              mejor_valor, sum(s.iteraciones for s in soluciones if s))
+                if self._detenido:
+                    for pendiente in futuros:
+                        pendiente.cancel()
+                    break
+        
+        # Tras una detención anticipada algunos reinicios no terminan: las métricas se indexan por trabajador
+        terminadas = [k for k, s in enumerate(soluciones) if s is not None]
+        ganadora = min(terminadas, key=lambda k: soluciones[k].valor_objetivo)
+        mejor = soluciones[ganadora]
+        mejor.metricas.update({
+            "num_trabajadores": len(terminadas),
+            "trabajador_ganador": ganadora,
+            "valores_por_trabajador": [s.valor_objetivo if s is not None else None for s in soluciones]
+        })
+        mejor.iteraciones = sum(soluciones[k].iteraciones for k in terminadas)
+        mejor.trazas_convergencia = [s.trazas_convergencia[0] if s is not None else [] for s in soluciones]
+        return mejor
+    
     def _optimizar_simulated_annealing(self, 
                                       procesos: List[Proceso], 
                                       recursos: List[Recurso], 
+                                      datos: ProblemaCompilado, 
                                       parametros: ParametrosOptimizacion) -> SolucionOptimizada:
         """
         Optimiza usando recocido simulado.
         
+        Mantiene la carga de cada recurso, el costo acumulado y el makespan,
+        de modo que cada movimiento (reasignar un proceso o intercambiar
+        los recursos de dos procesos) se evalúa como una diferencia en
+        O(1), u O(log n_recursos) si afecta al recurso más cargado. Las
+        asignaciones solo se construyen para la mejor solución.
+        
         Args:
             procesos: Lista de procesos
             recursos: Lista de recursos
+            datos: Problema compilado
             parametros: Parámetros de optimización
             
         Returns:
             SolucionOptimizada: Solución encontrada
         """
-        # Generar solución inicial
-        solucion_actual = self._generar_solucion_inicial(procesos, recursos)
-        valor_actual = self._calcular_valor_objetivo(solucion_actual, parametros)
+        # Solución inicial greedy como vector proceso -> recurso; los procesos
+        # sin ningún recurso factible quedan fijos y no cuentan en el objetivo
+        asignacion = self._asignacion_greedy(datos)
+        movibles = np.flatnonzero(datos.factible.any(axis=1))
+        if movibles.size == 0:
+            return self._optimizar_greedy(procesos, recursos, datos, parametros)
+        asignacion[asignacion < 0] = 0
+        
+        # Estado incremental: cargas por recurso, costo acumulado y makespan
+        genes = asignacion.tolist()
+        duraciones = datos.duraciones.tolist()
+        costo_hora = datos.costo_hora.tolist()
+        factible = datos.factible.tolist()
+        horas = np.where(datos.factible[np.arange(len(genes)), asignacion], datos.duraciones, 0.0)
+        cargas = np.bincount(asignacion, weights=horas, minlength=len(recursos)).tolist()
+        arbol = _ArbolMaximos(cargas)
+        costo = float((horas * datos.costo_hora[asignacion]).sum())
+        
+        num_asignados = movibles.size
+        peso_costo = parametros.peso_costo / num_asignados
+        peso_tiempo = parametros.peso_tiempo / num_asignados
+        peso_eficiencia = parametros.peso_eficiencia * num_asignados
         
-        mejor_solucion = solucion_actual.copy()
+        def valor_objetivo(costo: float, makespan: float) -> float:
+            return peso_costo * costo + peso_tiempo * makespan - peso_eficiencia / makespan
+        
+        valor_actual = valor_objetivo(costo, arbol.maximo)
         mejor_valor = valor_actual
+        mejor_genes = genes.copy()
+        mejor_pendiente = False
         
-        # Parámetros del recocido simulado
+        # Parámetros del recocido simulado: enfriamiento geométrico que llega
+        # a la temperatura final en la última iteración
         temperatura_inicial = 1000.0
         temperatura_final = 0.1
-        factor_enfriamiento = 0.95
+        factor_enfriamiento = (temperatura_final / temperatura_inicial) ** (1.0 / parametros.max_iteraciones)
+        probabilidad_intercambio = 0.3
+        # Lotes de al menos 1/100 de la corrida para registrar la traza de convergencia
+        tamaño_lote = min(16384, -(-parametros.max_iteraciones // 100))
+        traza = []
         
-        temperatura = temperatura_inicial
+        iteracion = 0
+        aceptados = 0
+        mejor_reportado = mejor_valor
+        self._reportar_incumbente(self._genes_factibles(asignacion, datos), mejor_valor, 0)
         
-        for iteracion in range(parametros.max_iteraciones):
-            # Generar solución vecina
-            solucion_vecina = self._generar_solucion_vecina(solucion_actual, procesos, recursos)
-            valor_vecina = self._calcular_valor_objetivo(solucion_vecina, parametros)
+        while iteracion < parametros.max_iteraciones and not self._debe_detenerse(parametros):
+            
+            # Números aleatorios del lote generados en bloque
+            lote = min(tamaño_lote, parametros.max_iteraciones - iteracion)
+            es_intercambio = (self._rng.random(lote) < probabilidad_intercambio).tolist()
+            primeros = movibles[self._rng.integers(0, movibles.size, lote)].tolist()
+            segundos = movibles[self._rng.integers(0, movibles.size, lote)].tolist()
+            destinos = self._rng.integers(0, len(recursos), lote).tolist()
+            # Aceptar si delta <= T * E con E ~ Exp(1), equivalente a u < exp(-delta / T)
+            temperaturas = temperatura_inicial * factor_enfriamiento ** np.arange(iteracion, iteracion + lote)
+            limites = (temperaturas * -np.log1p(-self._rng.random(lote))).tolist()
             
-            # Decidir si aceptar la solución vecina
-            if valor_vecina < valor_actual:
-                # Mejor solución, aceptar
-                solucion_actual = solucion_vecina
-                valor_actual = valor_vecina
+            for k in range(lote):
+                i = primeros[k]
+                a = genes[i]
+                duracion_i = duraciones[i]
                 
-                # Actualizar mejor solución global
-                if valor_vecina < mejor_valor:
-                    mejor_solucion = solucion_vecina.copy()
-                    mejor_valor = valor_vecina
-            else:
-                # Peor solución, aceptar con probabilidad
-                delta = valor_vecina - valor_actual
-                probabilidad = np.exp(-delta / temperatura)
+                if es_intercambio[k]:
+                    # Intercambio: i pasa al recurso de l y l al de i
+                    l = segundos[k]
+                    b = genes[l]
+                    if b == a or not (factible[i][b] and factible[l][a]):
+                        continue
+                    diferencia = duracion_i - duraciones[l]
+                    nueva_carga_a = cargas[a] - diferencia
+                    nueva_carga_b = cargas[b] + diferencia
+                    nuevo_costo = costo + diferencia * (costo_hora[b] - costo_hora[a])
+                else:
+                    # Reasignación: i pasa al recurso b
+                    b = destinos[k]
+                    if b == a or not factible[i][b]:
+                        continue
+                    nueva_carga_a = cargas[a] - duracion_i
+                    nueva_carga_b = cargas[b] + duracion_i
+                    nuevo_costo = costo + duracion_i * (costo_hora[b] - costo_hora[a])
+                
+                # Makespan del vecino: O(1) salvo que cambie el recurso más cargado
+                makespan = arbol.maximo
+                tentativo = False
+                if nueva_carga_a >= makespan or nueva_carga_b >= makespan:
+                    nuevo_makespan = max(nueva_carga_a, nueva_carga_b)
+                elif cargas[a] < makespan and cargas[b] < makespan:
+                    nuevo_makespan = makespan
+                else:
+                    arbol.actualizar(a, nueva_carga_a)
+                    arbol.actualizar(b, nueva_carga_b)
+                    nuevo_makespan = arbol.maximo
+                    tentativo = True
                 
-                if self._random.random() < probabilidad:
-                    solucion_actual = solucion_vecina
-                    valor_actual = valor_vecina
+                nuevo_valor = (peso_costo * nuevo_costo + peso_tiempo * nuevo_makespan - 
+                               peso_eficiencia / nuevo_makespan)
+                
+                if nuevo_valor - valor_actual <= limites[k]:
+                    # La mejor solución solo se copia antes de alejarse de ella
+                    if mejor_pendiente and nuevo_valor >= mejor_valor:
+                        mejor_genes = genes.copy()
+                        mejor_pendiente = False
+                    
+                    if es_intercambio[k]:
+                        genes[i], genes[l] = b, a
+                    else:
+                        genes[i] = b
+                    cargas[a] = nueva_carga_a
+                    cargas[b] = nueva_carga_b
+                    if not tentativo:
+                        arbol.actualizar(a, nueva_carga_a)
+                        arbol.actualizar(b, nueva_carga_b)
+                    costo = nuevo_costo
+                    valor_actual = nuevo_valor
+                    aceptados += 1
+                    
+                    if nuevo_valor < mejor_valor:
+                        mejor_valor = nuevo_valor
+                        mejor_pendiente = True
+                elif tentativo:
+                    arbol.actualizar(a, cargas[a])
+                    arbol.actualizar(b, cargas[b])
             
-            # Enfriar temperatura
-            temperatura *= factor_enfriamiento
+            iteracion += lote
+            traza.append(mejor_valor)
             
-            # Verificar convergencia
-            if temperatura < temperatura_final:
-                break
+            if mejor_valor < mejor_reportado:
+                mejor_reportado = mejor_valor
+                incumbente = np.array(genes if mejor_pendiente else mejor_genes)
+                self._reportar_incumbente(self._genes_factibles(incumbente, datos), mejor_valor, iteracion)
+        
+        if mejor_pendiente:
+            mejor_genes = genes
+        
+        # Solo se materializan las asignaciones de la mejor solución
+        mejor = np.array(mejor_genes)
+        mejor_valor = float(self._evaluar_poblacion(mejor[np.newaxis, :], datos, parametros)[0])
+        mejor_solucion = self._construir_asignaciones(self._genes_factibles(mejor, datos), procesos, recursos)
+        
+        metricas = self._calcular_metricas_solucion(mejor_solucion)
+        metricas.update({
+            "movimientos_evaluados": iteracion,
+            "movimientos_aceptados": aceptados
+        })
         
         return SolucionOptimizada(
             asignaciones=mejor_solucion,
             valor_objetivo=mejor_valor,
             tiempo_ejecucion=0.0,
-            iteraciones=iteracion + 1,
-            convergencia=temperatura < temperatura_final,
-            metricas=self._calcular_metricas_solucion(mejor_solucion)
+            iteraciones=iteracion,
+            convergencia=iteracion >= parametros.max_iteraciones,
+            metricas=metricas,
+            trazas_convergencia=[traza]
+        )
+    
+    def _optimizar_estructura_asignacion(self, 
+                                        procesos: List[Proceso], 
+                                        recursos: List[Recurso], 
+                                        datos: ProblemaCompilado, 
+                                        parametros: ParametrosOptimizacion) -> Optional[SolucionOptimizada]:
+        """
+        Resuelve de forma exacta las instancias con estructura de asignación.
+        
+        Si la capacidad de cada recurso equivale a un número fijo de
+        cupos (véase _calcular_cupos), el problema de asignación
+        generalizada se reduce a uno de transporte con el mismo objetivo
+        que _optimizar_lineal:
+        - Con a lo sumo un cupo por recurso se usa el método húngaro
+          (linear_sum_assignment).
+        - Con más cupos se resuelve el flujo de costo mínimo
+          procesos -> recursos -> sumidero, con arcos de capacidad igual a
+          los cupos. Su matriz es totalmente unimodular, por lo que el
+          simplex devuelve una solución entera.
+        
+        Args:
+            procesos: Lista de procesos
+            recursos: Lista de recursos
+            datos: Problema compilado
+            parametros: Parámetros de optimización
+            
+        Returns:
+            Optional[SolucionOptimizada]: Solución óptima, o None si la
+            instancia no tiene esa estructura o no admite asignar todos
+            los procesos
+        """
+        num_procesos = datos.num_procesos
+        cupos = self._calcular_cupos(datos)
+        if cupos is None or not datos.factible.any(axis=1).all() or cupos.sum() < num_procesos:
+            return None
+        
+        costos = datos.puntuacion
+        if cupos.max() <= 1:
+            metodo = "hungaro"
+            try:
+                filas, columnas = linear_sum_assignment(np.where(datos.factible, costos, np.inf))
+            except ValueError:
+                return None
+            if filas.size < num_procesos:
+                return None
+            asignacion = np.full(num_procesos, -1)
+            asignacion[filas] = columnas
+            iteraciones = 0
+        else:
+            metodo = "flujo_costo_minimo"
+            modelo = (ConstructorModeloAsignacion(costos, np.ones(num_procesos), datos.factible)
+                      .agregar_asignacion_unica()
+                      .agregar_capacidad(cupos)
+                      .construir())
+            resultado = linprog(modelo.c, A_ub=modelo.A_ub, b_ub=modelo.b_ub, 
+                                A_eq=modelo.A_eq, b_eq=modelo.b_eq, 
+                                bounds=(0, 1), method='highs-ds')
+            if not resultado.success or not self._es_entera(resultado.x):
+                return None
+            asignacion = modelo.a_asignacion(resultado.x)
+            iteraciones = resultado.nit
+        
+        valor = float(costos[np.arange(num_procesos), asignacion].sum())
+        self._reportar_incumbente(asignacion, valor, 0)
+        self._logger.info(f"Instancia con estructura de asignación resuelta con {metodo}")
+        
+        asignaciones = self._construir_asignaciones(asignacion, procesos, recursos)
+        metricas = self._calcular_metricas_solucion(asignaciones)
+        metricas.update({
+            "metodo_resolucion": metodo,
+            "cota_inferior": valor,
+            "gap_optimalidad": 0.0,
+            "optimo_demostrado": True,
+            "solucion_factible": True
+        })
+        
+        return SolucionOptimizada(
+            asignaciones=asignaciones,
+            valor_objetivo=valor,
+            tiempo_ejecucion=0.0,
+            iteraciones=iteraciones,
+            convergencia=True,
+            metricas=metricas
         )
     
     def _optimizar_lineal(self, 
                          procesos: List[Proceso], 
                          recursos: List[Recurso], 
+                         datos: ProblemaCompilado, 
                          parametros: ParametrosOptimizacion) -> SolucionOptimizada:
         """
         Optimiza usando programación lineal.
         
+        Por defecto se resuelve la relajación continua y se redondea. Con
+        parametros.programacion_entera se resuelve en cambio el modelo
+        binario (MILP), que puede tardar más y dar otra solución.
+        
         Args:
             procesos: Lista de procesos
             recursos: Lista de recursos
+            datos: Problema compilado
             parametros: Parámetros de optimización
             
         Returns:
             SolucionOptimizada: Solución encontrada
         """
-        # Crear matriz de variables de decisión
-        # x[i][j] = 1 si proceso i se asigna a recurso j, 0 en caso contrario
-        num_procesos = len(procesos)
-        num_recursos = len(recursos)
-        
-        # Coeficientes de la función objetivo
-        c = []
-        for i, proceso in enumerate(procesos):
-            for j, recurso in enumerate(recursos):
-                # Costo de asignar proceso i a recurso j
-                costo = proceso.tiempo_estimado_horas * recurso.costo_por_hora
-                tiempo = proceso.tiempo_estimado_horas
-                eficiencia = recurso.capacidad_disponible / recurso.capacidad_maxima
-                
-                # Función objetivo ponderada
-                valor_objetivo = (parametros.peso_costo * costo + 
-                                parametros.peso_tiempo * tiempo - 
-                                parametros.peso_eficiencia * eficiencia)
-                c.append(valor_objetivo)
-        
-        # Restricciones
-        A_eq = []
-        b_eq = []
-        
-        # Restricción: cada proceso debe asignarse a exactamente un recurso
-        for i in range(num_procesos):
-            restriccion = [0] * (num_procesos * num_recursos)
-            for j in range(num_recursos):
-                restriccion[i * num_recursos + j] = 1
-            A_eq.append(restriccion)
-            b_eq.append(1)
-        
-        # Restricciones de desigualdad
-        A_ub = []
-        b_ub = []
-        
-        # Restricción: capacidad de recursos
-        for j in range(num_recursos):
-            restriccion = [0] * (num_procesos * num_recursos)
-            for i in range(num_procesos):
-                restriccion[i * num_recursos + j] = procesos[i].tiempo_estimado_horas
-            A_ub.append(restriccion)
-            b_ub.append(recursos[j].capacidad_disponible)
-        
-        # Límites de las variables (0 <= x <= 1)
-        bounds = [(0, 1) for _ in range(num_procesos * num_recursos)]
+        if parametros.programacion_entera:
+            return self._optimizar_lineal_entero(procesos, recursos, datos, parametros)
+        
+        # x_ij = 1 si el proceso i se asigna al recurso j; solo se crean
+        # variables para los pares factibles
+        costos = datos.puntuacion
+        modelo = (ConstructorModeloAsignacion(costos, datos.duraciones, datos.factible)
+                  .agregar_asignacion_unica()
+                  .agregar_capacidad(datos.capacidad)
+                  .construir())
         
         try:
             # Resolver el problema de programación lineal
-            resultado = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, 
-                              bounds=bounds, method='highs')
+            resultado = linprog(modelo.c, A_ub=modelo.A_ub, b_ub=modelo.b_ub, 
+                              A_eq=modelo.A_eq, b_eq=modelo.b_eq, 
+                              bounds=(0, 1), method='highs')
             
             if resultado.success:
                 # Convertir resultado a asignaciones
-                asignaciones = self._convertir_resultado_lineal(resultado.x, procesos, recursos)
+                asignaciones = self._convertir_resultado_lineal(modelo, resultado.x, procesos, recursos)
                 
                 return SolucionOptimizada(
                     asignaciones=asignaciones,
@@ -472,86 +999,306 @@ class OptimizadorRecursos:
                 )
             else:
                 # Fallback a algoritmo greedy si falla la optimización lineal
-                return self._optimizar_greedy(procesos, recursos, parametros)
+                return self._optimizar_greedy(procesos, recursos, datos, parametros)
                 
         except Exception as e:
             self._logger.warning(f"Error en optimización lineal: {str(e)}, usando greedy")
-            return self._optimizar_greedy(procesos, recursos, parametros)
+            return self._optimizar_greedy(procesos, recursos, datos, parametros)
+    
+    def _optimizar_lineal_entero(self, 
+                                procesos: List[Proceso], 
+                                recursos: List[Recurso], 
+                                datos: ProblemaCompilado, 
+                                parametros: ParametrosOptimizacion) -> SolucionOptimizada:
+        """
+        Optimiza usando programación lineal entera (MILP) con HiGHS.
+        
+        Cada variable x_ij es binaria, por lo que ningún proceso se pierde
+        al redondear. HiGHS no recibe una solución inicial: el greedy con
+        capacidad residual se calcula aparte y su solución se devuelve si
+        HiGHS no encuentra una mejor dentro del límite de tiempo o de nodos.
+        
+        Args:
+            procesos: Lista de procesos
+            recursos: Lista de recursos
+            datos: Problema compilado
+            parametros: Parámetros de optimización
+            
+        Returns:
+            SolucionOptimizada: Solución encontrada
+        """
+        costos = datos.puntuacion
+        num_procesos = costos.shape[0]
+        
+        incumbente = self._greedy_capacidad_residual(costos, datos.duraciones, datos.factible, datos.capacidad)
+        valor_incumbente = float('inf')
+        if incumbente is not None:
+            valor_incumbente = float(costos[np.arange(num_procesos), incumbente].sum())
+            self._reportar_incumbente(incumbente, valor_incumbente, 0)
+        
+        modelo = (ConstructorModeloAsignacion(costos, datos.duraciones, datos.factible)
+                  .agregar_asignacion_unica()
+                  .agregar_capacidad(datos.capacidad)
+                  .construir())
+        opciones = {"mip_rel_gap": parametros.gap_optimalidad, "node_limit": parametros.max_nodos}
+        restante = self._tiempo_restante(parametros)
+        if restante is not None:
+            opciones["time_limit"] = max(restante, 1e-3)
+        
+        resultado = milp(
+            modelo.c,
+            integrality=np.ones(modelo.num_variables),
+            bounds=Bounds(0, 1),
+            constraints=[
+                LinearConstraint(modelo.A_eq, modelo.b_eq, modelo.b_eq),
+                LinearConstraint(modelo.A_ub, -np.inf, modelo.b_ub)
+            ],
+            options=opciones
+        )
+        
+        origen = "milp"
+        if resultado.x is not None and resultado.fun <= valor_incumbente:
+            asignacion = modelo.a_asignacion(resultado.x)
+            valor = float(resultado.fun)
+        elif incumbente is not None:
+            asignacion, valor, origen = incumbente, valor_incumbente, "greedy"
+        else:
+            # Ninguna asignación completa respeta la capacidad: se usa el greedy original
+            self._logger.warning(f"MILP sin solución factible ({resultado.message}), usando greedy")
+            solucion = self._optimizar_greedy(procesos, recursos, datos, parametros)
+            solucion.metricas.update({
+                "estado_solver": resultado.message,
+                "solucion_factible": False
+            })
+            return solucion
+        
+        cota_inferior = getattr(resultado, "mip_dual_bound", None)
+        gap = None
+        if cota_inferior is not None:
+            gap = max(0.0, valor - cota_inferior) / max(abs(valor), 1e-9)
+        
+        asignaciones = self._construir_asignaciones(asignacion, procesos, recursos)
+        metricas = self._calcular_metricas_solucion(asignaciones)
+        metricas.update({
+            "estado_solver": resultado.message,
+            "codigo_estado_solver": resultado.status,
+            "origen_solucion": origen,
+            "cota_inferior": cota_inferior,
+            "gap_optimalidad": gap,
+            "nodos_explorados": getattr(resultado, "mip_node_count", None),
+            "optimo_demostrado": resultado.status == 0 and origen == "milp",
+            "solucion_factible": True
+        })
+        
+        return SolucionOptimizada(
+            asignaciones=asignaciones,
+            valor_objetivo=valor,
+            tiempo_ejecucion=0.0,
+            iteraciones=getattr(resultado, "mip_node_count", None) or 0,
+            convergencia=resultado.status == 0,
+            metricas=metricas
+        )
     
     def _optimizar_branch_and_bound(self, 
                                    procesos: List[Proceso], 
                                    recursos: List[Recurso], 
+                                   datos: ProblemaCompilado, 
                                    parametros: ParametrosOptimizacion) -> SolucionOptimizada:
         """
         Optimiza usando ramificación y acotación.
         
+        Resuelve de forma exacta el problema de asignación generalizada
+        (cada proceso a exactamente un recurso, respetando la capacidad
+        disponible) con la misma función objetivo lineal que
+        _optimizar_lineal. Cada nodo se acota con la relajación lineal
+        (HiGHS) y se ramifica en dos: el proceso fraccional más largo se
+        fija a su recurso de mayor valor relajado o se le prohíbe. Tras
+        ramificar se sigue por el mejor hijo hasta cerrar la rama y luego
+        por el nodo abierto de menor cota. El incumbente inicial proviene
+        del greedy con capacidad residual y cada nodo lo intenta mejorar
+        redondeando su relajación.
+        
+        Antes de acotar un nodo, la capacidad de cada recurso se reduce a
+        la mayor carga que sumas de sus procesos permitidos pueden
+        alcanzar. Ninguna solución entera se pierde y la relajación deja de
+        llenar fraccionalmente horas que ninguna combinación de procesos
+        cubre. Con esto el árbol cierra instancias ajustadas de 60 procesos
+        (ver la instancia "exacta" de benchmarks).
+        
+        Si se agota el presupuesto de nodos o de tiempo se devuelve el
+        mejor incumbente junto con el gap de optimalidad en las métricas.
+        
         Args:
             procesos: Lista de procesos
             recursos: Lista de recursos
+            datos: Problema compilado
             parametros: Parámetros de optimización
             
         Returns:
             SolucionOptimizada: Solución encontrada
         """
-        # Por simplicidad, implementamos una versión básica
-        # que usa el algoritmo greedy como heurística
-        return self._optimizar_greedy(procesos, recursos, parametros)
-    
-    # Métodos auxiliares
-    def _ordenar_procesos_greedy(self, 
-                                procesos: List[Proceso], 
-                                recursos: List[Recurso], 
-                                parametros: ParametrosOptimizacion) -> List[Proceso]:
-        """Ordena procesos para el algoritmo greedy."""
-        def clave_ordenamiento(proceso):
-            # Combinar prioridad, tiempo y costo estimado
-            prioridad = proceso.prioridad.value
-            tiempo = proceso.tiempo_estimado_horas
-            costo_estimado = min(r.costo_por_hora for r in recursos if r.costo_por_hora > 0) * tiempo
-            
-            return (prioridad * parametros.peso_eficiencia + 
-                    1/tiempo * parametros.peso_tiempo + 
-                    1/costo_estimado * parametros.peso_costo)
-        
-        return sorted(procesos, key=clave_ordenamiento, reverse=True)
-    
-    def _encontrar_mejor_recurso_greedy(self, 
-                                       proceso: Proceso, 
-                                       recursos: List[Recurso], 
-                                       recursos_ocupados: Dict[str, float], 
-                                       parametros: ParametrosOptimizacion) -> Tuple[Optional[Recurso], float]:
-        """Encuentra el mejor recurso para un proceso en el algoritmo greedy."""
-        mejor_recurso = None
-        mejor_puntuacion = float('inf')
-        
-        for recurso in recursos:
-            if not recurso.puede_asignarse(proceso.tiempo_estimado_horas):
+        costos = datos.puntuacion
+        rejilla = self._discretizar_duraciones(datos.duraciones)
+        modelo = (ConstructorModeloAsignacion(costos, datos.duraciones, datos.factible)
+                  .agregar_asignacion_unica()
+                  .agregar_capacidad(datos.capacidad)
+                  .construir())
+        
+        # Incumbente inicial: greedy con capacidad residual
+        incumbente = self._greedy_capacidad_residual(costos, datos.duraciones, datos.factible, datos.capacidad)
+        valor_incumbente = float('inf')
+        if incumbente is not None:
+            valor_incumbente = float(costos[np.arange(len(incumbente)), incumbente].sum())
+            self._reportar_incumbente(incumbente, valor_incumbente, 0)
+        
+        # Nodo: (cota, contador, variables_permitidas, solucion_relajada)
+        contador = 0
+        abiertos = []
+        nodos_explorados = 0
+        presupuesto_agotado = False
+        
+        def evaluar_nodo(permitido: np.ndarray) -> Optional[Tuple[float, int, np.ndarray, np.ndarray]]:
+            nonlocal contador, nodos_explorados, incumbente, valor_incumbente
+            nodos_explorados += 1
+            capacidad = datos.capacidad
+            if rejilla is not None:
+                capacidad = self._ajustar_capacidad(rejilla, datos.capacidad, permitido)
+                if capacidad is None:
+                    return None
+            relajacion = self._resolver_relajacion(modelo, capacidad, permitido)
+            if relajacion is None:
+                return None
+            cota, x, costos_reducidos = relajacion
+            
+            redondeo = self._redondear_relajacion(x, costos, datos.duraciones, datos.capacidad, permitido, 
+                                                  datos.factible)
+            if redondeo is not None:
+                redondeo = self._mejorar_asignacion(redondeo, costos, datos.duraciones, datos.capacidad, datos.factible)
+                valor = float(costos[np.arange(len(redondeo)), redondeo].sum())
+                if valor < valor_incumbente:
+                    incumbente, valor_incumbente = redondeo, valor
+                    self._reportar_incumbente(incumbente, valor_incumbente, nodos_explorados)
+            
+            if cota < valor_incumbente and not self._es_entera(x):
+                # Fijación por costo reducido: ninguna solución del subárbol puede usar estas variables
+                permitido = permitido & (cota + costos_reducidos < valor_incumbente)
+                contador += 1
+                return (cota, contador, permitido, x)
+            return None
+        
+        def cerrado(cota: float) -> bool:
+            """Si una cota ya no puede mejorar el incumbente más allá del gap aceptado."""
+            return (math.isfinite(valor_incumbente) and 
+                    valor_incumbente - cota <= parametros.gap_optimalidad * max(abs(valor_incumbente), 1e-9))
+        
+        # Primero-el-mejor con inmersión: tras ramificar se sigue por el mejor hijo,
+        # que llega pronto a hojas enteras, y el resto queda en la cola por cota
+        actual = evaluar_nodo(datos.factible.copy())
+        while actual is not None or abiertos:
+            if actual is None:
+                actual = heapq.heappop(abiertos)
+            if cerrado(actual[0]):
+                actual = None
+                # Si la menor cota no mejora el incumbente, es óptimo
+                if not abiertos or cerrado(abiertos[0][0]):
+                    break
                 continue
             
-            # Calcular puntuación
-            costo = proceso.tiempo_estimado_horas * recurso.costo_por_hora
-            tiempo = proceso.tiempo_estimado_horas
-            eficiencia = recurso.capacidad_disponible / recurso.capacidad_maxima
+            if nodos_explorados >= parametros.max_nodos or self._debe_detenerse(parametros):
+                heapq.heappush(abiertos, actual)
+                presupuesto_agotado = True
+                break
+            
+            _, _, permitido, x = actual
+            
+            # Ramificar el proceso fraccional más largo sobre su recurso de mayor valor
+            # relajado: un hijo lo fija a ese recurso y el otro se lo prohíbe
+            fraccionales = np.flatnonzero(x.max(axis=1) < 1.0 - 1e-6)
+            i = fraccionales[np.argmax(datos.duraciones[fraccionales])]
+            j = int(np.argmax(x[i]))
+            fijado, prohibido = permitido.copy(), permitido.copy()
+            fijado[i] = False
+            fijado[i, j] = True
+            prohibido[i, j] = False
             
-            puntuacion = (parametros.peso_costo * costo + 
-                         parametros.peso_tiempo * tiempo - 
-                         parametros.peso_eficiencia * eficiencia)
+            hijos = []
+            for hijo in (fijado, prohibido):
+                nodo = evaluar_nodo(hijo)
+                if nodo is not None:
+                    hijos.append(nodo)
             
-            if puntuacion < mejor_puntuacion:
-                mejor_puntuacion = puntuacion
-                mejor_recurso = recurso
+            hijos.sort(key=lambda nodo: nodo[:2])
+            actual = hijos[0] if hijos else None
+            for nodo in hijos[1:]:
+                heapq.heappush(abiertos, nodo)
+        
+        if incumbente is None:
+            # Ninguna asignación completa respeta la capacidad: se usa el greedy original
+            self._logger.warning("Ramificación y acotación sin solución factible completa, usando greedy")
+            solucion = self._optimizar_greedy(procesos, recursos, datos, parametros)
+            solucion.metricas.update({
+                "nodos_explorados": nodos_explorados,
+                "estado_busqueda": "sin incumbente",
+                "cota_inferior": abiertos[0][0] if abiertos else None,
+                "gap_optimalidad": None,
+                "optimo_demostrado": False,
+                "solucion_factible": False
+            })
+            return solucion
+        
+        # La menor cota abierta acota el óptimo; sin nodos abiertos el incumbente es óptimo
+        cota_inferior = min(abiertos[0][0], valor_incumbente) if abiertos else valor_incumbente
+        gap = float(valor_incumbente - cota_inferior) / max(abs(valor_incumbente), 1e-9)
+        optimo = not presupuesto_agotado
+        
+        asignaciones = self._construir_asignaciones(incumbente, procesos, recursos)
+        metricas = self._calcular_metricas_solucion(asignaciones)
+        metricas.update({
+            "nodos_explorados": nodos_explorados,
+            "estado_busqueda": "optimo" if optimo else "presupuesto agotado",
+            "cota_inferior": cota_inferior,
+            "gap_optimalidad": gap,
+            "optimo_demostrado": optimo,
+            "solucion_factible": True
+        })
         
-        return mejor_recurso, mejor_puntuacion
+        return SolucionOptimizada(
+            asignaciones=asignaciones,
+            valor_objetivo=valor_incumbente,
+            tiempo_ejecucion=0.0,
+            iteraciones=nodos_explorados,
+            convergencia=optimo,
+            metricas=metricas
+        )
+    
+    # Métodos auxiliares
+    def _ordenar_procesos_greedy(self, 
+                                datos: ProblemaCompilado, 
+                                parametros: ParametrosOptimizacion) -> np.ndarray:
+        """Ordena procesos para el algoritmo greedy (índices, de mayor a menor clave)."""
+        # Combinar prioridad, tiempo y costo estimado
+        costos_positivos = datos.costo_hora[datos.costo_hora > 0]
+        costo_minimo = costos_positivos.min() if costos_positivos.size else np.inf
+        costo_estimado = costo_minimo * datos.duraciones
+        
+        clave = (datos.prioridades * parametros.peso_eficiencia + 
+                 1 / datos.duraciones * parametros.peso_tiempo + 
+                 1 / costo_estimado * parametros.peso_costo)
+        return np.argsort(-clave, kind='stable')
+    
+    def _asignacion_greedy(self, datos: ProblemaCompilado) -> np.ndarray:
+        """Recurso factible de menor puntuación para cada proceso (-1 = sin recurso factible)."""
+        puntuacion = np.where(datos.factible, datos.puntuacion, np.inf)
+        asignacion = puntuacion.argmin(axis=1)
+        asignacion[~datos.factible.any(axis=1)] = -1
+        return asignacion
     
     def _crear_asignacion_optimizada(self, 
                                     proceso: Proceso, 
                                     recurso: Recurso, 
-                                    horas_ocupadas: float) -> AsignacionRecurso:
-        """Crea una asignación optimizada."""
-        from datetime import timedelta
-        
-        fecha_inicio = datetime.now() + timedelta(hours=horas_ocupadas)
-        fecha_fin = fecha_inicio + timedelta(hours=proceso.tiempo_estimado_horas)
+                                    fecha_inicio: datetime,
+                                    fecha_fin: datetime) -> AsignacionRecurso:
+        """Crea una asignación optimizada con las fechas dadas por el calendario del recurso."""
         costo_estimado = proceso.tiempo_estimado_horas * recurso.costo_por_hora
         
         return AsignacionRecurso(
@@ -572,8 +1319,12 @@ class OptimizadorRecursos:
             return float('inf')
         
         costo_total = sum(a.costo_estimado for a in asignaciones)
-        tiempo_total = max(a.fecha_fin for a in asignaciones) - min(a.fecha_inicio for a in asignaciones)
-        tiempo_total_horas = tiempo_total.total_seconds() / 3600
+        
+        # Makespan en horas de trabajo: la carga del recurso más ocupado
+        cargas: Dict[str, float] = {}
+        for a in asignaciones:
+            cargas[a.recurso_id] = cargas.get(a.recurso_id, 0.0) + a.horas_asignadas
+        tiempo_total_horas = max(cargas.values())
         
         # Normalizar valores
         costo_normalizado = costo_total / len(asignaciones)
@@ -600,94 +1351,584 @@ class OptimizadorRecursos:
             "recursos_utilizados": len(set(a.recurso_id for a in asignaciones))
         }
     
-    # Métodos auxiliares para algoritmo genético
-    def _inicializar_poblacion(self, procesos: List[Proceso], recursos: List[Recurso], tamaño: int) -> List[List[int]]:
-        """Inicializa población para algoritmo genético."""
-        poblacion = []
-        for _ in range(tamaño):
-            individuo = [self._random.randint(0, len(recursos)-1) for _ in range(len(procesos))]
-            poblacion.append(individuo)
-        return poblacion
-    
-    def _decodificar_individuo(self, individuo: List[int], procesos: List[Proceso], recursos: List[Recurso]) -> List[AsignacionRecurso]:
-        """Decodifica un individuo a asignaciones."""
-        asignaciones = []
-        recursos_ocupados = {r.id: 0.0 for r in recursos}
-        
-        for i, recurso_idx in enumerate(individuo):
-            proceso = procesos[i]
-            recurso = recursos[recurso_idx]
-            
-            if recurso.puede_asignarse(proceso.tiempo_estimado_horas):
-                asignacion = self._crear_asignacion_optimizada(proceso, recurso, recursos_ocupados[recurso.id])
-                asignaciones.append(asignacion)
-                recursos_ocupados[recurso.id] += proceso.tiempo_estimado_horas
-        
-        return asignaciones
-    
-    def _seleccion_torneo(self, poblacion: List[List[int]], fitness: List[float]) -> List[List[int]]:
-        """Selección por torneo."""
-        seleccionados = []
-        for _ in range(len(poblacion)):
-            torneo = self._random.sample(list(zip(poblacion, fitness)), 3)
-            ganador = min(torneo, key=lambda x: x[1])
-            seleccionados.append(ganador[0])
-        return seleccionados
-    
-    def _cruce_uniforme(self, padre1: List[int], padre2: List[int]) -> Tuple[List[int], List[int]]:
-        """Cruce uniforme."""
-        hijo1 = []
-        hijo2 = []
-        for i in range(len(padre1)):
-            if self._random.random() < 0.5:
-                hijo1.append(padre1[i])
-                hijo2.append(padre2[i])
-            else:
-                hijo1.append(padre2[i])
-                hijo2.append(padre1[i])
-        return hijo1, hijo2
+    def _construir_asignaciones(self, 
+                               asignacion: np.ndarray, 
+                               procesos: List[Proceso], 
+                               recursos: List[Recurso], 
+                               orden: Optional[np.ndarray] = None) -> List[AsignacionRecurso]:
+        """
+        Convierte un vector proceso -> índice de recurso (-1 = sin asignar) en asignaciones, en el orden dado.
+        
+        Si los procesos dependen unos de otros, el orden se ajusta para que
+        cada uno vaya después de sus predecesores y no empiece antes de que
+        terminen; los predecesores sin asignar no lo retrasan.
+        """
+        orden = list(range(len(asignacion)) if orden is None else orden)
+        predecesores: List[List[int]] = [[] for _ in procesos]
+        if any(p.dependencias for p in procesos):
+            grafo = compilar_dependencias(procesos)
+            if grafo.tiene_dependencias:
+                rango = [len(procesos)] * len(procesos)
+                for k, i in enumerate(orden):
+                    rango[i] = k
+                orden = ordenar_topologicamente(grafo, rango, procesos)
+                predecesores = grafo.predecesores
+        
+        orden = [i for i in orden if asignacion[i] >= 0]
+        if not orden:
+            return []
+        
+        # Los procesos de cada recurso se ejecutan en serie, en el orden dado
+        indices_recursos = np.array([asignacion[i] for i in orden], dtype=int)
+        horas_previas = np.empty(len(orden))
+        horas_finales = np.empty(len(orden))
+        horas_ocupadas = [0.0] * len(recursos)
+        fin_procesos = [0.0] * len(procesos)
+        for k, i in enumerate(orden):
+            j = indices_recursos[k]
+            horas_previas[k] = max([horas_ocupadas[j]] + [fin_procesos[p] for p in predecesores[i]])
+            horas_ocupadas[j] = horas_previas[k] + procesos[i].tiempo_estimado_horas
+            horas_finales[k] = fin_procesos[i] = horas_ocupadas[j]
+        
+        calendario = CalendarioLaboral(recursos, self._fecha_inicio or datetime.now(), self._feriados, self._ausencias)
+        fechas_inicio, fechas_fin = calendario.fechas(indices_recursos, horas_previas, horas_finales)
+        
+        return [self._crear_asignacion_optimizada(procesos[i], recursos[j], inicio, fin)
+                for i, j, inicio, fin in zip(orden, indices_recursos.tolist(), fechas_inicio, fechas_fin)]
     
-    def _mutar_individuo(self, individuo: List[int], num_recursos: int) -> None:
-        """Muta un individuo."""
-        for i in range(len(individuo)):
-            if self._random.random() < 0.1:  # Tasa de mutación por gen
-                individuo[i] = self._random.randint(0, num_recursos-1)
+    # Métodos auxiliares para ramificación y acotación
+    def _greedy_capacidad_residual(self, 
+                                  costos: np.ndarray, 
+                                  duraciones: np.ndarray, 
+                                  factible: np.ndarray, 
+                                  capacidad: np.ndarray) -> Optional[np.ndarray]:
+        """Greedy que descuenta la capacidad usada; None si no logra asignar todos los procesos."""
+        residual = capacidad.copy()
+        asignacion = np.full(len(duraciones), -1)
+        
+        # Los procesos más largos primero para no fragmentar la capacidad
+        for i in np.argsort(-duraciones, kind='stable'):
+            candidatos = np.flatnonzero(factible[i] & (residual >= duraciones[i]))
+            if candidatos.size == 0:
+                return None
+            j = candidatos[np.argmin(costos[i, candidatos])]
+            asignacion[i] = j
+            residual[j] -= duraciones[i]
+        
+        return asignacion
     
-    # Métodos auxiliares para simulated annealing
-    def _generar_solucion_inicial(self, procesos: List[Proceso], recursos: List[Recurso]) -> List[AsignacionRecurso]:
-        """Genera solución inicial para simulated annealing."""
-        parametros = ParametrosOptimizacion()
-        return self._optimizar_greedy(procesos, recursos, parametros).asignaciones
+    def _discretizar_duraciones(self, duraciones: np.ndarray) -> Optional[Tuple[np.ndarray, float]]:
+        """
+        Expresa las duraciones como múltiplos enteros de un paso común.
+        
+        El paso es el máximo común divisor de las duraciones en minutos.
+        
+        Returns:
+            Optional[Tuple[np.ndarray, float]]: (pasos de cada proceso, horas
+            por paso), o None si alguna duración no es un número entero de
+            minutos
+        """
+        minutos = np.rint(duraciones * 60.0)
+        if not np.allclose(minutos, duraciones * 60.0, rtol=0.0, atol=1e-6):
+            return None
+        minutos = minutos.astype(np.int64)
+        paso = int(np.gcd.reduce(minutos))
+        if paso == 0:
+            return None
+        return minutos // paso, paso / 60.0
     
-    def _generar_solucion_vecina(self, solucion: List[AsignacionRecurso], procesos: List[Proceso], recursos: List[Recurso]) -> List[AsignacionRecurso]:
-        """Genera solución vecina para simulated annealing."""
-        nueva_solucion = solucion.copy()
+    def _ajustar_capacidad(self, 
+                          rejilla: Tuple[np.ndarray, float], 
+                          capacidad: np.ndarray, 
+                          permitido: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Reduce cada capacidad a la mayor carga alcanzable con los procesos permitidos.
         
-        if nueva_solucion:
-            # Cambiar aleatoriamente una asignación
-            idx = self._random.randint(0, len(nueva_solucion)-1)
-            nuevo_recurso = self._random.choice(recursos)
+        Las cargas alcanzables de un recurso son las sumas de subconjuntos
+        de sus procesos permitidos que incluyen a los que solo le están
+        permitidos a él; se calculan como un conjunto de bits en un entero,
+        donde el bit k indica que k pasos de la rejilla son alcanzables.
+        
+        Args:
+            rejilla: Pasos de cada proceso y horas por paso (ver _discretizar_duraciones)
+            capacidad: Horas disponibles por recurso (n_recursos,)
+            permitido: Pares proceso-recurso permitidos en el nodo
             
-            # Encontrar el proceso correspondiente
-            proceso_id = nueva_solucion[idx].proceso_id
-            proceso = next((p for p in procesos if p.id == proceso_id), None)
+        Returns:
+            Optional[np.ndarray]: Capacidad ajustada por recurso, o None si
+            los procesos fijados a algún recurso ya la exceden
+        """
+        pasos, horas_paso = rejilla
+        fijados = permitido.sum(axis=1) == 1
+        ajustada = capacidad.astype(float)
+        
+        for j in range(len(capacidad)):
+            if not permitido[:, j].any() or not math.isfinite(capacidad[j]):
+                continue
+            limite = math.floor(capacidad[j] / horas_paso + 1e-9)
+            base = int(pasos[fijados & permitido[:, j]].sum())
+            if base > limite:
+                return None
             
-            if proceso and nuevo_recurso.puede_asignarse(proceso.tiempo_estimado_horas):
-                nueva_solucion[idx] = self._crear_asignacion_optimizada(proceso, nuevo_recurso, 0)
+            libres = pasos[permitido[:, j] & ~fijados]
+            if base + int(libres.sum()) <= limite:
+                ajustada[j] = min(capacidad[j], (base + int(libres.sum())) * horas_paso)
+                continue
+            
+            mascara = (1 << (limite + 1)) - 1
+            alcanzables = 1 << base
+            for p in libres.tolist():
+                alcanzables = (alcanzables | (alcanzables << p)) & mascara
+                if alcanzables >> limite:
+                    break
+            ajustada[j] = min(capacidad[j], (alcanzables.bit_length() - 1) * horas_paso)
         
-        return nueva_solucion
+        return ajustada
     
-    def _convertir_resultado_lineal(self, x: np.ndarray, procesos: List[Proceso], recursos: List[Recurso]) -> List[AsignacionRecurso]:
-        """Convierte resultado de programación lineal a asignaciones."""
-        asignaciones = []
-        num_recursos = len(recursos)
-        
-        for i, proceso in enumerate(procesos):
-            for j, recurso in enumerate(recursos):
-                idx = i * num_recursos + j
-                if x[idx] > 0.5:  # Asignación binaria
-                    asignacion = self._crear_asignacion_optimizada(proceso, recurso, 0)
-                    asignaciones.append(asignacion)
-                    break
+    def _resolver_relajacion(self, 
+                            modelo: ModeloAsignacion, 
+                            capacidad: np.ndarray, 
+                            permitido: np.ndarray) -> Optional[Tuple[float, np.ndarray, np.ndarray]]:
+        """
+        Resuelve la relajación lineal restringida a las variables permitidas.
+        
+        El modelo se construye una sola vez con todos los pares factibles;
+        cada nodo solo cambia las cotas de las variables (las no permitidas
+        quedan en 0) y el lado derecho de las filas de capacidad.
+        
+        Args:
+            modelo: Modelo con asignación única y capacidad sobre los pares factibles
+            capacidad: Horas disponibles por recurso en el nodo (n_recursos,)
+            permitido: Pares proceso-recurso permitidos en el nodo
+        
+        Returns:
+            Optional[Tuple[float, np.ndarray, np.ndarray]]: (cota inferior,
+            x y costos reducidos, ambos de forma (n_procesos, n_recursos)),
+            o None si el nodo es infactible
+        """
+        if not permitido.any(axis=1).all():
+            return None
+        
+        activas = permitido[modelo.procesos, modelo.recursos]
+        cotas = np.column_stack((np.zeros(modelo.num_variables), activas.astype(float)))
+        resultado = linprog(modelo.c, A_ub=modelo.A_ub, b_ub=capacidad, 
+                            A_eq=modelo.A_eq, b_eq=modelo.b_eq, bounds=cotas, method='highs')
+        if not resultado.success:
+            return None
+        
+        costos_reducidos = np.full(permitido.shape, np.inf)
+        costos_reducidos[modelo.procesos[activas], modelo.recursos[activas]] = resultado.lower.marginals[activas]
+        return float(resultado.fun), modelo.a_matriz(resultado.x), costos_reducidos
+    
+    def _redondear_relajacion(self, 
+                             x: np.ndarray, 
+                             costos: np.ndarray, 
+                             duraciones: np.ndarray, 
+                             capacidad: np.ndarray, 
+                             permitido: np.ndarray, 
+                             factible: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Redondea la relajación asignando primero los procesos con valores más
+        cercanos a 1; los que ya no caben en ningún recurso permitido se
+        insertan al final con _insertar_desplazando.
+        """
+        residual = capacidad.copy()
+        asignacion = np.full(x.shape[0], -1)
+        sin_lugar = []
+        
+        for i in np.argsort(-x.max(axis=1), kind='stable'):
+            candidatos = np.flatnonzero(permitido[i] & (residual >= duraciones[i]))
+            if candidatos.size == 0:
+                sin_lugar.append(i)
+                continue
+            # Preferir el mayor valor relajado y, a igualdad, el menor costo
+            j = candidatos[np.lexsort((costos[i, candidatos], -x[i, candidatos]))[0]]
+            asignacion[i] = j
+            residual[j] -= duraciones[i]
+        
+        for i in sin_lugar:
+            if not self._insertar_desplazando(i, asignacion, residual, costos, duraciones, factible):
+                return None
+        
+        return asignacion
+    
+    def _insertar_desplazando(self, 
+                             i: int, 
+                             asignacion: np.ndarray, 
+                             residual: np.ndarray, 
+                             costos: np.ndarray, 
+                             duraciones: np.ndarray, 
+                             factible: np.ndarray) -> bool:
+        """
+        Inserta un proceso moviendo, si hace falta, a otro proceso de recurso.
+        
+        Si ningún recurso factible tiene holgura, se mueve un proceso k de
+        un recurso j a otro recurso con holgura para hacerle lugar en j; se
+        elige el movimiento que menos aumenta el costo. Actualiza asignacion
+        y residual.
+        
+        Args:
+            i: Proceso a insertar
+            asignacion: Recurso de cada proceso (-1 = sin asignar)
+            residual: Horas libres de cada recurso
+            costos: Costo de cada par proceso-recurso
+            duraciones: Horas de cada proceso
+            factible: Pares proceso-recurso factibles
+            
+        Returns:
+            bool: Si el proceso pudo insertarse
+        """
+        directos = np.flatnonzero(factible[i] & (residual >= duraciones[i]))
+        if directos.size:
+            j = directos[np.argmin(costos[i, directos])]
+            asignacion[i] = j
+            residual[j] -= duraciones[i]
+            return True
+        
+        asignados = np.flatnonzero(asignacion >= 0)
+        if asignados.size == 0:
+            return False
+        origen = asignacion[asignados]
+        filas = np.arange(asignados.size)
+        
+        # Destino más barato de cada proceso asignado, fuera de su recurso y con holgura
+        destinos = factible[asignados] & (residual[np.newaxis, :] >= duraciones[asignados, np.newaxis])
+        destinos[filas, origen] = False
+        costos_destino = np.where(destinos, costos[asignados], np.inf)
+        destino = np.argmin(costos_destino, axis=1)
+        
+        aumento = costos[i, origen] + costos_destino[filas, destino] - costos[asignados, origen]
+        aumento[~(factible[i, origen] & (residual[origen] + duraciones[asignados] >= duraciones[i]))] = np.inf
+        e = int(np.argmin(aumento))
+        if not np.isfinite(aumento[e]):
+            return False
+        
+        k, j, l = asignados[e], origen[e], destino[e]
+        asignacion[k] = l
+        residual[l] -= duraciones[k]
+        residual[j] += duraciones[k] - duraciones[i]
+        asignacion[i] = j
+        return True
+    
+    def _mejorar_asignacion(self, 
+                           asignacion: np.ndarray, 
+                           costos: np.ndarray, 
+                           duraciones: np.ndarray, 
+                           capacidad: np.ndarray, 
+                           factible: np.ndarray) -> np.ndarray:
+        """
+        Búsqueda local: mueve procesos a recursos más baratos mientras haya
+        capacidad residual y, cuando ya no hay movimientos que mejoren,
+        intercambia los recursos de dos procesos si ambos caben y baja el costo.
+        """
+        asignacion = asignacion.copy()
+        filas = np.arange(len(asignacion))
+        residual = capacidad - np.bincount(asignacion, weights=duraciones, minlength=len(capacidad))
+        diferencias = duraciones[:, np.newaxis] - duraciones[np.newaxis, :]  # d_i - d_k
+        
+        while True:
+            actuales = costos[filas, asignacion]
+            mejoras = costos - actuales[:, np.newaxis]
+            mejoras[~(factible & (residual[np.newaxis, :] >= duraciones[:, np.newaxis]))] = 0.0
+            i, j = np.unravel_index(np.argmin(mejoras), mejoras.shape)
+            if mejoras[i, j] < -1e-12:
+                residual[asignacion[i]] += duraciones[i]
+                residual[j] -= duraciones[i]
+                asignacion[i] = j
+                continue
+            
+            # Intercambio: i pasa al recurso de k y k al de i
+            cruzados = costos[:, asignacion]
+            mejoras = cruzados + cruzados.T - actuales[:, np.newaxis] - actuales[np.newaxis, :]
+            libres = residual[asignacion]
+            validos = (factible[:, asignacion] & factible[:, asignacion].T & 
+                       (libres[:, np.newaxis] >= -diferencias) & (libres[np.newaxis, :] >= diferencias))
+            mejoras[~validos] = 0.0
+            i, k = np.unravel_index(np.argmin(mejoras), mejoras.shape)
+            if mejoras[i, k] >= -1e-12:
+                return asignacion
+            residual[asignacion[i]] += diferencias[i, k]
+            residual[asignacion[k]] -= diferencias[i, k]
+            asignacion[i], asignacion[k] = asignacion[k], asignacion[i]
+    
+    def _calcular_cupos(self, datos: ProblemaCompilado) -> Optional[np.ndarray]:
+        """
+        Calcula cuántos procesos admite cada recurso si su capacidad equivale a cupos.
+        
+        La restricción de horas de un recurso equivale a "a lo sumo k
+        procesos" cuando caben los k procesos factibles más largos pero no
+        los k + 1 más cortos (por ejemplo, duraciones iguales o recursos
+        que solo admiten un proceso).
+        
+        Returns:
+            Optional[np.ndarray]: Cupos por recurso (n_recursos,), o None si
+            algún recurso no cumple la condición
+        """
+        tolerancia = 1e-9
+        factible = datos.factible.T
+        capacidad = datos.capacidad[:, np.newaxis] + tolerancia
+        
+        # Sumas acumuladas de las duraciones factibles, de menor a mayor y de mayor a menor
+        ascendentes = np.cumsum(np.sort(np.where(factible, datos.duraciones, np.inf), axis=1), axis=1)
+        descendentes = np.cumsum(-np.sort(np.where(factible, -datos.duraciones, np.inf), axis=1), axis=1)
+        
+        cupos = (ascendentes <= capacidad).sum(axis=1)
+        con_cupos = cupos > 0
+        mayores = np.take_along_axis(descendentes, np.maximum(cupos - 1, 0)[:, np.newaxis], axis=1)
+        if np.any(mayores[con_cupos] > capacidad[con_cupos]):
+            return None
+        return cupos
+    
+    def _es_entera(self, x: np.ndarray) -> bool:
+        """Indica si una solución relajada ya es binaria."""
+        return bool(np.all(np.minimum(x, 1.0 - x) <= 1e-6))
+    
+    # Métodos auxiliares para algoritmo genético
+    def _evaluar_poblacion(self, 
+                          poblacion: np.ndarray, 
+                          datos: ProblemaCompilado, 
+                          parametros: ParametrosOptimizacion) -> np.ndarray:
+        """
+        Evalúa la función objetivo de toda la población en una sola pasada.
+        
+        Reproduce _calcular_valor_objetivo sobre _decodificar_individuo sin
+        construir asignaciones: los genes no factibles se descartan, el
+        costo se suma por fila y el makespan es la carga máxima por recurso.
+        
+        Args:
+            poblacion: Arreglo (tamaño_poblacion, n_procesos) de índices de recurso
+            datos: Datos vectorizados del problema
+            parametros: Parámetros de optimización
+            
+        Returns:
+            np.ndarray: Valor objetivo de cada individuo (inf si no asigna nada)
+        """
+        num_individuos, num_procesos = poblacion.shape
+        num_recursos = datos.costo_hora.shape[0]
+        
+        # Factibilidad de capacidad de cada gen
+        factible = datos.factible[np.arange(num_procesos), poblacion]
+        horas = np.where(factible, datos.duraciones, 0.0)
+        
+        costo_total = (horas * datos.costo_hora[poblacion]).sum(axis=1)
+        num_asignados = factible.sum(axis=1)
+        
+        # Carga por (individuo, recurso); los procesos de un recurso se ejecutan en serie
+        indices = np.arange(num_individuos)[:, np.newaxis] * num_recursos + poblacion
+        cargas = np.bincount(indices.ravel(), weights=horas.ravel(), 
+                             minlength=num_individuos * num_recursos)
+        makespan = cargas.reshape(num_individuos, num_recursos).max(axis=1)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            costo_normalizado = costo_total / num_asignados
+            tiempo_normalizado = makespan / num_asignados
+            eficiencia = np.where(makespan > 0, num_asignados / makespan, 0.0)
+            valores = (parametros.peso_costo * costo_normalizado + 
+                       parametros.peso_tiempo * tiempo_normalizado - 
+                       parametros.peso_eficiencia * eficiencia)
         
-        return asignaciones
+        return np.where(num_asignados > 0, valores, np.inf)
+    
+    def _evolucionar_poblacion(self, 
+                              poblacion: np.ndarray, 
+                              datos: ProblemaCompilado, 
+                              parametros: ParametrosOptimizacion, 
+                              generaciones: int) -> Tuple[np.ndarray, Optional[np.ndarray], float, List[float], bool]:
+        """
+        Evoluciona una población durante un número de generaciones.
+        
+        Returns:
+            Tuple: (población final, mejor individuo, mejor valor, traza del
+            mejor valor por generación, si se alcanzó la convergencia)
+        """
+        tasa_cruce = 0.8
+        tasa_mutacion = 0.1
+        
+        mejor_individuo = None
+        mejor_valor = float('inf')
+        traza = []
+        convergio = False
+        
+        for iteracion in range(generaciones):
+            # Evaluar población completa
+            valores_fitness = self._evaluar_poblacion(poblacion, datos, parametros)
+            
+            # Actualizar mejor solución
+            idx_mejor = int(np.argmin(valores_fitness))
+            if valores_fitness[idx_mejor] < mejor_valor:
+                mejor_valor = float(valores_fitness[idx_mejor])
+                mejor_individuo = poblacion[idx_mejor].copy()
+                self._reportar_incumbente(self._genes_factibles(mejor_individuo, datos), mejor_valor, iteracion)
+            traza.append(mejor_valor)
+            
+            if self._debe_detenerse(parametros):
+                break
+            
+            # Selección, cruce y mutación
+            poblacion_seleccionada = self._seleccion_torneo(poblacion, valores_fitness)
+            nueva_poblacion = self._cruce_uniforme(poblacion_seleccionada, tasa_cruce)
+            self._mutar_poblacion(nueva_poblacion, datos, tasa_mutacion)
+            
+            poblacion = nueva_poblacion
+            
+            # Verificar convergencia
+            if iteracion > 100 and abs(mejor_valor) < parametros.tolerancia:
+                convergio = True
+                break
+        
+        return poblacion, mejor_individuo, mejor_valor, traza, convergio
+    
+    def _migrar_elites(self, 
+                      poblaciones: List[np.ndarray], 
+                      datos: ProblemaCompilado, 
+                      parametros: ParametrosOptimizacion) -> None:
+        """Migración en anillo: las élites de la isla k reemplazan a los peores de la isla k+1."""
+        if parametros.num_migrantes == 0:
+            return
+        
+        fitness = [self._evaluar_poblacion(p, datos, parametros) for p in poblaciones]
+        elites = [p[np.argsort(f, kind='stable')[:parametros.num_migrantes]].copy()
+                  for p, f in zip(poblaciones, fitness)]
+        
+        for k, poblacion in enumerate(poblaciones):
+            peores = np.argsort(fitness[k], kind='stable')[-parametros.num_migrantes:]
+            poblacion[peores] = elites[k - 1]
+    
+    def _derivar_semillas(self, parametros: ParametrosOptimizacion) -> List[np.random.SeedSequence]:
+        """Deriva una semilla independiente por trabajador a partir de semilla_aleatoria."""
+        return np.random.SeedSequence(parametros.semilla_aleatoria).spawn(parametros.num_trabajadores)
+    
+    def _inicializar_poblacion(self, 
+                              datos: ProblemaCompilado, 
+                              tamaño: int, 
+                              generador: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Inicializa población para algoritmo genético con un recurso factible por proceso."""
+        procesos = np.broadcast_to(np.arange(datos.num_procesos), (tamaño, datos.num_procesos))
+        return self._genes_aleatorios(procesos, datos, generador or self._rng)
+    
+    def _genes_aleatorios(self, 
+                         procesos: np.ndarray, 
+                         datos: ProblemaCompilado, 
+                         generador: np.random.Generator) -> np.ndarray:
+        """
+        Elige al azar un recurso factible para cada proceso indicado.
+        
+        Los procesos sin recursos factibles reciben uno cualquiera, que se
+        descarta al evaluar y al decodificar.
+        
+        Args:
+            procesos: Índices de proceso, de cualquier forma
+            datos: Datos vectorizados del problema
+            generador: Generador de números aleatorios
+            
+        Returns:
+            np.ndarray: Índice de recurso para cada proceso, con la forma de procesos
+        """
+        orden, cantidades = datos.recursos_factibles
+        opciones = np.where(cantidades > 0, cantidades, datos.num_recursos)[procesos]
+        return orden[procesos, (generador.random(procesos.shape) * opciones).astype(int)]
+    
+    def _decodificar_individuo(self, 
+                              individuo: np.ndarray, 
+                              datos: ProblemaCompilado, 
+                              procesos: List[Proceso], 
+                              recursos: List[Recurso]) -> List[AsignacionRecurso]:
+        """Decodifica un individuo a asignaciones descartando los genes no factibles."""
+        return self._construir_asignaciones(self._genes_factibles(individuo, datos), procesos, recursos)
+    
+    def _genes_factibles(self, individuo: np.ndarray, datos: ProblemaCompilado) -> np.ndarray:
+        """Marca como sin asignar (-1) los genes cuyo recurso no es factible."""
+        factible = datos.factible[np.arange(len(individuo)), individuo]
+        return np.where(factible, individuo, -1)
+    
+    def _vector_asignacion(self, asignaciones: List[AsignacionRecurso], datos: ProblemaCompilado) -> np.ndarray:
+        """Convierte asignaciones a un vector proceso -> índice de recurso (-1 = sin asignar)."""
+        indice_proceso = {proceso_id: i for i, proceso_id in enumerate(datos.proceso_ids)}
+        indice_recurso = {recurso_id: j for j, recurso_id in enumerate(datos.recurso_ids)}
+        
+        asignacion = np.full(datos.num_procesos, -1)
+        for a in asignaciones:
+            asignacion[indice_proceso[a.proceso_id]] = indice_recurso[a.recurso_id]
+        return asignacion
+    
+    def _parametros_trabajador(self, parametros: ParametrosOptimizacion) -> ParametrosOptimizacion:
+        """Parámetros para un proceso trabajador con el plazo restante y la fecha de inicio de esta optimización."""
+        restante = self._tiempo_restante(parametros)
+        if restante is None:
+            return replace(parametros, fecha_inicio=self._fecha_inicio)
+        return replace(parametros, tiempo_limite_segundos=max(restante, 1e-3), fecha_inicio=self._fecha_inicio)
+    
+    def _seleccion_torneo(self, poblacion: np.ndarray, fitness: np.ndarray) -> np.ndarray:
+        """Selección por torneo de tamaño 3."""
+        tamaño = poblacion.shape[0]
+        competidores = self._rng.integers(0, tamaño, size=(tamaño, 3))
+        ganadores = competidores[np.arange(tamaño), np.argmin(fitness[competidores], axis=1)]
+        return poblacion[ganadores]
+    
+    def _cruce_uniforme(self, poblacion: np.ndarray, tasa_cruce: float) -> np.ndarray:
+        """Cruce uniforme por parejas consecutivas."""
+        tamaño = poblacion.shape[0]
+        padres1 = poblacion[0::2]
+        padres2 = poblacion[1::2]
+        if padres2.shape[0] < padres1.shape[0]:
+            padres2 = np.vstack([padres2, poblacion[:1]])
+        
+        # Solo las parejas que cruzan intercambian genes
+        cruza = self._rng.random(padres1.shape[0]) < tasa_cruce
+        mascara = (self._rng.random(padres1.shape) < 0.5) & cruza[:, np.newaxis]
+        
+        hijos1 = np.where(mascara, padres2, padres1)
+        hijos2 = np.where(mascara, padres1, padres2)
+        
+        hijos = np.empty((2 * padres1.shape[0], poblacion.shape[1]), dtype=poblacion.dtype)
+        hijos[0::2] = hijos1
+        hijos[1::2] = hijos2
+        return hijos[:tamaño]
+    
+    def _mutar_poblacion(self, poblacion: np.ndarray, datos: ProblemaCompilado, tasa_mutacion: float) -> None:
+        """Muta la población in situ, reemplazando genes por otros recursos factibles del mismo proceso."""
+        mutan = self._rng.random(poblacion.shape[0]) < tasa_mutacion
+        mascara = (self._rng.random(poblacion.shape) < 0.1) & mutan[:, np.newaxis]  # Tasa de mutación por gen
+        poblacion[mascara] = self._genes_aleatorios(np.nonzero(mascara)[1], datos, self._rng)
+    
+    def _convertir_resultado_lineal(self, 
+                                   modelo: ModeloAsignacion, 
+                                   x: np.ndarray, 
+                                   procesos: List[Proceso], 
+                                   recursos: List[Recurso]) -> List[AsignacionRecurso]:
+        """Convierte resultado de programación lineal a asignaciones."""
+        return self._construir_asignaciones(modelo.a_asignacion(x), procesos, recursos)
+
+
+def _inicializar_trabajador(evento_detencion: Any, datos: ProblemaCompilado) -> None:
+    """Guarda en el proceso trabajador el evento con que el padre pide detenerse y el problema compilado."""
+    global _evento_detencion_trabajador, _datos_trabajador
+    _evento_detencion_trabajador = evento_detencion
+    _datos_trabajador = datos
+
+
+def _evolucionar_isla(parametros: ParametrosOptimizacion, 
+                      poblacion: np.ndarray, 
+                      generador: np.random.Generator, 
+                      generaciones: int) -> tuple:
+    """Ejecuta generaciones de una isla del algoritmo genético en un proceso trabajador."""
+    optimizador = OptimizadorRecursos()
+    optimizador._rng = generador
+    optimizador._inicio_optimizacion = time.monotonic()
+    optimizador._evento_detencion = _evento_detencion_trabajador
+    return optimizador._evolucionar_poblacion(poblacion, _datos_trabajador, parametros, generaciones) + (optimizador._rng,)
+
+
+def _ejecutar_reinicio(procesos: List[Proceso], 
+                       recursos: List[Recurso], 
+                       parametros: ParametrosOptimizacion, 
+                       semilla: np.random.SeedSequence) -> SolucionOptimizada:
+    """Ejecuta un reinicio del recocido simulado en un proceso trabajador."""
+    optimizador = OptimizadorRecursos()
+    optimizador._rng = np.random.default_rng(semilla)
+    optimizador._inicio_optimizacion = time.monotonic()
+    optimizador._evento_detencion = _evento_detencion_trabajador
+    optimizador._fecha_inicio = parametros.fecha_inicio
+    optimizador._feriados = parametros.feriados
+    optimizador._ausencias = parametros.ausencias
+    return optimizador._optimizar_simulated_annealing(procesos, recursos, _datos_trabajador, parametros)
@@ -0,0 +1,400 @@
+"""
+Problema Compilado
+
+Este módulo convierte, una sola vez por solicitud, las listas de procesos
+y recursos del dominio en arreglos NumPy: vectores de atributos,
+habilidades codificadas como identificadores enteros y la matriz
+dispersa de coincidencias proceso x recurso. La factibilidad, el costo y
+la puntuación ponderada se calculan por proceso para la distribución de
+recursos, que solo mira las filas de sus candidatos, y como matrices
+densas solo cuando un optimizador las pide. También expone
+el índice invertido de habilidades a recursos sobre el que se construyen
+y la parte que depende solo de los procesos, que puede compilarse una vez
+y reutilizarse con distintos conjuntos de recursos.
+
+Principios SOLID aplicados:
+- Single Responsibility: Solo traduce entidades a arreglos numéricos
+- Open/Closed: Nuevos atributos se agregan sin cambiar a los consumidores
+- Dependency Inversion: Los algoritmos dependen de arreglos, no de entidades
+
+Autor: Equipo de Desarrollo
+Fecha: 2025-07-07
+"""
+
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from functools import cached_property
+import numpy as np
+from scipy import sparse
+
+from domain.models.proceso import Proceso
+from domain.models.recurso import Recurso
+
+
+@dataclass
+class ProblemaCompilado:
+    """
+    Representación numérica de un problema de asignación.
+    
+    Las filas corresponden a los procesos y las columnas a los recursos,
+    en el mismo orden de las listas recibidas. Las matrices densas
+    proceso x recurso (compatible, factible, costo y puntuacion) se
+    calculan al primer acceso; quien recorre los procesos de a uno usa
+    factible_de y coincidencias_de, que no las materializan.
+    
+    Attributes:
+        proceso_ids: IDs de los procesos (n_procesos,)
+        recurso_ids: IDs de los recursos (n_recursos,)
+        duraciones: Horas estimadas de cada proceso (n_procesos,)
+        prioridades: Valor de prioridad de cada proceso (n_procesos,)
+        costo_hora: Costo por hora de cada recurso (n_recursos,)
+        capacidad: Capacidad disponible de cada recurso (n_recursos,)
+        eficiencia: Fracción de capacidad libre de cada recurso (n_recursos,)
+        utilizacion: Porcentaje de utilización de cada recurso (n_recursos,)
+        con_experiencia: Si el recurso tiene nivel de experiencia (n_recursos,)
+        disponible: Si el recurso está disponible (n_recursos,)
+        habilidades: ID entero de cada habilidad (incluye los nombres de recurso)
+        requeridas: Habilidades requeridas por proceso, dispersa (n_procesos, n_habilidades)
+        ofrecidas: Habilidades ofrecidas por recurso, dispersa (n_recursos, n_habilidades)
+        sin_requisitos: Si el proceso no tiene requisitos (n_procesos,)
+        coincidencias: Requisitos del proceso i que cubre el recurso j, dispersa (n_procesos, n_recursos)
+        pesos: Pesos de costo, tiempo y eficiencia de la puntuación
+    """
+    proceso_ids: List[str]
+    recurso_ids: List[str]
+    duraciones: np.ndarray
+    prioridades: np.ndarray
+    costo_hora: np.ndarray
+    capacidad: np.ndarray
+    eficiencia: np.ndarray
+    utilizacion: np.ndarray
+    con_experiencia: np.ndarray
+    disponible: np.ndarray
+    habilidades: Dict[str, int]
+    requeridas: sparse.csr_matrix
+    ofrecidas: sparse.csr_matrix
+    sin_requisitos: np.ndarray
+    coincidencias: sparse.csr_matrix
+    pesos: Tuple[float, float, float]
+    
+    @property
+    def num_procesos(self) -> int:
+        """Número de procesos del problema."""
+        return self.duraciones.shape[0]
+    
+    @property
+    def num_recursos(self) -> int:
+        """Número de recursos del problema."""
+        return self.costo_hora.shape[0]
+    
+    @property
+    def cubiertos(self) -> np.ndarray:
+        """Si algún recurso es compatible con cada proceso (n_procesos,)."""
+        con_coincidencias = np.diff(self.coincidencias.indptr) > 0
+        return con_coincidencias | (self.sin_requisitos & (self.num_recursos > 0))
+    
+    def coincidencias_de(self, i: int) -> np.ndarray:
+        """Requisitos del proceso i que cubre cada recurso (n_recursos,)."""
+        fila = np.zeros(self.num_recursos, dtype=int)
+        inicio, fin = self.coincidencias.indptr[i], self.coincidencias.indptr[i + 1]
+        fila[self.coincidencias.indices[inicio:fin]] = self.coincidencias.data[inicio:fin]
+        return fila
+    
+    def factible_de(self, i: int, duracion: Optional[float] = None) -> np.ndarray:
+        """
+        Recursos que pueden asignarse al proceso i.
+        
+        Equivale a la fila i de factible sin calcular la matriz completa.
+        
+        Args:
+            i: Índice del proceso
+            duracion: Horas con que se comprueba la capacidad (por defecto, las del proceso)
+        
+        Returns:
+            np.ndarray: Máscara de recursos factibles (n_recursos,)
+        """
+        if duracion is None:
+            duracion = self.duraciones[i]
+        asignables = self.disponible & (self.capacidad >= duracion)
+        if self.sin_requisitos[i]:
+            return asignables
+        compatibles = np.zeros(self.num_recursos, dtype=bool)
+        compatibles[self.coincidencias.indices[self.coincidencias.indptr[i]:self.coincidencias.indptr[i + 1]]] = True
+        return asignables & compatibles
+    
+    @cached_property
+    def compatible(self) -> np.ndarray:
+        """Si el recurso j cubre algún requisito del proceso i (n_procesos, n_recursos)."""
+        return self.sin_requisitos[:, np.newaxis] | (self.coincidencias.toarray() > 0)
+    
+    @cached_property
+    def factible(self) -> np.ndarray:
+        """Si el recurso j puede asignarse al proceso i (n_procesos, n_recursos)."""
+        # Equivalente vectorizado de recurso.puede_asignarse(proceso.tiempo_estimado_horas)
+        return (self.disponible[np.newaxis, :] &
+                (self.capacidad[np.newaxis, :] >= self.duraciones[:, np.newaxis]) &
+                self.compatible)
+    
+    @cached_property
+    def recursos_factibles(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Recursos factibles de cada proceso, para muestrear entre ellos.
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Índices de recurso con los factibles
+            al principio de cada fila (n_procesos, n_recursos) y cuántos son
+            (n_procesos,)
+        """
+        return np.argsort(~self.factible, axis=1, kind='stable'), self.factible.sum(axis=1)
+    
+    @cached_property
+    def costo(self) -> np.ndarray:
+        """Costo de ejecutar el proceso i con el recurso j (n_procesos, n_recursos)."""
+        return self.duraciones[:, np.newaxis] * self.costo_hora[np.newaxis, :]
+    
+    @cached_property
+    def puntuacion(self) -> np.ndarray:
+        """Valor objetivo ponderado de cada par, menor es mejor (n_procesos, n_recursos)."""
+        peso_costo, peso_tiempo, peso_eficiencia = self.pesos
+        return (peso_costo * self.costo +
+                peso_tiempo * self.duraciones[:, np.newaxis] -
+                peso_eficiencia * self.eficiencia[np.newaxis, :])
+    
+    def cobertura_requisitos(self, i: int) -> Tuple[int, np.ndarray]:
+        """
+        Codifica los requisitos del proceso i como bits.
+        
+        El bit k corresponde al k-ésimo requisito distinto del proceso que
+        algún recurso ofrece.
+        
+        Args:
+            i: Índice del proceso
+        
+        Returns:
+            Tuple[int, np.ndarray]: Máscara con todos los requisitos y máscara
+            de los requisitos que cubre cada recurso (n_recursos,)
+        
+        Raises:
+            ValueError: Si el proceso tiene más requisitos de los que caben en la máscara
+        """
+        requisitos = np.unique(self.requeridas.indices[self.requeridas.indptr[i]:self.requeridas.indptr[i + 1]])
+        if requisitos.shape[0] > 62:
+            raise ValueError(f"El proceso {self.proceso_ids[i]} tiene demasiados requisitos para formar un equipo")
+        
+        bits = np.left_shift(1, np.arange(requisitos.shape[0], dtype=np.int64))
+        cubiertos = self.ofrecidas[:, requisitos].toarray() > 0
+        return int(bits.sum()), cubiertos.astype(np.int64) @ bits
+
+
+@dataclass
+class ProcesosCompilados:
+    """
+    Parte de un problema que depende solo de los procesos.
+    
+    Los requisitos se codifican con un vocabulario propio de los procesos;
+    al combinarse con unos recursos se traducen a sus habilidades.
+    
+    Attributes:
+        duraciones: Horas estimadas de cada proceso (n_procesos,)
+        prioridades: Valor de prioridad de cada proceso (n_procesos,)
+        sin_requisitos: Si el proceso no tiene requisitos (n_procesos,)
+        requisitos: ID entero de cada requisito, en orden de aparición
+        requeridas: Requisitos de cada proceso, dispersa (n_procesos, n_requisitos)
+    """
+    duraciones: np.ndarray
+    prioridades: np.ndarray
+    sin_requisitos: np.ndarray
+    requisitos: Dict[str, int]
+    requeridas: sparse.csr_matrix
+    
+    def seleccionar(self, indices: np.ndarray) -> 'ProcesosCompilados':
+        """
+        Devuelve los procesos indicados, en ese orden.
+        
+        Args:
+            indices: Posición de cada proceso en la compilación original
+        
+        Returns:
+            ProcesosCompilados: Procesos reordenados con el mismo vocabulario de requisitos
+        """
+        indices = np.asarray(indices, dtype=int)
+        return ProcesosCompilados(
+            duraciones=self.duraciones[indices],
+            prioridades=self.prioridades[indices],
+            sin_requisitos=self.sin_requisitos[indices],
+            requisitos=self.requisitos,
+            requeridas=self.requeridas[indices]
+        )
+
+
+def compilar_procesos(procesos: List[Proceso]) -> ProcesosCompilados:
+    """
+    Compila la parte del problema que depende solo de los procesos.
+    
+    Args:
+        procesos: Lista de procesos
+    
+    Returns:
+        ProcesosCompilados: Atributos y requisitos de los procesos
+    """
+    requisitos: Dict[str, int] = {}
+    filas_requeridas, columnas_requeridas = [], []
+    for i, proceso in enumerate(procesos):
+        for requisito in proceso.recursos_requeridos:
+            filas_requeridas.append(i)
+            columnas_requeridas.append(requisitos.setdefault(requisito, len(requisitos)))
+    
+    # Los requisitos repetidos se suman, igual que al contarlos uno a uno
+    requeridas = sparse.csr_matrix(
+        (np.ones(len(filas_requeridas)), (filas_requeridas, columnas_requeridas)),
+        shape=(len(procesos), len(requisitos))
+    )
+    
+    return ProcesosCompilados(
+        duraciones=np.array([p.tiempo_estimado_horas for p in procesos], dtype=float),
+        prioridades=np.array([p.prioridad.value for p in procesos], dtype=float),
+        sin_requisitos=np.array([not p.recursos_requeridos for p in procesos], dtype=bool),
+        requisitos=requisitos,
+        requeridas=requeridas
+    )
+
+
+@dataclass
+class IndiceHabilidades:
+    """
+    Índice invertido de habilidades a recursos.
+    
+    El nombre de cada recurso cuenta como una habilidad más, de modo que un
+    requisito se cubre con una sola búsqueda en lugar de recorrer las
+    habilidades de todos los recursos.
+    
+    Attributes:
+        habilidades: ID entero de cada habilidad, en orden de aparición
+        ofrecidas: Habilidades ofrecidas por recurso, dispersa (n_recursos, n_habilidades)
+        por_habilidad: Recursos que ofrecen cada habilidad, dispersa (n_habilidades, n_recursos)
+        costo_minimo: Menor costo por hora entre los recursos que ofrecen cada habilidad (n_habilidades,)
+    """
+    habilidades: Dict[str, int]
+    ofrecidas: sparse.csr_matrix
+    por_habilidad: sparse.csr_matrix
+    costo_minimo: np.ndarray
+    
+    def recursos_con(self, habilidad: str) -> np.ndarray:
+        """Índices de los recursos que ofrecen la habilidad (vacío si ninguno la ofrece)."""
+        k = self.habilidades.get(habilidad)
+        if k is None:
+            return np.empty(0, dtype=int)
+        return self.por_habilidad.indices[self.por_habilidad.indptr[k]:self.por_habilidad.indptr[k + 1]]
+
+
+def indexar_habilidades(recursos: List[Recurso]) -> IndiceHabilidades:
+    """
+    Construye el índice invertido de habilidades de los recursos.
+    
+    Args:
+        recursos: Lista de recursos
+    
+    Returns:
+        IndiceHabilidades: Índice con los recursos y el costo mínimo de cada habilidad
+    """
+    habilidades: Dict[str, int] = {}
+    filas_ofrecidas, columnas_ofrecidas = [], []
+    for j, recurso in enumerate(recursos):
+        for habilidad in dict.fromkeys(recurso.habilidades + [recurso.nombre]):
+            filas_ofrecidas.append(j)
+            columnas_ofrecidas.append(habilidades.setdefault(habilidad, len(habilidades)))
+    
+    ofrecidas = sparse.csr_matrix(
+        (np.ones(len(filas_ofrecidas)), (filas_ofrecidas, columnas_ofrecidas)),
+        shape=(len(recursos), len(habilidades))
+    )
+    
+    # Cada habilidad la ofrece al menos un recurso, así que ningún tramo está vacío
+    costo_hora = np.array([r.costo_por_hora for r in recursos], dtype=float)
+    por_habilidad = ofrecidas.T.tocsr()
+    if habilidades:
+        costo_minimo = np.minimum.reduceat(costo_hora[por_habilidad.indices], por_habilidad.indptr[:-1])
+    else:
+        costo_minimo = np.empty(0)
+    
+    return IndiceHabilidades(
+        habilidades=habilidades,
+        ofrecidas=ofrecidas,
+        por_habilidad=por_habilidad,
+        costo_minimo=costo_minimo
+    )
+
+
+def compilar_problema(procesos: List[Proceso],
+                      recursos: List[Recurso],
+                      peso_costo: float = 0.4,
+                      peso_tiempo: float = 0.3,
+                      peso_eficiencia: float = 0.3,
+                      procesos_compilados: Optional[ProcesosCompilados] = None) -> ProblemaCompilado:
+    """
+    Compila procesos y recursos a su representación numérica.
+    
+    Un requisito del proceso se cubre si coincide con una habilidad del
+    recurso o con su nombre. Un par es factible si el recurso puede
+    asignarse con las horas del proceso (recurso.puede_asignarse) y, cuando
+    el proceso tiene requisitos, el recurso cubre al menos uno.
+    
+    Args:
+        procesos: Lista de procesos
+        recursos: Lista de recursos
+        peso_costo: Peso del costo en la puntuación
+        peso_tiempo: Peso del tiempo en la puntuación
+        peso_eficiencia: Peso de la eficiencia en la puntuación
+        procesos_compilados: Compilación previa de los mismos procesos, en
+            el mismo orden (por defecto se compila aquí)
+    
+    Returns:
+        ProblemaCompilado: Problema listo para los algoritmos vectorizados
+    """
+    if procesos_compilados is None:
+        procesos_compilados = compilar_procesos(procesos)
+    duraciones = procesos_compilados.duraciones
+    prioridades = procesos_compilados.prioridades
+    costo_hora = np.array([r.costo_por_hora for r in recursos], dtype=float)
+    capacidad = np.array([r.capacidad_disponible for r in recursos], dtype=float)
+    eficiencia = capacidad / np.array([r.capacidad_maxima for r in recursos], dtype=float)
+    utilizacion = np.array([r.porcentaje_utilizacion for r in recursos], dtype=float)
+    con_experiencia = np.array([bool(r.experiencia) for r in recursos], dtype=bool)
+    disponible = np.array([r.esta_disponible() for r in recursos], dtype=bool)
+    
+    indice = indexar_habilidades(recursos)
+    habilidades = indice.habilidades
+    
+    # Traducir los requisitos a habilidades; los que ningún recurso ofrece no pueden cubrirse y se descartan
+    destino = np.array([habilidades.get(requisito, -1) for requisito in procesos_compilados.requisitos], dtype=int)
+    locales = procesos_compilados.requeridas.tocoo()
+    columnas = destino[locales.col]
+    conservar = columnas >= 0
+    
+    ofrecidas = indice.ofrecidas
+    requeridas = sparse.csr_matrix(
+        (locales.data[conservar], (locales.row[conservar], columnas[conservar])),
+        shape=(len(procesos), len(habilidades))
+    )
+    # Solo se guardan los pares con alguna coincidencia
+    coincidencias = (requeridas @ ofrecidas.T).tocsr().astype(int)
+    coincidencias.eliminate_zeros()
+    
+    return ProblemaCompilado(
+        proceso_ids=[p.id for p in procesos],
+        recurso_ids=[r.id for r in recursos],
+        duraciones=duraciones,
+        prioridades=prioridades,
+        costo_hora=costo_hora,
+        capacidad=capacidad,
+        eficiencia=eficiencia,
+        utilizacion=utilizacion,
+        con_experiencia=con_experiencia,
+        disponible=disponible,
+        habilidades=habilidades,
+        requeridas=requeridas,
+        ofrecidas=ofrecidas,
+        sin_requisitos=procesos_compilados.sin_requisitos,
+        coincidencias=coincidencias,
+        pesos=(peso_costo, peso_tiempo, peso_eficiencia)
+    )
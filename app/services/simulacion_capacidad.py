@@ -0,0 +1,143 @@
+"""
+Simulación de Capacidad
+
+Este módulo estima por Monte Carlo cuántos procesos de un plan se
+completan realmente cuando sus duraciones se desvían de lo estimado.
+Los desvíos se aprenden de la historia: la razón entre tiempo real y
+tiempo estimado de los procesos completados, por tipo de proceso. Cada
+ensayo remuestrea una razón por proceso y ejecuta en serie los procesos
+de cada recurso; todos los ensayos de un lote se resuelven a la vez
+sobre una matriz ensayos x procesos, sin recorrerlos uno a uno.
+
+Autor: Equipo de Desarrollo
+Fecha: 2025-07-07
+"""
+
+from typing import Dict, List, Tuple
+from dataclasses import dataclass
+import numpy as np
+
+from domain.models.proceso import Proceso, TipoProceso
+
+
+# Elementos de la matriz ensayos x procesos que se resuelven por lote
+_ELEMENTOS_POR_LOTE = 2_000_000
+
+
+@dataclass
+class DistribucionDesvios:
+    """
+    Razones tiempo real / tiempo estimado observadas en la historia.
+
+    Las razones están agrupadas por tipo de proceso; los tipos con pocas
+    observaciones se muestrean del conjunto de todas.
+
+    Attributes:
+        razones: Razones observadas, agrupadas por tipo (n_observaciones,)
+        tramos: Inicio y cantidad de las razones de cada tipo con suficientes observaciones
+    """
+    razones: np.ndarray
+    tramos: Dict[TipoProceso, Tuple[int, int]]
+
+    def tramo(self, tipo: TipoProceso) -> Tuple[int, int]:
+        """Inicio y cantidad de las razones de las que se muestrea el tipo."""
+        return self.tramos.get(tipo, (0, self.razones.shape[0]))
+
+    def factores(self) -> Dict[TipoProceso, float]:
+        """Razón mediana de cada tipo con suficientes observaciones."""
+        return {tipo: float(np.median(self.razones[inicio:inicio + cantidad]))
+                for tipo, (inicio, cantidad) in self.tramos.items()}
+
+
+def aprender_desvios(historial: List[Proceso], minimo_observaciones: int = 5) -> DistribucionDesvios:
+    """
+    Aprende las razones tiempo real / tiempo estimado de procesos completados.
+
+    Sin historia utilizable la razón es siempre 1, es decir, las
+    estimaciones se toman como exactas.
+
+    Args:
+        historial: Procesos completados
+        minimo_observaciones: Observaciones necesarias para usar la distribución propia de un tipo
+
+    Returns:
+        DistribucionDesvios: Razones observadas por tipo
+    """
+    por_tipo: Dict[TipoProceso, List[float]] = {}
+    for proceso in historial:
+        if proceso.tiempo_real_horas is not None and proceso.tiempo_estimado_horas > 0:
+            por_tipo.setdefault(proceso.tipo, []).append(proceso.tiempo_real_horas / proceso.tiempo_estimado_horas)
+
+    if not por_tipo:
+        return DistribucionDesvios(razones=np.ones(1), tramos={})
+
+    tramos: Dict[TipoProceso, Tuple[int, int]] = {}
+    razones: List[float] = []
+    for tipo, observadas in por_tipo.items():
+        if len(observadas) >= minimo_observaciones:
+            tramos[tipo] = (len(razones), len(observadas))
+        razones.extend(observadas)
+
+    return DistribucionDesvios(razones=np.array(razones, dtype=float), tramos=tramos)
+
+
+def simular_plan(procesos: List[Proceso],
+                 recurso_de_proceso: np.ndarray,
+                 horas_por_recurso: np.ndarray,
+                 desvios: DistribucionDesvios,
+                 num_ensayos: int,
+                 rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simula la ejecución de un plan con duraciones remuestreadas.
+
+    Cada recurso ejecuta sus procesos del más corto al más largo; un
+    proceso se completa si el tiempo real acumulado del recurso hasta él
+    no supera sus horas disponibles. Las horas extra son las que faltan
+    para terminar todos los procesos planificados.
+
+    Args:
+        procesos: Lista de procesos
+        recurso_de_proceso: Recurso planificado de cada proceso, -1 si no está en el plan (n_procesos,)
+        horas_por_recurso: Horas disponibles de cada recurso (n_recursos,)
+        desvios: Distribución de razones tiempo real / estimado
+        num_ensayos: Cantidad de ensayos
+        rng: Generador de números aleatorios
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Procesos completados y horas extra de cada ensayo (num_ensayos,)
+    """
+    completados = np.zeros(num_ensayos, dtype=int)
+    horas_extra = np.zeros(num_ensayos, dtype=float)
+    planificados = np.flatnonzero(recurso_de_proceso >= 0)
+    if planificados.shape[0] == 0:
+        return completados, horas_extra
+
+    # Procesos agrupados por recurso, del más corto al más largo dentro de cada uno
+    estimadas_todas = np.array([p.tiempo_estimado_horas for p in procesos], dtype=float)
+    orden = planificados[np.lexsort((estimadas_todas[planificados], recurso_de_proceso[planificados]))]
+    recursos = recurso_de_proceso[orden]
+    n = orden.shape[0]
+    inicios_grupo = np.flatnonzero(np.r_[True, recursos[1:] != recursos[:-1]])
+    grupo = np.repeat(np.arange(inicios_grupo.shape[0]), np.diff(np.r_[inicios_grupo, n]))
+    capacidad = np.asarray(horas_por_recurso, dtype=float)[recursos[inicios_grupo]]
+
+    estimadas = estimadas_todas[orden]
+    tramos = np.array([desvios.tramo(procesos[i].tipo) for i in orden], dtype=int)
+    inicio_tramo, cantidad = tramos[:, 0], tramos[:, 1]
+
+    lote = max(1, _ELEMENTOS_POR_LOTE // n)
+    for a in range(0, num_ensayos, lote):
+        b = min(num_ensayos, a + lote)
+        muestras = inicio_tramo + (rng.random((b - a, n)) * cantidad).astype(int)
+        reales = estimadas * desvios.razones[muestras]
+
+        # Suma acumulada dentro de cada recurso: lo acumulado menos lo previo a su primer proceso
+        acumuladas = np.cumsum(reales, axis=1)
+        previas = (acumuladas - reales)[:, inicios_grupo]
+        por_recurso = acumuladas - previas[:, grupo]
+        completados[a:b] = (por_recurso <= capacidad[grupo] + 1e-9).sum(axis=1)
+
+        totales = np.add.reduceat(reales, inicios_grupo, axis=1)
+        horas_extra[a:b] = np.maximum(totales - capacidad, 0.0).sum(axis=1)
+
+    return completados, horas_extra
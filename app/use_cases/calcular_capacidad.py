@@ -3,7 +3,9 @@ Caso de Uso: Calcular Capacidad Semanal
 
 Este módulo implementa la lógica para calcular cuántos procesos
 pueden ejecutarse por semana basándose en los recursos disponibles,
-las horas de trabajo y las restricciones del sistema.
+las horas de trabajo y las restricciones del sistema, el pronóstico
+de horas libres de cada recurso en varias semanas consecutivas y la
+simulación del plan con los desvíos de duración observados.
 
 Principios SOLID aplicados:
 - Single Responsibility: Solo se encarga del cálculo de capacidad
@@ -14,12 +16,18 @@ Autor: Equipo de Desarrollo
 Fecha: 2025-07-07
 """
 
-from typing import Dict, List, Optional
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
 import logging
+import math
+import numpy as np
 
-from domain.models.proceso import Proceso
+from app.services.calendario import CalendarioLaboral
+from app.services.empaquetado import EmpaquetadoProcesos, empaquetar_procesos
+from app.services.simulacion_capacidad import aprender_desvios, simular_plan
+from app.use_cases.distribuir_recursos import AsignacionRecurso
+from domain.models.proceso import EstadoProceso, Proceso
 from domain.models.recurso import Recurso
 from domain.repositories.proceso_repository import ProcesoRepository
 
@@ -38,11 +46,15 @@ class CapacidadSemanalRequest:
         fecha_fin: Fecha de fin de la semana a planificar
         recursos_disponibles: Lista de recursos disponibles
         restricciones: Restricciones adicionales del sistema
+        feriados: Fechas no laborables dentro del período
+        ausencias: Intervalos (inicio, fin) en que cada recurso no trabaja, por ID de recurso
     """
     fecha_inicio: datetime
     fecha_fin: datetime
     recursos_disponibles: List[Recurso]
     restricciones: Optional[Dict] = None
+    feriados: Optional[List[date]] = None
+    ausencias: Optional[Dict[str, List[Tuple[datetime, datetime]]]] = None
 
 
 @dataclass
@@ -57,6 +69,8 @@ class CapacidadSemanalResponse:
         tiempo_total_requerido: Tiempo total requerido para todos los procesos
         eficiencia_proyectada: Porcentaje de eficiencia esperado
         recomendaciones: Lista de recomendaciones para optimizar
+        cota_superior_procesos: Máximo de procesos que podrían ejecutarse; si
+            coincide con total_procesos_posibles, el total es exacto
     """
     total_procesos_posibles: int
     capacidad_por_recurso: Dict[str, int]
@@ -64,6 +78,98 @@ class CapacidadSemanalResponse:
     tiempo_total_requerido: float
     eficiencia_proyectada: float
     recomendaciones: List[str]
+    cota_superior_procesos: Optional[int] = None
+
+
+@dataclass
+class PronosticoCapacidadRequest:
+    """
+    Datos de entrada para el pronóstico de capacidad por períodos.
+    
+    Attributes:
+        fecha_inicio: Día en que empieza el primer período
+        recursos_disponibles: Lista de recursos a pronosticar
+        numero_periodos: Cantidad de períodos consecutivos
+        dias_por_periodo: Días de cada período (7 para semanas, 1 para días)
+        asignaciones: Asignaciones ya planificadas, cuyas horas se descuentan
+        feriados: Fechas no laborables dentro del horizonte
+        ausencias: Intervalos (inicio, fin) en que cada recurso no trabaja, por ID de recurso
+    """
+    fecha_inicio: datetime
+    recursos_disponibles: List[Recurso]
+    numero_periodos: int = 12
+    dias_por_periodo: int = 7
+    asignaciones: List[AsignacionRecurso] = field(default_factory=list)
+    feriados: Optional[List[date]] = None
+    ausencias: Optional[Dict[str, List[Tuple[datetime, datetime]]]] = None
+
+
+@dataclass
+class PronosticoCapacidadResponse:
+    """
+    Matrices de horas de recursos por período del pronóstico.
+    
+    Attributes:
+        inicios_periodo: Primer día de cada período (n_periodos,)
+        recursos: ID de cada recurso, en el orden de las filas
+        horas_disponibles: Horas laborables de cada recurso en cada período (n_recursos, n_periodos)
+        horas_comprometidas: Horas ya comprometidas por asignaciones y carga actual (n_recursos, n_periodos)
+        horas_libres: Horas disponibles sin comprometer (n_recursos, n_periodos)
+        carga_fuera_de_horizonte: Carga actual de cada recurso que no cabe en el horizonte (n_recursos,)
+    """
+    inicios_periodo: np.ndarray
+    recursos: List[str]
+    horas_disponibles: np.ndarray
+    horas_comprometidas: np.ndarray
+    horas_libres: np.ndarray
+    carga_fuera_de_horizonte: np.ndarray
+    
+    def horas_libres_por_periodo(self) -> np.ndarray:
+        """Horas libres de todos los recursos en cada período (n_periodos,)."""
+        return self.horas_libres.sum(axis=0)
+
+
+@dataclass
+class SimulacionCapacidadRequest(CapacidadSemanalRequest):
+    """
+    Datos de entrada para la simulación de capacidad semanal.
+    
+    Attributes:
+        historial: Procesos completados de los que aprender los desvíos
+            (por defecto, los completados del repositorio)
+        num_ensayos: Cantidad de ensayos de Monte Carlo
+        semilla: Semilla para reproducibilidad
+    """
+    historial: Optional[List[Proceso]] = None
+    num_ensayos: int = 10000
+    semilla: Optional[int] = None
+
+
+@dataclass
+class SimulacionCapacidadResponse:
+    """
+    Resultado de la simulación de capacidad semanal.
+    
+    Attributes:
+        procesos_planificados: Procesos que caben en el plan según sus estimaciones
+        procesos_p50: Procesos completados en al menos la mitad de los ensayos
+        procesos_p90: Procesos completados en al menos el 90% de los ensayos
+        probabilidad_horas_extra: Fracción de ensayos que necesitan horas extra
+        horas_extra_p50: Mediana de las horas extra necesarias
+        horas_extra_p90: Horas extra que no se superan en el 90% de los ensayos
+        factores_por_tipo: Razón mediana tiempo real / estimado de cada tipo con historia
+        num_ensayos: Cantidad de ensayos realizados
+        recomendaciones: Lista de recomendaciones según el riesgo
+    """
+    procesos_planificados: int
+    procesos_p50: int
+    procesos_p90: int
+    probabilidad_horas_extra: float
+    horas_extra_p50: float
+    horas_extra_p90: float
+    factores_por_tipo: Dict[str, float]
+    num_ensayos: int
+    recomendaciones: List[str]
 
 
 class CalcularCapacidadSemanal:
@@ -108,14 +214,18 @@ class CalcularCapacidadSemanal:
             # Obtener procesos disponibles
             procesos = self._obtener_procesos_disponibles(request)
             
-            # Calcular tiempo total disponible
-            tiempo_disponible = self._calcular_tiempo_disponible(request)
+            # Calcular tiempo disponible de cada recurso y el total
+            horas_por_recurso = self._calcular_horas_por_recurso(request)
+            tiempo_disponible = float(horas_por_recurso.sum())
+            self._logger.debug(f"Tiempo total disponible: {tiempo_disponible} horas")
+            
+            # Empaquetar las duraciones reales en las horas de cada recurso
+            empaquetado = empaquetar_procesos(procesos, request.recursos_disponibles, horas_por_recurso)
             
             # Calcular capacidad por recurso
             capacidad_por_recurso = self._calcular_capacidad_por_recurso(
                 request.recursos_disponibles, 
-                procesos, 
-                tiempo_disponible
+                empaquetado
             )
             
             # Calcular total de procesos posibles
@@ -125,7 +235,7 @@ class CalcularCapacidadSemanal:
             )
             
             # Calcular tiempo requerido
-            tiempo_requerido = self._calcular_tiempo_requerido(procesos, total_procesos)
+            tiempo_requerido = self._calcular_tiempo_requerido(empaquetado)
             
             # Calcular eficiencia proyectada
             eficiencia = self._calcular_eficiencia_proyectada(
@@ -137,7 +247,8 @@ class CalcularCapacidadSemanal:
             recomendaciones = self._generar_recomendaciones(
                 request, 
                 capacidad_por_recurso, 
-                eficiencia
+                eficiencia,
+                empaquetado
             )
             
             # Crear respuesta
@@ -147,16 +258,141 @@ class CalcularCapacidadSemanal:
                 tiempo_total_disponible=tiempo_disponible,
                 tiempo_total_requerido=tiempo_requerido,
                 eficiencia_proyectada=eficiencia,
-                recomendaciones=recomendaciones
+                recomendaciones=recomendaciones,
+                cota_superior_procesos=empaquetado.cota_superior
             )
             
-            self._logger.info(f"Cálculo completado: {total_procesos} procesos posibles")
+            self._logger.info(f"Cálculo completado: {total_procesos} procesos posibles "
+                              f"(cota superior {empaquetado.cota_superior})")
             return response
             
         except Exception as e:
             self._logger.error(f"Error en cálculo de capacidad: {str(e)}")
             raise RuntimeError(f"Error calculando capacidad semanal: {str(e)}")
     
+    def pronosticar(self, request: PronosticoCapacidadRequest) -> PronosticoCapacidadResponse:
+        """
+        Pronostica las horas libres de cada recurso en períodos consecutivos.
+        
+        Las horas disponibles salen de los días laborables de cada recurso
+        en cada período. A ellas se descuentan las horas de las asignaciones
+        existentes, repartidas según las horas laborables que ocupan en cada
+        período, y luego Recurso.capacidad_actual, que no tiene fecha y
+        ocupa las primeras horas libres del horizonte.
+        
+        Args:
+            request: Datos de entrada del pronóstico
+            
+        Returns:
+            PronosticoCapacidadResponse: Matrices de recursos por períodos
+            
+        Raises:
+            RuntimeError: Si los datos son inválidos u ocurre un error durante el cálculo
+        """
+        try:
+            self._logger.info(f"Pronosticando capacidad de {len(request.recursos_disponibles)} recursos "
+                              f"en {request.numero_periodos} períodos")
+            
+            if request.numero_periodos < 1 or request.dias_por_periodo < 1:
+                raise ValueError("El pronóstico debe tener al menos un período de al menos un día")
+            if not request.recursos_disponibles:
+                raise ValueError("Debe haber al menos un recurso disponible")
+            
+            recursos = request.recursos_disponibles
+            inicio = np.datetime64(request.fecha_inicio.date(), 'D')
+            limites = inicio + np.arange(request.numero_periodos + 1) * request.dias_por_periodo
+            
+            # Horas laborables de cada recurso en cada período, sin feriados ni ausencias
+            calendario = CalendarioLaboral(recursos, datetime.combine(request.fecha_inicio.date(), time()),
+                                           request.feriados, request.ausencias)
+            horas_limites = calendario.horas_hasta(np.arange(len(recursos))[:, None], limites[None, :])
+            disponibles = np.diff(horas_limites, axis=1)
+            
+            # Descontar asignaciones existentes y luego la carga actual sin fecha
+            asignadas = self._repartir_asignaciones(request.asignaciones, recursos, calendario, limites)
+            carga = np.array([r.capacidad_actual for r in recursos], dtype=float)
+            ocupadas = self._ubicar_carga_actual(np.maximum(disponibles - asignadas, 0.0), carga)
+            comprometidas = asignadas + ocupadas
+            
+            response = PronosticoCapacidadResponse(
+                inicios_periodo=limites[:-1],
+                recursos=[r.id for r in recursos],
+                horas_disponibles=disponibles,
+                horas_comprometidas=comprometidas,
+                horas_libres=np.maximum(disponibles - comprometidas, 0.0),
+                carga_fuera_de_horizonte=carga - ocupadas.sum(axis=1)
+            )
+            
+            self._logger.info(f"Pronóstico completado: {response.horas_libres.sum():.1f} horas libres")
+            return response
+            
+        except Exception as e:
+            self._logger.error(f"Error en pronóstico de capacidad: {str(e)}")
+            raise RuntimeError(f"Error pronosticando capacidad: {str(e)}")
+    
+    def simular(self, request: SimulacionCapacidadRequest) -> SimulacionCapacidadResponse:
+        """
+        Simula el plan semanal con los desvíos de duración de la historia.
+        
+        El plan es el mismo empaquetado que usa execute(); cada ensayo
+        remuestrea la razón tiempo real / estimado de cada proceso según
+        su tipo y cuenta cuántos se completan en las horas disponibles.
+        
+        Args:
+            request: Datos de entrada de la simulación
+            
+        Returns:
+            SimulacionCapacidadResponse: Percentiles de procesos completados y riesgo de horas extra
+            
+        Raises:
+            RuntimeError: Si los datos son inválidos u ocurre un error durante la simulación
+        """
+        try:
+            self._logger.info(f"Simulando capacidad semanal con {request.num_ensayos} ensayos")
+            
+            self._validar_entrada(request)
+            if request.num_ensayos < 1:
+                raise ValueError("La simulación debe tener al menos un ensayo")
+            
+            procesos = self._obtener_procesos_disponibles(request)
+            historial = request.historial if request.historial is not None else self._obtener_historial()
+            
+            # Plan según las estimaciones y desvíos aprendidos de la historia
+            horas_por_recurso = self._calcular_horas_por_recurso(request)
+            empaquetado = empaquetar_procesos(procesos, request.recursos_disponibles, horas_por_recurso)
+            desvios = aprender_desvios(historial)
+            
+            completados, horas_extra = simular_plan(
+                procesos,
+                empaquetado.recurso_de_proceso,
+                horas_por_recurso,
+                desvios,
+                request.num_ensayos,
+                np.random.default_rng(request.semilla)
+            )
+            
+            factores = {tipo.value: factor for tipo, factor in desvios.factores().items()}
+            response = SimulacionCapacidadResponse(
+                procesos_planificados=empaquetado.total_procesos,
+                procesos_p50=int(np.quantile(completados, 0.5, method='lower')),
+                procesos_p90=int(np.quantile(completados, 0.1, method='lower')),
+                probabilidad_horas_extra=float(np.mean(horas_extra > 1e-9)),
+                horas_extra_p50=float(np.quantile(horas_extra, 0.5)),
+                horas_extra_p90=float(np.quantile(horas_extra, 0.9)),
+                factores_por_tipo=factores,
+                num_ensayos=request.num_ensayos,
+                recomendaciones=[]
+            )
+            response.recomendaciones = self._generar_recomendaciones_simulacion(response)
+            
+            self._logger.info(f"Simulación completada: P50 {response.procesos_p50}, P90 {response.procesos_p90} "
+                              f"de {response.procesos_planificados} procesos planificados")
+            return response
+            
+        except Exception as e:
+            self._logger.error(f"Error en simulación de capacidad: {str(e)}")
+            raise RuntimeError(f"Error simulando capacidad semanal: {str(e)}")
+    
     def _validar_entrada(self, request: CapacidadSemanalRequest) -> None:
         """
         Valida los datos de entrada del caso de uso.
@@ -174,7 +410,7 @@ class CalcularCapacidadSemanal:
             raise ValueError("Debe haber al menos un recurso disponible")
         
         # Validar que las fechas no sean en el pasado
-        if request.fecha_inicio < datetime.now().date():
+        if request.fecha_inicio.date() < date.today():
             raise ValueError("Las fechas de planificación no pueden ser en el pasado")
     
     def _obtener_procesos_disponibles(self, request: CapacidadSemanalRequest) -> List[Proceso]:
@@ -195,86 +431,121 @@ class CalcularCapacidadSemanal:
             self._logger.error(f"Error obteniendo procesos: {str(e)}")
             raise
     
-    def _calcular_tiempo_disponible(self, request: CapacidadSemanalRequest) -> float:
+    def _obtener_historial(self) -> List[Proceso]:
         """
-        Calcula el tiempo total disponible en horas para el período.
+        Obtiene los procesos completados de los que aprender los desvíos.
+        
+        Returns:
+            List[Proceso]: Lista de procesos completados
+        """
+        try:
+            historial = self._proceso_repository.obtener_por_estado(EstadoProceso.COMPLETADO)
+            self._logger.debug(f"Obtenidos {len(historial)} procesos completados")
+            return historial
+        except Exception as e:
+            self._logger.error(f"Error obteniendo historial: {str(e)}")
+            raise
+    
+    def _calcular_horas_por_recurso(self, request: CapacidadSemanalRequest) -> np.ndarray:
+        """
+        Calcula las horas disponibles de cada recurso en el período.
+        
+        Se cuentan días completos: el que empieza en fecha_inicio y cada día
+        siguiente mientras no se alcance fecha_fin, con las horas laborables
+        del horario de cada recurso menos feriados y ausencias.
         
         Args:
-            request: Datos de entrada con recursos y fechas
+            request: Datos de entrada con recursos, fechas, feriados y ausencias
             
         Returns:
-            float: Tiempo total disponible en horas
+            np.ndarray: Horas disponibles de cada recurso (n_recursos,)
         """
-        dias_laborables = self._calcular_dias_laborables(
-            request.fecha_inicio, 
-            request.fecha_fin
-        )
+        inicio = datetime.combine(request.fecha_inicio.date(), time())
+        dias = max(0, math.ceil((request.fecha_fin - request.fecha_inicio) / timedelta(days=1)))
+        calendario = CalendarioLaboral(request.recursos_disponibles, inicio, request.feriados, request.ausencias)
         
-        tiempo_total = 0.0
-        for recurso in request.recursos_disponibles:
-            # Asumimos 8 horas laborables por día por recurso
-            tiempo_recurso = dias_laborables * recurso.horas_disponibles_dia
-            tiempo_total += tiempo_recurso
-        
-        self._logger.debug(f"Tiempo total disponible: {tiempo_total} horas")
-        return tiempo_total
+        return calendario.horas_hasta(np.arange(len(request.recursos_disponibles)),
+                                      np.datetime64(inicio + timedelta(days=dias), 'us'))
     
-    def _calcular_dias_laborables(self, fecha_inicio: datetime, fecha_fin: datetime) -> int:
+    def _repartir_asignaciones(self,
+                               asignaciones: List[AsignacionRecurso],
+                               recursos: List[Recurso],
+                               calendario: CalendarioLaboral,
+                               limites: np.ndarray) -> np.ndarray:
         """
-        Calcula el número de días laborables entre dos fechas.
+        Reparte las horas de las asignaciones entre los períodos.
+        
+        Cada asignación aporta a un período la fracción de sus horas
+        laborables entre fecha_inicio y fecha_fin que cae en él; las que no
+        ocupan horas laborables cuentan entera en el período donde empiezan.
+        Las asignaciones de recursos que no están en la lista se ignoran.
         
         Args:
-            fecha_inicio: Fecha de inicio
-            fecha_fin: Fecha de fin
+            asignaciones: Asignaciones existentes
+            recursos: Lista de recursos
+            calendario: Calendario de los recursos desde el primer período
+            limites: Fechas que delimitan los períodos (n_periodos + 1,)
             
         Returns:
-            int: Número de días laborables
+            np.ndarray: Horas asignadas de cada recurso en cada período (n_recursos, n_periodos)
         """
-        dias_laborables = 0
-        fecha_actual = fecha_inicio
+        asignadas = np.zeros((len(recursos), limites.shape[0] - 1), dtype=float)
+        posiciones = {r.id: j for j, r in enumerate(recursos)}
+        validas = [a for a in asignaciones if a.recurso_id in posiciones]
+        if not validas:
+            return asignadas
         
-        while fecha_actual < fecha_fin:
-            # Lunes=0, Domingo=6
-            if fecha_actual.weekday() < 5:  # Lunes a Viernes
-                dias_laborables += 1
-            fecha_actual += timedelta(days=1)
+        indices = np.array([posiciones[a.recurso_id] for a in validas], dtype=int)
+        horas = np.array([a.horas_asignadas for a in validas], dtype=float)
+        inicios = np.array([a.fecha_inicio for a in validas], dtype='datetime64[us]')
+        fines = np.array([a.fecha_fin for a in validas], dtype='datetime64[us]')
+        limites = limites.astype('datetime64[us]')
+        
+        # Horas de trabajo hasta el inicio, el fin y cada límite, por recurso
+        horas_inicio = calendario.horas_hasta(indices, inicios)
+        duracion = calendario.horas_hasta(indices, fines) - horas_inicio
+        usados, posicion = np.unique(indices, return_inverse=True)
+        horas_limites = calendario.horas_hasta(usados[:, None], limites[None, :])[posicion.ravel()]
+        
+        con_duracion = duracion > 0
+        fraccion = np.where(
+            con_duracion[:, None],
+            np.clip((horas_limites - horas_inicio[:, None]) / np.where(con_duracion, duracion, 1.0)[:, None], 0.0, 1.0),
+            limites[None, :] > inicios[:, None]
+        )
+        np.add.at(asignadas, indices, horas[:, None] * np.diff(fraccion, axis=1))
         
-        return dias_laborables
+        return asignadas
+    
+    def _ubicar_carga_actual(self, libres: np.ndarray, carga: np.ndarray) -> np.ndarray:
+        """
+        Ubica la carga actual de cada recurso en sus primeras horas libres.
+        
+        Args:
+            libres: Horas libres de cada recurso en cada período (n_recursos, n_periodos)
+            carga: Horas de carga actual de cada recurso (n_recursos,)
+            
+        Returns:
+            np.ndarray: Horas ocupadas por la carga en cada período (n_recursos, n_periodos)
+        """
+        ocupadas_acumuladas = np.minimum(np.cumsum(libres, axis=1), carga[:, None])
+        return np.diff(ocupadas_acumuladas, axis=1, prepend=0.0)
     
     def _calcular_capacidad_por_recurso(self, 
                                        recursos: List[Recurso], 
-                                       procesos: List[Proceso], 
-                                       tiempo_disponible: float) -> Dict[str, int]:
+                                       empaquetado: EmpaquetadoProcesos) -> Dict[str, int]:
         """
         Calcula la capacidad individual de cada recurso.
         
         Args:
             recursos: Lista de recursos disponibles
-            procesos: Lista de procesos a ejecutar
-            tiempo_disponible: Tiempo total disponible
+            empaquetado: Procesos empaquetados en las horas de cada recurso
             
         Returns:
-            Dict[str, int]: Capacidad de cada recurso
+            Dict[str, int]: Procesos que caben en cada recurso
         """
-        capacidad_por_recurso = {}
-        
-        for recurso in recursos:
-            # Calcular tiempo disponible del recurso
-            tiempo_recurso = recurso.horas_disponibles_dia * self._calcular_dias_laborables(
-                datetime.now(), 
-                datetime.now() + timedelta(days=7)
-            )
-            
-            # Calcular cuántos procesos puede manejar
-            if procesos:
-                tiempo_promedio_proceso = sum(p.tiempo_estimado_horas for p in procesos) / len(procesos)
-                capacidad = int(tiempo_recurso / tiempo_promedio_proceso)
-            else:
-                capacidad = 0
-            
-            capacidad_por_recurso[recurso.nombre] = capacidad
-        
-        return capacidad_por_recurso
+        return {recurso.nombre: int(cantidad)
+                for recurso, cantidad in zip(recursos, empaquetado.procesos_por_recurso)}
     
     def _calcular_total_procesos_posibles(self, 
                                          capacidad_por_recurso: Dict[str, int], 
@@ -292,7 +563,7 @@ class CalcularCapacidadSemanal:
         if not capacidad_por_recurso:
             return 0
         
-        # El total está limitado por el recurso con menor capacidad
+        # Cada proceso empaquetado ocupa un solo recurso: el total es la suma por recurso
         total_procesos = sum(capacidad_por_recurso.values())
         
         # Aplicar restricciones adicionales si existen
@@ -302,22 +573,17 @@ class CalcularCapacidadSemanal:
         
         return total_procesos
     
-    def _calcular_tiempo_requerido(self, procesos: List[Proceso], total_procesos: int) -> float:
+    def _calcular_tiempo_requerido(self, empaquetado: EmpaquetadoProcesos) -> float:
         """
-        Calcula el tiempo total requerido para ejecutar los procesos.
+        Calcula el tiempo total requerido para ejecutar los procesos posibles.
         
         Args:
-            procesos: Lista de procesos
-            total_procesos: Número total de procesos a ejecutar
+            empaquetado: Procesos empaquetados en las horas de cada recurso
             
         Returns:
             float: Tiempo total requerido en horas
         """
-        if not procesos or total_procesos == 0:
-            return 0.0
-        
-        tiempo_promedio = sum(p.tiempo_estimado_horas for p in procesos) / len(procesos)
-        return tiempo_promedio * total_procesos
+        return float(empaquetado.horas_por_recurso.sum())
     
     def _calcular_eficiencia_proyectada(self, 
                                        tiempo_disponible: float, 
@@ -341,7 +607,8 @@ class CalcularCapacidadSemanal:
     def _generar_recomendaciones(self, 
                                 request: CapacidadSemanalRequest,
                                 capacidad_por_recurso: Dict[str, int],
-                                eficiencia: float) -> List[str]:
+                                eficiencia: float,
+                                empaquetado: EmpaquetadoProcesos) -> List[str]:
         """
         Genera recomendaciones para optimizar la capacidad.
         
@@ -349,6 +616,7 @@ class CalcularCapacidadSemanal:
             request: Datos de entrada originales
             capacidad_por_recurso: Capacidad por recurso
             eficiencia: Eficiencia proyectada
+            empaquetado: Procesos empaquetados en las horas de cada recurso
             
         Returns:
             List[str]: Lista de recomendaciones
@@ -367,8 +635,40 @@ class CalcularCapacidadSemanal:
             if max(capacidades) - min(capacidades) > 5:
                 recomendaciones.append("Considere rebalancear la carga entre recursos para mejor eficiencia")
         
+        # Recomendaciones basadas en habilidades
+        if empaquetado.sin_recurso_compatible > 0:
+            recomendaciones.append(f"{empaquetado.sin_recurso_compatible} procesos requieren habilidades "
+                                   "que ningún recurso disponible ofrece")
+        
         # Recomendaciones generales
         if len(request.recursos_disponibles) < 3:
             recomendaciones.append("Considere diversificar los recursos para reducir riesgos")
         
         return recomendaciones
+    
+    def _generar_recomendaciones_simulacion(self, simulacion: SimulacionCapacidadResponse) -> List[str]:
+        """
+        Genera recomendaciones según el riesgo simulado.
+        
+        Args:
+            simulacion: Resultado de la simulación
+            
+        Returns:
+            List[str]: Lista de recomendaciones
+        """
+        recomendaciones = []
+        
+        if simulacion.probabilidad_horas_extra >= 0.5:
+            recomendaciones.append(f"El plan requiere horas extra en el {simulacion.probabilidad_horas_extra:.0%} "
+                                   "de los escenarios. Considere reducir la carga o agregar recursos")
+        
+        if simulacion.procesos_p90 < simulacion.procesos_planificados:
+            recomendaciones.append(f"En el 10% de los escenarios menos favorables se completan solo "
+                                   f"{simulacion.procesos_p90} de {simulacion.procesos_planificados} procesos planificados")
+        
+        for tipo, factor in simulacion.factores_por_tipo.items():
+            if factor > 1.2:
+                recomendaciones.append(f"Los procesos de tipo {tipo} suelen tardar un {factor - 1:.0%} más "
+                                       "de lo estimado. Considere ajustar sus estimaciones")
+        
+        return recomendaciones
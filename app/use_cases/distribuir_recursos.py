@@ -14,15 +14,28 @@ Autor: Equipo de Desarrollo
 Fecha: 2025-07-07
 """
 
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass, field, replace
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
 import logging
+import os
 from enum import Enum
+import heapq
+import numpy as np
 
 from domain.models.proceso import Proceso, EstadoProceso, NivelPrioridad
 from domain.models.recurso import Recurso, EstadoRecurso, TipoRecurso
 from domain.repositories.proceso_repository import ProcesoRepository
+from app.services.calendario import CalendarioLaboral
+from app.services.dependencias import (
+    GrafoDependencias, calcular_ruta_critica, compilar_dependencias, ordenar_topologicamente, sucesores_transitivos
+)
+from app.services.problema_compilado import (
+    IndiceHabilidades, ProblemaCompilado, ProcesosCompilados, 
+    compilar_problema, compilar_procesos, indexar_habilidades
+)
 
 
 # Configuración de logging
@@ -38,13 +51,17 @@ class EstrategiaDistribucion(Enum):
         EFICIENCIA: Distribución para maximizar eficiencia
         COSTO_MINIMO: Distribución para minimizar costos
         TIEMPO_MINIMO: Distribución para minimizar tiempo total
-        BALANCEADA: Distribución balanceada entre múltiples criterios
+        BALANCEADA: Distribución que equilibra los días de trabajo entre recursos
+        FECHA_LIMITE: Primero la fecha límite más próxima (EDF)
+        MENOR_HOLGURA: Primero el proceso con menos holgura hasta su fecha límite
     """
     PRIORIDAD = "prioridad"
     EFICIENCIA = "eficiencia"
     COSTO_MINIMO = "costo_minimo"
     TIEMPO_MINIMO = "tiempo_minimo"
     BALANCEADA = "balanceada"
+    FECHA_LIMITE = "fecha_limite"
+    MENOR_HOLGURA = "menor_holgura"
 
 
 @dataclass
@@ -90,6 +107,7 @@ class AsignacionRecurso:
         fecha_fin: Fecha de fin de la asignación
         prioridad: Prioridad de la asignación
         costo_estimado: Costo estimado de la asignación
+        retraso_horas: Horas que fecha_fin supera la fecha límite del proceso
     """
     proceso_id: str
     recurso_id: str
@@ -98,6 +116,7 @@ class AsignacionRecurso:
     fecha_fin: datetime
     prioridad: int
     costo_estimado: float
+    retraso_horas: float = 0.0
 
 
 @dataclass
@@ -113,6 +132,10 @@ class DistribucionRecursosRequest:
         fecha_inicio: Fecha de inicio de la planificación
         optimizar_costos: Si se debe optimizar por costos
         optimizar_tiempo: Si se debe optimizar por tiempo
+        asignar_equipos: Si cada proceso recibe un equipo de recursos que
+            cubra todos sus requisitos en lugar de un solo recurso
+        feriados: Días no laborables para todos los recursos
+        ausencias: Intervalos (inicio, fin) en que cada recurso no trabaja, por ID de recurso
     """
     procesos: List[Proceso]
     recursos: List[Recurso]
@@ -121,6 +144,9 @@ class DistribucionRecursosRequest:
     fecha_inicio: Optional[datetime] = None
     optimizar_costos: bool = True
     optimizar_tiempo: bool = True
+    asignar_equipos: bool = False
+    feriados: Optional[List[date]] = None
+    ausencias: Optional[Dict[str, List[Tuple[datetime, datetime]]]] = None
     
     def __post_init__(self):
         """Inicializa valores por defecto."""
@@ -145,6 +171,9 @@ class DistribucionRecursosResponse:
         tiempo_total: Tiempo total estimado
         recomendaciones: Lista de recomendaciones
         metricas: Métricas adicionales del plan
+        ruta_critica: IDs de los procesos de la ruta crítica, en orden
+            (vacía si los procesos no tienen dependencias entre sí)
+        procesos_con_retraso: Procesos asignados que terminarían después de su fecha límite
     """
     asignaciones: List[AsignacionRecurso]
     procesos_asignados: int
@@ -155,6 +184,295 @@ class DistribucionRecursosResponse:
     tiempo_total: float
     recomendaciones: List[str]
     metricas: Dict[str, float]
+    ruta_critica: List[str] = field(default_factory=list)
+    procesos_con_retraso: List[Proceso] = field(default_factory=list)
+
+
+class MetricasDistribucion:
+    """
+    Acumulador de las métricas de una distribución.
+    
+    Se actualiza en una sola pasada a medida que se eligen recursos, por lo
+    que puede consultarse a mitad de la distribución. El costo, las horas
+    y los recursos usados se conocen al elegir cada recurso; el intervalo
+    de fechas se completa cuando se calendarizan las asignaciones.
+    
+    Attributes:
+        costo_total: Costo acumulado de las asignaciones
+        horas_trabajo_total: Horas acumuladas de las asignaciones
+        num_asignaciones: Asignaciones registradas
+        horas_por_recurso: Horas asignadas a cada recurso (n_recursos,)
+        recursos_usados: Si el recurso tiene alguna asignación (n_recursos,)
+        recursos_utilizados: Recursos con alguna asignación
+        fecha_inicio: Inicio más temprano de las asignaciones fechadas
+        fecha_fin: Fin más tardío de las asignaciones fechadas
+    """
+    
+    def __init__(self, recursos: List[Recurso], recursos_totales: int):
+        """
+        Inicializa el acumulador vacío.
+        
+        Args:
+            recursos: Recursos entre los que se distribuye, en el orden de sus índices
+            recursos_totales: Recursos de la solicitud, disponibles o no
+        """
+        self._posiciones = {r.id: j for j, r in enumerate(recursos)}
+        self._horas_dia = np.array([r.horas_disponibles_dia for r in recursos], dtype=float)
+        self._recursos_totales = recursos_totales
+        self.costo_total = 0.0
+        self.horas_trabajo_total = 0.0
+        self.num_asignaciones = 0
+        self.horas_por_recurso = np.zeros(len(recursos))
+        self.recursos_usados = np.zeros(len(recursos), dtype=bool)
+        self.recursos_utilizados = 0
+        self.fecha_inicio: Optional[datetime] = None
+        self.fecha_fin: Optional[datetime] = None
+    
+    def registrar(self, j: int, horas: float, costo: float) -> None:
+        """Suma una asignación al recurso de índice j."""
+        self.costo_total += costo
+        self.horas_trabajo_total += horas
+        self.num_asignaciones += 1
+        self.horas_por_recurso[j] += horas
+        if not self.recursos_usados[j]:
+            self.recursos_usados[j] = True
+            self.recursos_utilizados += 1
+    
+    def registrar_fechas(self, fecha_inicio: datetime, fecha_fin: datetime) -> None:
+        """Amplía el intervalo de la distribución con el de un grupo de asignaciones."""
+        self.fecha_inicio = fecha_inicio if self.fecha_inicio is None else min(self.fecha_inicio, fecha_inicio)
+        self.fecha_fin = fecha_fin if self.fecha_fin is None else max(self.fecha_fin, fecha_fin)
+    
+    def registrar_asignacion(self, asignacion: AsignacionRecurso) -> None:
+        """Registra una asignación ya fechada, como las conservadas al redistribuir."""
+        self.registrar(self._posiciones[asignacion.recurso_id], asignacion.horas_asignadas, asignacion.costo_estimado)
+        self.registrar_fechas(asignacion.fecha_inicio, asignacion.fecha_fin)
+    
+    def como_diccionario(self) -> Dict[str, float]:
+        """
+        Calcula las métricas de la distribución a partir de lo acumulado.
+        
+        La carga de cada recurso se mide en días de trabajo (horas asignadas
+        / horas disponibles por día); el makespan es la mayor de ellas y la
+        varianza indica cuán equilibrado quedó el plan.
+        
+        Returns:
+            Dict[str, float]: Métricas calculadas
+        """
+        if not self.num_asignaciones:
+            return {
+                "eficiencia": 0.0,
+                "costo_total": 0.0,
+                "tiempo_total": 0.0,
+                "utilizacion_recursos": 0.0,
+                "makespan_dias": 0.0,
+                "varianza_carga_dias": 0.0
+            }
+        
+        tiempo_total_horas = 0.0
+        if self.fecha_inicio is not None:
+            tiempo_total_horas = (self.fecha_fin - self.fecha_inicio).total_seconds() / 3600
+        
+        eficiencia = (self.horas_trabajo_total / tiempo_total_horas) * 100 if tiempo_total_horas > 0 else 0
+        utilizacion_recursos = (self.recursos_utilizados / self._recursos_totales) * 100 if self._recursos_totales > 0 else 0
+        cargas = self.horas_por_recurso / self._horas_dia
+        
+        return {
+            "eficiencia": min(eficiencia, 100.0),
+            "costo_total": self.costo_total,
+            "tiempo_total": tiempo_total_horas,
+            "utilizacion_recursos": utilizacion_recursos,
+            "horas_trabajo_total": self.horas_trabajo_total,
+            "recursos_utilizados": self.recursos_utilizados,
+            "costo_promedio_hora": self.costo_total / self.horas_trabajo_total if self.horas_trabajo_total > 0 else 0,
+            "makespan_dias": float(cargas.max()) if cargas.size else 0.0,
+            "varianza_carga_dias": float(cargas.var()) if cargas.size else 0.0
+        }
+
+
+@dataclass
+class DistribucionLoteResponse:
+    """
+    Resultado de distribuir varios escenarios.
+    
+    Attributes:
+        respuestas: Resultado de cada escenario, en el orden de las solicitudes
+        comparativa: Una fila por escenario con costo, makespan, procesos sin
+            asignar y utilización de recursos
+    """
+    respuestas: List[DistribucionRecursosResponse]
+    comparativa: List[Dict[str, float]]
+
+
+@dataclass
+class CambiosDistribucion:
+    """
+    Cambios en procesos y recursos desde una distribución previa.
+    
+    Los elementos modificados se identifican por su ID y reemplazan a la
+    versión anterior (por ejemplo, un recurso que pasó a MANTENIMIENTO).
+    
+    Attributes:
+        procesos_agregados: Procesos nuevos a distribuir
+        procesos_eliminados: IDs de los procesos que ya no se ejecutan
+        procesos_modificados: Nueva versión de procesos existentes
+        recursos_agregados: Recursos nuevos
+        recursos_eliminados: IDs de los recursos retirados
+        recursos_modificados: Nueva versión de recursos existentes
+    """
+    procesos_agregados: List[Proceso] = field(default_factory=list)
+    procesos_eliminados: List[str] = field(default_factory=list)
+    procesos_modificados: List[Proceso] = field(default_factory=list)
+    recursos_agregados: List[Recurso] = field(default_factory=list)
+    recursos_eliminados: List[str] = field(default_factory=list)
+    recursos_modificados: List[Recurso] = field(default_factory=list)
+
+
+class _ColaRecursos:
+    """
+    Árbol de segmentos de recursos ordenados por puntuación con invalidación perezosa.
+    
+    Los procesos de una cola comparten puntuaciones pero no duración. Cada
+    hoja guarda la holgura de un recurso, las horas más largas que aún
+    puede recibir, y cada nodo el máximo de sus hojas, así que el mejor
+    recurso con holgura para un proceso se encuentra en O(log n_recursos)
+    bajando hacia la hoja más a la izquierda que la alcanza. La holgura
+    solo disminuye: al llegar a la hoja se compara con la actual y, si
+    quedó desactualizada, se corrige y se repite la búsqueda. La holgura,
+    con una tolerancia de redondeo, solo guía la búsqueda; la hoja
+    encontrada se confirma con el criterio exacto de admisión y, si no lo
+    cumple, se sigue por la siguiente.
+    """
+    
+    _TOLERANCIA = 1e-9
+    
+    def __init__(self, puntuaciones: np.ndarray, miembros: np.ndarray, holguras: np.ndarray):
+        indices = np.flatnonzero(miembros)
+        # A igual puntuación sale el recurso de menor índice
+        orden = np.lexsort((indices, -puntuaciones[indices]))
+        self._recursos = indices[orden].tolist()
+        self._tamaño = 1
+        while self._tamaño < len(self._recursos):
+            self._tamaño *= 2
+        self._nodos = [float('-inf')] * (2 * self._tamaño)
+        self._nodos[self._tamaño:self._tamaño + len(self._recursos)] = holguras[indices[orden]].tolist()
+        for k in range(self._tamaño - 1, 0, -1):
+            self._nodos[k] = max(self._nodos[2 * k], self._nodos[2 * k + 1])
+    
+    def extraer_mejor(self, 
+                      duracion: float, 
+                      holgura: Callable[[int], float], 
+                      admite: Callable[[int], bool]) -> Optional[int]:
+        """
+        Devuelve el recurso de mayor puntuación que admite el proceso, sin quitarlo de la cola.
+        
+        Args:
+            duracion: Horas del proceso
+            holgura: Holgura actual de un recurso
+            admite: Si el recurso puede recibir el proceso
+            
+        Returns:
+            Optional[int]: Índice del recurso o None si ninguno lo admite
+        """
+        nodos = self._nodos
+        umbral = duracion - self._TOLERANCIA
+        desde = 0
+        while True:
+            k = self._primera_hoja(desde, umbral)
+            if k < 0:
+                return None
+            j = self._recursos[k - self._tamaño]
+            actual = float(holgura(j))
+            if actual != nodos[k]:
+                self._actualizar(k, actual)
+            elif admite(j):
+                return j
+            else:
+                desde = k - self._tamaño + 1
+    
+    def _primera_hoja(self, desde: int, duracion: float) -> int:
+        """Nodo de la primera hoja desde la posición dada con holgura para la duración (-1 si no hay)."""
+        nodos = self._nodos
+        if desde >= self._tamaño:
+            return -1
+        k = desde + self._tamaño
+        # Subir hasta un subárbol que empiece a la derecha y alcance la duración
+        while nodos[k] < duracion:
+            while k & 1:
+                k >>= 1
+            if k == 0:
+                return -1
+            k += 1
+        while k < self._tamaño:
+            k = 2 * k if nodos[2 * k] >= duracion else 2 * k + 1
+        return k
+    
+    def _actualizar(self, k: int, valor: float) -> None:
+        """Cambia una hoja y recalcula los máximos de sus ancestros."""
+        nodos = self._nodos
+        nodos[k] = valor
+        k >>= 1
+        while k:
+            nodos[k] = max(nodos[2 * k], nodos[2 * k + 1])
+            k >>= 1
+
+
+class _ColaCargas:
+    """
+    Montículos de recursos ordenados por horas ocupadas con invalidación perezosa.
+    
+    Todos los procesos de una cola admiten los mismos recursos, pero sus
+    duraciones difieren. La finalización de un recurso, (horas ocupadas +
+    duración) / horas por día, ordena distinto a los recursos según la
+    duración cuando sus jornadas difieren; por eso hay un montículo por
+    jornada, ordenado por horas ocupadas, que no depende de la duración, y
+    se elige la mejor de sus cimas. Al asignar un proceso las horas de un
+    recurso solo aumentan, así que su entrada en las demás colas queda por
+    debajo de su valor real: se reinserta con el valor actual cuando llega
+    a la cima.
+    """
+    
+    def __init__(self, horas_ocupadas: np.ndarray, horas_dia: np.ndarray, miembros: np.ndarray):
+        indices = np.flatnonzero(miembros)
+        self._jornadas: List[Tuple[float, List[Tuple[float, int]]]] = []
+        for jornada in np.unique(horas_dia[indices]):
+            grupo = indices[horas_dia[indices] == jornada]
+            # Una lista ordenada ya es un montículo; a igual carga sale el recurso de menor índice
+            orden = np.lexsort((grupo, horas_ocupadas[grupo]))
+            self._jornadas.append((float(jornada), list(zip(horas_ocupadas[grupo[orden]].tolist(), grupo[orden].tolist()))))
+    
+    def extraer_mejor(self, 
+                      horas_ocupadas: np.ndarray, 
+                      duracion: float, 
+                      max_horas: Optional[float] = None) -> Optional[int]:
+        """
+        Devuelve el recurso que termina antes el proceso, sin quitarlo de la cola.
+        
+        Args:
+            horas_ocupadas: Horas ocupadas actuales de cada recurso
+            duracion: Horas del proceso
+            max_horas: Máximo de horas por recurso (None = sin máximo)
+            
+        Returns:
+            Optional[int]: Índice del recurso o None si ninguno admite el proceso
+        """
+        mejor: Optional[Tuple[float, int]] = None
+        for jornada, monticulo in self._jornadas:
+            while monticulo:
+                horas, j = monticulo[0]
+                actual = float(horas_ocupadas[j])
+                if actual == horas:
+                    break
+                heapq.heapreplace(monticulo, (actual, j))
+            
+            # El de menos horas del grupo es el único que puede caber bajo el máximo
+            if not monticulo or (max_horas and horas + duracion > max_horas):
+                continue
+            candidato = ((horas + duracion) / jornada, j)
+            if mejor is None or candidato < mejor:
+                mejor = candidato
+        
+        return mejor[1] if mejor is not None else None
 
 
 class DistribuirRecursos:
@@ -165,6 +483,14 @@ class DistribuirRecursos:
     recursos a procesos de manera óptima según los criterios establecidos.
     """
     
+    _MIN_PROCESOS_POR_COLA = 4
+    # Estrategias que eligen el recurso que terminaría antes el proceso
+    _ESTRATEGIAS_POR_FINALIZACION = frozenset({
+        EstrategiaDistribucion.BALANCEADA, 
+        EstrategiaDistribucion.FECHA_LIMITE, 
+        EstrategiaDistribucion.MENOR_HOLGURA
+    })
+    
     def __init__(self, proceso_repository: ProcesoRepository):
         """
         Inicializa el caso de uso con las dependencias necesarias.
@@ -174,13 +500,20 @@ class DistribuirRecursos:
         """
         self._proceso_repository = proceso_repository
         self._logger = logging.getLogger(self.__class__.__name__)
+        self._callback: Optional[Callable[[MetricasDistribucion], None]] = None
     
-    def execute(self, request: DistribucionRecursosRequest) -> DistribucionRecursosResponse:
+    def execute(self, 
+                request: DistribucionRecursosRequest, 
+                callback: Optional[Callable[[MetricasDistribucion], None]] = None) -> DistribucionRecursosResponse:
         """
         Ejecuta la distribución de recursos.
         
+        Si se indica callback, se invoca con el acumulador de métricas tras
+        cada proceso asignado, para seguir la distribución en vivo.
+        
         Args:
             request: Datos de entrada para la distribución
+            callback: Función opcional que recibe las métricas en curso
             
         Returns:
             DistribucionRecursosResponse: Resultado de la distribución
@@ -191,59 +524,562 @@ class DistribuirRecursos:
         """
         try:
             self._logger.info(f"Iniciando distribución de recursos con estrategia {request.estrategia.value}")
+            self._callback = callback
+            
+            response = self._distribuir(request)
+            
+            self._logger.info(f"Distribución completada: {len(response.asignaciones)} asignaciones realizadas")
+            return response
             
-            # Validar entrada
-            self._validar_entrada(request)
+        except Exception as e:
+            self._logger.error(f"Error en distribución de recursos: {str(e)}")
+            raise RuntimeError(f"Error distribuyendo recursos: {str(e)}")
+    
+    def execute_batch(self, 
+                      requests: List[DistribucionRecursosRequest], 
+                      num_trabajadores: Optional[int] = None) -> DistribucionLoteResponse:
+        """
+        Distribuye varios escenarios en paralelo.
+        
+        Pensado para estudios de escenarios sobre la misma lista de
+        procesos (horas extra, una contratación, una máquina parada): la
+        parte del problema que depende solo de los procesos se compila una
+        vez por contenido distinto, aunque los escenarios traigan listas
+        distintas, y cada escenario compila únicamente sus recursos. Los
+        escenarios se reparten entre procesos trabajadores, que reciben las
+        listas de procesos y sus compilaciones una sola vez al arrancar; cada
+        tarea lleva solo el resto de su solicitud.
+        
+        Args:
+            requests: Solicitudes de cada escenario
+            num_trabajadores: Procesos en paralelo (por defecto, uno por CPU)
             
-            # Filtrar recursos disponibles
-            recursos_disponibles = self._filtrar_recursos_disponibles(request)
+        Returns:
+            DistribucionLoteResponse: Resultados y tabla comparativa
             
-            # Ordenar procesos según la estrategia
-            procesos_ordenados = self._ordenar_procesos(request)
+        Raises:
+            ValueError: Si no hay solicitudes o num_trabajadores no es positivo
+            RuntimeError: Si ocurre un error durante la distribución
+        """
+        if not requests:
+            raise ValueError("Debe proporcionar al menos un escenario")
+        
+        if num_trabajadores is not None and num_trabajadores <= 0:
+            raise ValueError("El número de trabajadores debe ser mayor a 0")
+        
+        try:
+            self._logger.info(f"Iniciando distribución de {len(requests)} escenarios")
+            self._callback = None
             
-            # Ejecutar distribución según la estrategia
-            asignaciones = self._ejecutar_distribucion(
-                procesos_ordenados,
-                recursos_disponibles,
-                request
-            )
+            listas, compilados, lista_de_escenario = self._agrupar_listas_procesos(requests)
             
-            # Calcular métricas
-            metricas = self._calcular_metricas(asignaciones, request)
+            num_trabajadores = min(len(requests), num_trabajadores or os.cpu_count() or 1)
+            if num_trabajadores == 1:
+                respuestas = [self._distribuir(request, compilados[k]) for request, k in zip(requests, lista_de_escenario)]
+            else:
+                with ProcessPoolExecutor(max_workers=num_trabajadores, 
+                                         initializer=_inicializar_trabajador_lote, 
+                                         initargs=(listas, compilados)) as ejecutor:
+                    futuros = [
+                        ejecutor.submit(_distribuir_escenario, replace(request, procesos=[]), k)
+                        for request, k in zip(requests, lista_de_escenario)
+                    ]
+                    respuestas = [futuro.result() for futuro in futuros]
             
-            # Identificar procesos sin asignar
-            procesos_sin_asignar = self._identificar_procesos_sin_asignar(
-                request.procesos,
-                asignaciones
-            )
+            comparativa = [
+                {
+                    "escenario": k,
+                    "costo_total": respuesta.costo_total,
+                    "makespan_dias": respuesta.metricas.get("makespan_dias", 0.0),
+                    "procesos_sin_asignar": len(respuesta.procesos_sin_asignar),
+                    "utilizacion_recursos": respuesta.metricas.get("utilizacion_recursos", 0.0)
+                }
+                for k, respuesta in enumerate(respuestas)
+            ]
             
-            # Generar recomendaciones
-            recomendaciones = self._generar_recomendaciones(
-                asignaciones,
-                procesos_sin_asignar,
-                recursos_disponibles,
-                request
-            )
+            self._logger.info(f"Distribución de {len(requests)} escenarios completada")
+            return DistribucionLoteResponse(respuestas=respuestas, comparativa=comparativa)
             
-            # Crear respuesta
-            response = DistribucionRecursosResponse(
-                asignaciones=asignaciones,
-                procesos_asignados=len(asignaciones),
-                procesos_sin_asignar=procesos_sin_asignar,
-                recursos_utilizados=len(set(a.recurso_id for a in asignaciones)),
-                eficiencia_estimada=metricas.get("eficiencia", 0.0),
-                costo_total=metricas.get("costo_total", 0.0),
-                tiempo_total=metricas.get("tiempo_total", 0.0),
-                recomendaciones=recomendaciones,
-                metricas=metricas
-            )
+        except Exception as e:
+            self._logger.error(f"Error en distribución por lotes: {str(e)}")
+            raise RuntimeError(f"Error distribuyendo escenarios: {str(e)}")
+    
+    def _agrupar_listas_procesos(self, 
+                                 requests: List[DistribucionRecursosRequest]) -> Tuple[List[List[Proceso]], List[ProcesosCompilados], List[int]]:
+        """
+        Agrupa los escenarios de un lote por su lista de procesos.
+        
+        La compilación depende solo de los IDs, duraciones, prioridades y
+        requisitos de los procesos, así que se comparte entre listas con
+        ese mismo contenido aunque sean objetos distintos. Las listas solo
+        se unifican si son iguales en todos sus campos, porque el resto de
+        la distribución usa también fechas, estados y dependencias.
+        
+        Args:
+            requests: Solicitudes de cada escenario
+            
+        Returns:
+            Tuple[List[List[Proceso]], List[ProcesosCompilados], List[int]]:
+            Listas distintas, la compilación de cada una y la lista de cada escenario
+        """
+        listas: List[List[Proceso]] = []
+        compilados: List[ProcesosCompilados] = []
+        lista_de_escenario: List[int] = []
+        por_contenido: Dict[tuple, Tuple[ProcesosCompilados, List[int]]] = {}
+        
+        for request in requests:
+            contenido = tuple((p.id, p.tiempo_estimado_horas, p.prioridad.value, tuple(p.recursos_requeridos)) 
+                              for p in request.procesos)
+            if contenido not in por_contenido:
+                por_contenido[contenido] = (compilar_procesos(request.procesos), [])
+            compilacion, iguales = por_contenido[contenido]
+            
+            k = next((k for k in iguales if listas[k] is request.procesos or listas[k] == request.procesos), None)
+            if k is None:
+                k = len(listas)
+                listas.append(request.procesos)
+                compilados.append(compilacion)
+                iguales.append(k)
+            lista_de_escenario.append(k)
+        
+        return listas, compilados, lista_de_escenario
+    
+    def _distribuir(self, 
+                    request: DistribucionRecursosRequest, 
+                    procesos_compilados: Optional[ProcesosCompilados] = None) -> DistribucionRecursosResponse:
+        """
+        Valida la solicitud, distribuye y construye la respuesta.
+        
+        Args:
+            request: Datos de entrada para la distribución
+            procesos_compilados: Compilación previa de request.procesos, en su orden
+            
+        Returns:
+            DistribucionRecursosResponse: Resultado de la distribución
+        """
+        # Validar entrada
+        self._validar_entrada(request)
+        
+        # Filtrar recursos disponibles
+        recursos_disponibles = self._filtrar_recursos_disponibles(request)
+        
+        # Ordenar procesos según la estrategia
+        procesos_ordenados = self._ordenar_procesos(request)
+        posiciones = {id(p): k for k, p in enumerate(request.procesos)}
+        indices = [posiciones[id(p)] for p in procesos_ordenados]
+        
+        # Con dependencias, cada proceso va después de sus predecesores y, donde se pueda, en el orden de la estrategia
+        grafo = compilar_dependencias(request.procesos)
+        predecesores = None
+        if grafo.tiene_dependencias:
+            rango = np.empty(len(indices), dtype=int)
+            rango[indices] = np.arange(len(indices))
+            indices = ordenar_topologicamente(grafo, rango.tolist())
+            posicion_en_orden = np.empty(len(indices), dtype=int)
+            posicion_en_orden[indices] = np.arange(len(indices))
+            procesos_ordenados = [request.procesos[k] for k in indices]
+            predecesores = [posicion_en_orden[grafo.predecesores[k]] for k in indices]
+        
+        if procesos_compilados is not None:
+            procesos_compilados = procesos_compilados.seleccionar(indices)
+        
+        # Ejecutar distribución según la estrategia
+        metricas = MetricasDistribucion(recursos_disponibles, len(request.recursos))
+        asignaciones = self._ejecutar_distribucion(
+            procesos_ordenados,
+            recursos_disponibles,
+            request,
+            metricas,
+            procesos_compilados=procesos_compilados,
+            predecesores=predecesores
+        )
+        
+        response = self._construir_respuesta(asignaciones, recursos_disponibles, request, metricas)
+        
+        if grafo.tiene_dependencias:
+            ruta = calcular_ruta_critica(grafo, np.array([p.tiempo_estimado_horas for p in request.procesos]))
+            response.ruta_critica = [request.procesos[k].id for k in ruta.ruta]
+            response.metricas["duracion_ruta_critica"] = ruta.duracion
+        
+        return response
+    
+    def redistribuir(self, 
+                     request: DistribucionRecursosRequest, 
+                     respuesta_anterior: DistribucionRecursosResponse, 
+                     cambios: CambiosDistribucion) -> DistribucionRecursosResponse:
+        """
+        Repara una distribución previa tras cambios en procesos o recursos.
+        
+        Solo se tocan los recursos afectados: los que se eliminaron, dejaron
+        de estar disponibles, se modificaron o perdieron alguna asignación.
+        Sus asignaciones que siguen siendo válidas se conservan en el mismo
+        orden con las fechas recalculadas; los procesos nuevos, modificados,
+        huérfanos o antes sin asignar se ubican con la estrategia de la
+        solicitud después de la última asignación conservada de cada
+        recurso. Las asignaciones de los demás recursos no cambian.
+        
+        Con dependencias, los sucesores conservados de un proceso que vuelve
+        a ubicarse se liberan con él, y ningún proceso empieza antes de que
+        terminen sus predecesores.
+        
+        Args:
+            request: Solicitud con la que se obtuvo la distribución previa
+            respuesta_anterior: Distribución previa
+            cambios: Cambios ocurridos desde entonces
+            
+        Returns:
+            DistribucionRecursosResponse: Distribución reparada
             
-            self._logger.info(f"Distribución completada: {len(asignaciones)} asignaciones realizadas")
+        Raises:
+            ValueError: Si los datos resultantes son inválidos
+            RuntimeError: Si ocurre un error durante la redistribución
+        """
+        try:
+            self._logger.info(f"Iniciando redistribución incremental con estrategia {request.estrategia.value}")
+            self._callback = None
+            
+            # Aplicar los cambios a procesos y recursos
+            procesos_liberados = set(cambios.procesos_eliminados) | {p.id for p in cambios.procesos_modificados}
+            procesos_modificados = {p.id: p for p in cambios.procesos_modificados}
+            procesos = [procesos_modificados.get(p.id, p) for p in request.procesos 
+                        if p.id not in cambios.procesos_eliminados] + cambios.procesos_agregados
+            recursos_modificados = {r.id: r for r in cambios.recursos_modificados}
+            recursos = [recursos_modificados.get(r.id, r) for r in request.recursos 
+                        if r.id not in cambios.recursos_eliminados] + cambios.recursos_agregados
+            nuevo_request = replace(request, procesos=procesos, recursos=recursos)
+            
+            self._validar_entrada(nuevo_request)
+            recursos_disponibles = self._filtrar_recursos_disponibles(nuevo_request)
+            
+            # Conservar las asignaciones válidas y reparar las líneas de tiempo afectadas;
+            # un proceso que vuelve a ubicarse arrastra a los sucesores que se habían conservado
+            grafo = compilar_dependencias(procesos)
+            while True:
+                conservadas, reparadas = self._conservar_asignaciones(
+                    respuesta_anterior.asignaciones,
+                    nuevo_request,
+                    recursos_disponibles,
+                    procesos_liberados,
+                    set(recursos_modificados),
+                    grafo
+                )
+                asignados = {a.proceso_id for a in conservadas}
+                pendientes = [k for k, p in enumerate(procesos) if p.id not in asignados]
+                arrastrados = {procesos[k].id for k in sucesores_transitivos(grafo, pendientes)} & asignados
+                if not arrastrados:
+                    break
+                procesos_liberados |= arrastrados
+            
+            # Ubicar el resto a continuación de la carga conservada
+            metricas = MetricasDistribucion(recursos_disponibles, len(nuevo_request.recursos))
+            for a in conservadas:
+                metricas.registrar_asignacion(a)
+            
+            nuevas = []
+            if pendientes:
+                nuevas = self._ubicar_pendientes(pendientes, conservadas, recursos_disponibles, 
+                                                 nuevo_request, metricas, grafo)
+            
+            asignaciones = conservadas + nuevas
+            response = self._construir_respuesta(asignaciones, recursos_disponibles, nuevo_request, metricas)
+            response.metricas["asignaciones_conservadas"] = len(conservadas) - reparadas
+            response.metricas["asignaciones_reprogramadas"] = reparadas
+            response.metricas["procesos_reubicados"] = len(nuevas)
+            
+            self._logger.info(f"Redistribución completada: {len(nuevas)} procesos ubicados, "
+                              f"{reparadas} asignaciones reprogramadas")
             return response
             
         except Exception as e:
-            self._logger.error(f"Error en distribución de recursos: {str(e)}")
-            raise RuntimeError(f"Error distribuyendo recursos: {str(e)}")
+            self._logger.error(f"Error en redistribución de recursos: {str(e)}")
+            raise RuntimeError(f"Error redistribuyendo recursos: {str(e)}")
+    
+    def _conservar_asignaciones(self, 
+                               anteriores: List[AsignacionRecurso], 
+                               request: DistribucionRecursosRequest, 
+                               recursos_disponibles: List[Recurso], 
+                               procesos_liberados: set, 
+                               recursos_modificados: set,
+                               grafo: GrafoDependencias) -> Tuple[List[AsignacionRecurso], int]:
+        """
+        Selecciona las asignaciones previas que siguen siendo válidas.
+        
+        Las asignaciones de recursos no disponibles y las de procesos
+        eliminados o modificados se descartan. En un recurso modificado se
+        conservan, en su orden, las asignaciones que aún le son factibles.
+        Con asignación por equipos, un equipo incompleto se descarta entero.
+        Las líneas de tiempo que cambiaron se compactan y se vuelven a
+        calendarizar sin adelantar ningún proceso a sus predecesores; las
+        demás se devuelven intactas.
+        
+        Args:
+            anteriores: Asignaciones de la distribución previa
+            request: Solicitud con los cambios aplicados
+            recursos_disponibles: Recursos disponibles tras los cambios
+            procesos_liberados: IDs de procesos eliminados, modificados o
+                que deben volver a ubicarse
+            recursos_modificados: IDs de recursos modificados
+            grafo: Dependencias entre los procesos de la solicitud
+            
+        Returns:
+            Tuple[List[AsignacionRecurso], int]: Asignaciones conservadas y
+            cuántas de ellas se reprogramaron
+        """
+        disponibles = {r.id: r for r in recursos_disponibles}
+        procesos = {p.id: p for p in request.procesos}
+        por_recurso: Dict[str, List[AsignacionRecurso]] = {}
+        afectados = set(recursos_modificados) & set(disponibles)
+        
+        for a in anteriores:
+            if a.recurso_id not in disponibles:
+                continue
+            if a.proceso_id in procesos_liberados or a.proceso_id not in procesos:
+                afectados.add(a.recurso_id)
+                continue
+            por_recurso.setdefault(a.recurso_id, []).append(a)
+        
+        # En los recursos modificados, conservar solo lo que aún les es factible
+        max_horas = request.restricciones.max_horas_por_recurso if request.restricciones else None
+        for recurso_id in afectados & set(recursos_modificados) & set(por_recurso):
+            previas = sorted(por_recurso[recurso_id], key=lambda a: a.fecha_inicio)
+            datos = compilar_problema([procesos[a.proceso_id] for a in previas], [disponibles[recurso_id]])
+            validas, horas = [], 0.0
+            for k, a in enumerate(previas):
+                if datos.factible_de(k)[0] and (not max_horas or horas + datos.duraciones[k] <= max_horas):
+                    validas.append(a)
+                    horas += datos.duraciones[k]
+            por_recurso[recurso_id] = validas
+        
+        # Un equipo que perdió algún miembro se libera completo para volver a formarse
+        if request.asignar_equipos:
+            miembros = Counter(a.proceso_id for a in anteriores)
+            restantes = Counter(a.proceso_id for lista in por_recurso.values() for a in lista)
+            incompletos = {proceso_id for proceso_id, n in restantes.items() if n < miembros[proceso_id]}
+            for recurso_id, lista in por_recurso.items():
+                if any(a.proceso_id in incompletos for a in lista):
+                    afectados.add(recurso_id)
+                    por_recurso[recurso_id] = [a for a in lista if a.proceso_id not in incompletos]
+        
+        # Recalendarizar en serie las líneas de tiempo afectadas
+        reprogramadas: Dict[Tuple[str, str], AsignacionRecurso] = {}
+        recursos_afectados = [disponibles[recurso_id] for recurso_id in afectados if por_recurso.get(recurso_id)]
+        if recursos_afectados:
+            elegidas = [(j, a) for j, r in enumerate(recursos_afectados) 
+                        for a in sorted(por_recurso[r.id], key=lambda a: a.fecha_inicio)]
+            indices_recursos = np.array([j for j, _ in elegidas])
+            duraciones = np.array([procesos[a.proceso_id].tiempo_estimado_horas for _, a in elegidas])
+            calendario = self._crear_calendario(recursos_afectados, request)
+            
+            if grafo.tiene_dependencias:
+                # Los predecesores en recursos que no cambian conservan su fin
+                fines: Dict[str, datetime] = {}
+                for recurso_id, lista in por_recurso.items():
+                    if recurso_id not in afectados:
+                        for a in lista:
+                            fines[a.proceso_id] = max(fines.get(a.proceso_id, a.fecha_fin), a.fecha_fin)
+                horas_inicio = self._compactar_con_dependencias(elegidas, duraciones, calendario, grafo, 
+                                                                request, fines)
+            else:
+                horas_finales = np.empty(len(elegidas))
+                for j in range(len(recursos_afectados)):
+                    seleccion = indices_recursos == j
+                    horas_finales[seleccion] = np.cumsum(duraciones[seleccion])
+                horas_inicio = horas_finales - duraciones
+            
+            fechas_inicio, fechas_fin = calendario.fechas(indices_recursos, horas_inicio, horas_inicio + duraciones)
+            for (j, a), fecha_inicio, fecha_fin in zip(elegidas, fechas_inicio, fechas_fin):
+                reprogramadas[(a.proceso_id, a.recurso_id)] = self._crear_asignacion(
+                    procesos[a.proceso_id], recursos_afectados[j], fecha_inicio, fecha_fin
+                )
+        
+        vigentes = {(a.proceso_id, a.recurso_id) for lista in por_recurso.values() for a in lista}
+        conservadas = [reprogramadas.get((a.proceso_id, a.recurso_id), a) for a in anteriores 
+                       if (a.proceso_id, a.recurso_id) in vigentes]
+        return conservadas, len(reprogramadas)
+    
+    def _compactar_con_dependencias(self, 
+                                   elegidas: List[Tuple[int, AsignacionRecurso]], 
+                                   duraciones: np.ndarray, 
+                                   calendario: CalendarioLaboral, 
+                                   grafo: GrafoDependencias, 
+                                   request: DistribucionRecursosRequest, 
+                                   fines: Dict[str, datetime]) -> np.ndarray:
+        """
+        Compacta líneas de tiempo sin adelantar ningún proceso a sus predecesores.
+        
+        Las asignaciones se recorren por su inicio previo, que respeta las
+        dependencias, así cada predecesor se reprograma antes que sus
+        sucesores. Cada una empieza cuando su recurso queda libre o, si es
+        más tarde, cuando termina el último de sus predecesores.
+        
+        Args:
+            elegidas: (índice en el calendario, asignación) de cada asignación
+                a reprogramar, en el orden de su recurso
+            duraciones: Horas de cada asignación
+            calendario: Calendario de los recursos afectados
+            grafo: Dependencias entre los procesos de la solicitud
+            request: Solicitud con los cambios aplicados
+            fines: Fecha de fin de los procesos que no se reprograman, por ID;
+                se completa con las de los reprogramados
+            
+        Returns:
+            np.ndarray: Hora de trabajo de inicio de cada asignación en su recurso
+        """
+        posiciones = {p.id: k for k, p in enumerate(request.procesos)}
+        rango = np.empty(len(grafo.orden), dtype=int)
+        rango[grafo.orden] = np.arange(len(grafo.orden))
+        orden = sorted(range(len(elegidas)), 
+                       key=lambda e: (elegidas[e][1].fecha_inicio, rango[posiciones[elegidas[e][1].proceso_id]]))
+        
+        libre = np.zeros(max(j for j, _ in elegidas) + 1)
+        horas_inicio = np.empty(len(elegidas))
+        for e in orden:
+            j, a = elegidas[e]
+            previos = [fines[request.procesos[k].id] for k in grafo.predecesores[posiciones[a.proceso_id]] 
+                       if request.procesos[k].id in fines]
+            inicio = libre[j]
+            if previos:
+                listo = calendario.horas_hasta(np.array([j]), np.array([max(previos)], dtype='datetime64[us]'))[0]
+                inicio = max(inicio, float(listo))
+            horas_inicio[e] = inicio
+            libre[j] = inicio + duraciones[e]
+            _, (fecha_fin,) = calendario.fechas(np.array([j]), np.array([inicio]), np.array([libre[j]]))
+            fines[a.proceso_id] = max(fines.get(a.proceso_id, fecha_fin), fecha_fin)
+        
+        return horas_inicio
+    
+    def _ubicar_pendientes(self, 
+                          pendientes: List[int], 
+                          conservadas: List[AsignacionRecurso], 
+                          recursos: List[Recurso], 
+                          request: DistribucionRecursosRequest, 
+                          metricas: MetricasDistribucion, 
+                          grafo: GrafoDependencias) -> List[AsignacionRecurso]:
+        """
+        Ubica los procesos pendientes después de las asignaciones conservadas.
+        
+        Cada recurso parte de sus horas de trabajo hasta el fin de su última
+        asignación conservada, de modo que lo nuevo no se superpone con lo
+        que ya tenía aunque entre sus asignaciones queden huecos. Con
+        dependencias, los pendientes van en orden topológico y ninguno
+        empieza, en ningún recurso, antes de que terminen sus predecesores,
+        conservados o recién ubicados.
+        
+        Args:
+            pendientes: Índices en request.procesos de los procesos a ubicar
+            conservadas: Asignaciones conservadas
+            recursos: Recursos disponibles
+            request: Solicitud con los cambios aplicados
+            metricas: Acumulador que se actualiza con cada asignación
+            grafo: Dependencias entre los procesos de la solicitud
+            
+        Returns:
+            List[AsignacionRecurso]: Asignaciones de los procesos ubicados
+        """
+        if not recursos:
+            return []
+        
+        calendario = self._crear_calendario(recursos, request)
+        posicion_recurso = {r.id: j for j, r in enumerate(recursos)}
+        fin_recurso: Dict[int, datetime] = {}
+        fin_proceso: Dict[str, datetime] = {}
+        for a in conservadas:
+            j = posicion_recurso[a.recurso_id]
+            fin_recurso[j] = max(fin_recurso.get(j, a.fecha_fin), a.fecha_fin)
+            fin_proceso[a.proceso_id] = max(fin_proceso.get(a.proceso_id, a.fecha_fin), a.fecha_fin)
+        
+        horas_iniciales = np.zeros(len(recursos))
+        if fin_recurso:
+            ocupados = np.array(list(fin_recurso))
+            horas_iniciales[ocupados] = np.maximum(
+                calendario.horas_hasta(ocupados, np.array(list(fin_recurso.values()), dtype='datetime64[us]')), 0.0
+            )
+        
+        lista = [request.procesos[k] for k in pendientes]
+        procesos_ordenados = self._ordenar_procesos(replace(request, procesos=lista))
+        if not grafo.tiene_dependencias:
+            return self._ejecutar_distribucion(procesos_ordenados, recursos, request, metricas, horas_iniciales)
+        
+        # Orden topológico que respeta, donde se pueda, el de la estrategia; los conservados van antes
+        posiciones = {id(p): k for k, p in zip(pendientes, lista)}
+        rango = np.full(len(request.procesos), -1)
+        rango[[posiciones[id(p)] for p in procesos_ordenados]] = np.arange(len(procesos_ordenados))
+        orden = [k for k in ordenar_topologicamente(grafo, rango.tolist()) if rango[k] >= 0]
+        posicion_en_orden = {k: n for n, k in enumerate(orden)}
+        predecesores = [np.array([posicion_en_orden[m] for m in grafo.predecesores[k] if m in posicion_en_orden], 
+                                 dtype=int) for k in orden]
+        
+        # Ningún recurso puede empezar un proceso antes de que terminen sus predecesores conservados
+        inicios_minimos = np.zeros((len(orden), len(recursos)))
+        todos = np.arange(len(recursos))
+        for n, k in enumerate(orden):
+            previos = [fin_proceso[request.procesos[m].id] for m in grafo.predecesores[k] 
+                       if request.procesos[m].id in fin_proceso]
+            if previos:
+                inicios_minimos[n] = calendario.horas_hasta(todos, np.datetime64(max(previos), 'us'))
+        
+        return self._ejecutar_distribucion([request.procesos[k] for k in orden], recursos, request, metricas, 
+                                           horas_iniciales, predecesores=predecesores, 
+                                           inicios_minimos=inicios_minimos)
+    
+    def _construir_respuesta(self, 
+                            asignaciones: List[AsignacionRecurso], 
+                            recursos_disponibles: List[Recurso], 
+                            request: DistribucionRecursosRequest,
+                            acumulador: MetricasDistribucion) -> DistribucionRecursosResponse:
+        """
+        Construye la respuesta con métricas y recomendaciones.
+        
+        Args:
+            asignaciones: Asignaciones realizadas
+            recursos_disponibles: Recursos entre los que se distribuyó
+            request: Datos de entrada
+            acumulador: Métricas acumuladas durante la distribución
+            
+        Returns:
+            DistribucionRecursosResponse: Resultado de la distribución
+        """
+        # Calcular métricas
+        metricas = acumulador.como_diccionario()
+        
+        # Identificar procesos sin asignar
+        procesos_sin_asignar = self._identificar_procesos_sin_asignar(
+            request.procesos,
+            asignaciones
+        )
+        
+        # Procesos que terminarían después de su fecha límite
+        retrasos: Dict[str, float] = {}
+        for a in asignaciones:
+            if a.retraso_horas > 0:
+                retrasos[a.proceso_id] = max(retrasos.get(a.proceso_id, 0.0), a.retraso_horas)
+        procesos_con_retraso = [p for p in request.procesos if p.id in retrasos]
+        if any(p.fecha_limite for p in request.procesos):
+            metricas["procesos_con_retraso"] = len(procesos_con_retraso)
+            metricas["retraso_maximo_horas"] = max(retrasos.values(), default=0.0)
+            metricas["retraso_total_horas"] = sum(retrasos.values())
+        
+        # Generar recomendaciones
+        recomendaciones = self._generar_recomendaciones(
+            asignaciones,
+            procesos_sin_asignar,
+            recursos_disponibles,
+            request,
+            metricas
+        )
+        
+        return DistribucionRecursosResponse(
+            asignaciones=asignaciones,
+            procesos_asignados=len(set(a.proceso_id for a in asignaciones)),
+            procesos_sin_asignar=procesos_sin_asignar,
+            recursos_utilizados=acumulador.recursos_utilizados,
+            eficiencia_estimada=metricas.get("eficiencia", 0.0),
+            costo_total=metricas.get("costo_total", 0.0),
+            tiempo_total=metricas.get("tiempo_total", 0.0),
+            recomendaciones=recomendaciones,
+            metricas=metricas,
+            procesos_con_retraso=procesos_con_retraso
+        )
     
     def _validar_entrada(self, request: DistribucionRecursosRequest) -> None:
         """
@@ -346,225 +1182,521 @@ class DistribuirRecursos:
             procesos.sort(key=lambda p: p.tiempo_estimado_horas)
         elif request.estrategia == EstrategiaDistribucion.COSTO_MINIMO:
             # Ordenar por procesos que requieren recursos más baratos
-            procesos.sort(key=lambda p: self._calcular_costo_estimado_proceso(p, request.recursos))
+            indice = indexar_habilidades(request.recursos)
+            costos = [r.costo_por_hora for r in request.recursos if r.costo_por_hora > 0]
+            costo_minimo = min(costos) if costos else 0
+            procesos.sort(key=lambda p: self._calcular_costo_estimado_proceso(p, indice, costo_minimo))
         elif request.estrategia == EstrategiaDistribucion.EFICIENCIA:
             # Ordenar por eficiencia estimada (tiempo/recursos)
             procesos.sort(key=lambda p: p.tiempo_estimado_horas / len(p.recursos_requeridos) if p.recursos_requeridos else p.tiempo_estimado_horas)
+        elif request.estrategia == EstrategiaDistribucion.BALANCEADA:
+            # Procesos más largos primero (LPT) para equilibrar mejor la carga final
+            procesos.sort(key=lambda p: p.tiempo_estimado_horas, reverse=True)
+        elif request.estrategia == EstrategiaDistribucion.FECHA_LIMITE:
+            # Fecha límite más próxima primero; los procesos sin fecha límite al final
+            procesos.sort(key=lambda p: (p.fecha_limite is None, p.fecha_limite or datetime.max, -p.prioridad.value))
+        elif request.estrategia == EstrategiaDistribucion.MENOR_HOLGURA:
+            # Menor holgura (fecha límite menos duración) primero; los procesos sin fecha límite al final
+            procesos.sort(key=lambda p: (p.fecha_limite is None, 
+                                         p.fecha_limite - timedelta(hours=p.tiempo_estimado_horas) if p.fecha_limite else datetime.max, 
+                                         -p.prioridad.value))
         
         return procesos
     
-    def _calcular_costo_estimado_proceso(self, proceso: Proceso, recursos: List[Recurso]) -> float:
+    def _calcular_costo_estimado_proceso(self, 
+                                        proceso: Proceso, 
+                                        indice: IndiceHabilidades, 
+                                        costo_minimo: float) -> float:
         """
         Calcula el costo estimado de un proceso.
         
         Args:
             proceso: Proceso a evaluar
-            recursos: Lista de recursos disponibles
+            indice: Índice de habilidades de los recursos disponibles
+            costo_minimo: Menor costo por hora positivo entre los recursos
             
         Returns:
             float: Costo estimado del proceso
         """
         if not proceso.recursos_requeridos:
             # Si no especifica recursos, usar el más barato
-            costos = [r.costo_por_hora for r in recursos if r.costo_por_hora > 0]
-            costo_minimo = min(costos) if costos else 0
             return proceso.tiempo_estimado_horas * costo_minimo
         
-        # Calcular con recursos específicos
+        # Calcular con el recurso compatible más barato de cada requisito
         costo_total = 0
         for recurso_req in proceso.recursos_requeridos:
-            recursos_compatibles = [r for r in recursos if r.nombre == recurso_req or recurso_req in r.habilidades]
-            if recursos_compatibles:
-                costo_minimo = min(r.costo_por_hora for r in recursos_compatibles)
-                costo_total += proceso.tiempo_estimado_horas * costo_minimo
+            k = indice.habilidades.get(recurso_req)
+            if k is not None:
+                costo_total += proceso.tiempo_estimado_horas * float(indice.costo_minimo[k])
         
         return costo_total
     
     def _ejecutar_distribucion(self, 
                               procesos: List[Proceso], 
                               recursos: List[Recurso], 
-                              request: DistribucionRecursosRequest) -> List[AsignacionRecurso]:
+                              request: DistribucionRecursosRequest,
+                              metricas: MetricasDistribucion,
+                              horas_iniciales: Optional[np.ndarray] = None,
+                              procesos_compilados: Optional[ProcesosCompilados] = None,
+                              predecesores: Optional[List[np.ndarray]] = None,
+                              inicios_minimos: Optional[np.ndarray] = None) -> List[AsignacionRecurso]:
         """
         Ejecuta la distribución de recursos usando la estrategia seleccionada.
         
+        Con predecesores, un proceso empieza cuando el recurso está libre y
+        todos sus predecesores terminaron, medido en horas laborables desde
+        la fecha de inicio; si algún predecesor quedó sin asignar, el
+        proceso tampoco se asigna.
+        
         Args:
             procesos: Lista de procesos ordenados
             recursos: Lista de recursos disponibles
             request: Datos de entrada
+            metricas: Acumulador que se actualiza con cada asignación
+            horas_iniciales: Horas ya ocupadas de cada recurso antes de
+                distribuir (por defecto, ninguna)
+            procesos_compilados: Compilación previa de los procesos, en su orden
+            predecesores: Índices de los predecesores de cada proceso; los
+                procesos deben venir en orden topológico
+            inicios_minimos: Hora de trabajo antes de la que cada proceso no
+                puede empezar en cada recurso (n_procesos, n_recursos), por
+                predecesores ubicados fuera de esta distribución
             
         Returns:
             List[AsignacionRecurso]: Lista de asignaciones realizadas
         """
         asignaciones = []
-        recursos_ocupados = {r.id: 0.0 for r in recursos}  # Horas ocupadas por recurso
-        
-        for proceso in procesos:
-            # Encontrar el mejor recurso para este proceso
-            recurso_asignado = self._encontrar_mejor_recurso(
-                proceso,
-                recursos,
-                recursos_ocupados,
-                request
-            )
+        if not recursos:
+            return asignaciones
+        
+        # Compilar factibilidad una sola vez para todos los pares
+        datos = compilar_problema(procesos, recursos, procesos_compilados=procesos_compilados)
+        claves = self._calcular_claves_cola(datos, request)
+        colas: Dict[Tuple[int, ...], Union[_ColaRecursos, _ColaCargas]] = {}
+        # Horas ocupadas por recurso
+        horas_ocupadas = np.zeros(len(recursos)) if horas_iniciales is None else np.array(horas_iniciales, dtype=float)
+        horas_dia = np.array([r.horas_disponibles_dia for r in recursos], dtype=float)
+        
+        fin_procesos = np.full(len(procesos), np.nan)  # Hora de fin de cada proceso asignado
+        
+        elegidos: List[Tuple[int, int, float]] = []  # (proceso, recurso, hora de inicio en el recurso)
+        
+        for i, proceso in enumerate(procesos):
+            # Hora en que terminan todos los predecesores
+            listo = 0.0
+            if predecesores is not None and len(predecesores[i]):
+                fines = fin_procesos[predecesores[i]]
+                if np.isnan(fines).any():
+                    continue
+                listo = float(fines.max())
+            if inicios_minimos is not None:
+                listo = np.maximum(inicios_minimos[i], listo)
+            esperar = bool(np.any(listo > 0))
             
-            if recurso_asignado:
-                # Crear asignación
-                asignacion = self._crear_asignacion(
-                    proceso,
-                    recurso_asignado,
-                    request.fecha_inicio or datetime.now(),
-                    recursos_ocupados[recurso_asignado.id]
-                )
-                
-                asignaciones.append(asignacion)
+            if request.asignar_equipos:
+                # Todos los miembros empiezan cuando se libera el más ocupado
+                horas = np.maximum(horas_ocupadas, listo) if esperar else horas_ocupadas
+                equipo = self._encontrar_equipo(i, proceso, datos, horas, request)
+                if equipo:
+                    inicio = float(horas[equipo].max())
+                    elegidos.extend((i, j, inicio) for j in equipo)
+                    horas_ocupadas[equipo] = inicio + proceso.tiempo_estimado_horas
+                    fin_procesos[i] = inicio + proceso.tiempo_estimado_horas
+                    for j in equipo:
+                        metricas.registrar(j, proceso.tiempo_estimado_horas, 
+                                           proceso.tiempo_estimado_horas * recursos[j].costo_por_hora)
+                    if self._callback is not None:
+                        self._callback(metricas)
+                    self._logger.debug(f"Proceso {proceso.nombre} asignado a un equipo de {len(equipo)} recursos")
+                continue
+            
+            # Encontrar el mejor recurso para este proceso; si debe esperar a
+            # sus predecesores, cada recurso cuenta como ocupado hasta entonces
+            horas, clave = horas_ocupadas, claves[i]
+            if esperar:
+                horas, clave = np.maximum(horas_ocupadas, listo), None
+            
+            if request.estrategia in self._ESTRATEGIAS_POR_FINALIZACION:
+                j = self._encontrar_recurso_balanceado(i, datos, clave, colas, horas, horas_dia, request)
+            else:
+                j = self._encontrar_mejor_recurso(i, datos, clave, colas, horas, request)
+            
+            if j is not None:
+                inicio = float(horas[j])
+                elegidos.append((i, j, inicio))
                 
-                # Actualizar recurso ocupado
-                recursos_ocupados[recurso_asignado.id] += proceso.tiempo_estimado_horas
+                # Actualizar recurso ocupado y métricas
+                horas_ocupadas[j] = inicio + proceso.tiempo_estimado_horas
+                fin_procesos[i] = horas_ocupadas[j]
+                metricas.registrar(j, proceso.tiempo_estimado_horas, 
+                                   proceso.tiempo_estimado_horas * recursos[j].costo_por_hora)
+                if self._callback is not None:
+                    self._callback(metricas)
                 
-                self._logger.debug(f"Proceso {proceso.nombre} asignado a recurso {recurso_asignado.nombre}")
+                self._logger.debug(f"Proceso {proceso.nombre} asignado a recurso {recursos[j].nombre}")
+        
+        if not elegidos:
+            return asignaciones
+        
+        # Fechas de todas las asignaciones según el horario de cada recurso
+        indices_procesos, indices_recursos, horas_previas = (np.array(columna) for columna in zip(*elegidos))
+        calendario = self._crear_calendario(recursos, request)
+        fechas_inicio, fechas_fin = calendario.fechas(
+            indices_recursos, horas_previas, horas_previas + datos.duraciones[indices_procesos]
+        )
+        
+        if request.asignar_equipos:
+            # Con horarios distintos, el equipo arranca cuando puede hacerlo su último miembro
+            inicio_equipo: Dict[int, datetime] = {}
+            for (i, _, _), fecha_inicio in zip(elegidos, fechas_inicio):
+                inicio_equipo[i] = max(inicio_equipo.get(i, fecha_inicio), fecha_inicio)
+            fechas_inicio = [inicio_equipo[i] for i, _, _ in elegidos]
+            fechas_fin = [max(fecha_inicio, fecha_fin) for fecha_inicio, fecha_fin in zip(fechas_inicio, fechas_fin)]
+        
+        for (i, j, _), fecha_inicio, fecha_fin in zip(elegidos, fechas_inicio, fechas_fin):
+            asignaciones.append(self._crear_asignacion(procesos[i], recursos[j], fecha_inicio, fecha_fin))
+        metricas.registrar_fechas(min(fechas_inicio), max(fechas_fin))
         
         return asignaciones
     
+    def _encontrar_equipo(self, 
+                         i: int, 
+                         proceso: Proceso, 
+                         datos: ProblemaCompilado, 
+                         horas_ocupadas: np.ndarray,
+                         request: DistribucionRecursosRequest) -> Optional[List[int]]:
+        """
+        Encuentra el equipo de recursos que cubre todos los requisitos de un proceso.
+        
+        Cada recurso asignable se reduce a la máscara de bits de los
+        requisitos que cubre y, por cada máscara distinta, solo se considera
+        el mejor recurso que la tiene. La búsqueda ramifica únicamente sobre
+        las máscaras que cubren el requisito pendiente de menor bit y poda
+        las ramas que no pueden mejorar al mejor equipo encontrado, por lo
+        que nunca enumera combinaciones de recursos.
+        
+        Se prefiere el equipo más pequeño; a igual tamaño, el de mayor
+        puntuación total o, con las estrategias que eligen por finalización
+        (BALANCEADA, FECHA_LIMITE, MENOR_HOLGURA), el que puede empezar antes.
+        
+        Args:
+            i: Índice del proceso a asignar
+            proceso: Proceso a asignar
+            datos: Problema compilado
+            horas_ocupadas: Horas ocupadas por recurso
+            request: Datos de entrada
+            
+        Returns:
+            Optional[List[int]]: Índices de los recursos del equipo o None
+        """
+        candidatos = np.flatnonzero(self._puede_asignar_recurso(i, datos, horas_ocupadas, request))
+        if candidatos.size == 0:
+            return None
+        
+        puntuaciones = self._calcular_puntuaciones(i, datos, request)
+        balanceada = request.estrategia in self._ESTRATEGIAS_POR_FINALIZACION
+        if balanceada:
+            preferencia = candidatos[np.lexsort((-puntuaciones[candidatos], horas_ocupadas[candidatos]))]
+        else:
+            preferencia = candidatos[np.argsort(-puntuaciones[candidatos], kind='stable')]
+        
+        # Un proceso sin requisitos lo atiende un solo recurso
+        if not proceso.recursos_requeridos:
+            return [int(preferencia[0])]
+        
+        # Un requisito que ningún recurso ofrece no puede cubrirse
+        completa, mascaras = datos.cobertura_requisitos(i)
+        if completa.bit_length() < len(set(proceso.recursos_requeridos)):
+            return None
+        
+        # El mejor recurso de cada máscara distinta, en orden de preferencia
+        _, primeros = np.unique(mascaras[preferencia], return_index=True)
+        opciones = [(int(mascaras[j]), int(j)) for j in preferencia[np.sort(primeros)]]
+        
+        # Costo de cada miembro: espera hasta su inicio (BALANCEADA, se toma el máximo) o puntuación (se suma)
+        mejor: List = [None, None]  # (clave, equipo)
+        
+        def explorar(cubierto: int, equipo: List[int], valor: float) -> None:
+            if cubierto == completa:
+                clave = (len(equipo), valor)
+                if mejor[0] is None or clave < mejor[0]:
+                    mejor[0], mejor[1] = clave, list(equipo)
+                return
+            
+            if mejor[0] is not None:
+                tamaño, valor_mejor = mejor[0]
+                if len(equipo) + 1 > tamaño or (balanceada and len(equipo) + 1 == tamaño and valor >= valor_mejor):
+                    return
+            
+            pendientes = completa & ~cubierto
+            menor = pendientes & -pendientes
+            for mascara, j in opciones:
+                if mascara & menor:
+                    equipo.append(j)
+                    if balanceada:
+                        explorar(cubierto | mascara, equipo, max(valor, float(horas_ocupadas[j])))
+                    else:
+                        explorar(cubierto | mascara, equipo, valor - float(puntuaciones[j]))
+                    equipo.pop()
+        
+        explorar(0, [], 0.0)
+        return mejor[1]
+    
     def _encontrar_mejor_recurso(self, 
-                                proceso: Proceso, 
-                                recursos: List[Recurso], 
-                                recursos_ocupados: Dict[str, float],
-                                request: DistribucionRecursosRequest) -> Optional[Recurso]:
+                                i: int, 
+                                datos: ProblemaCompilado, 
+                                clave: Optional[Tuple[int, ...]], 
+                                colas: Dict[Tuple[int, ...], _ColaRecursos],
+                                horas_ocupadas: np.ndarray,
+                                request: DistribucionRecursosRequest) -> Optional[int]:
         """
         Encuentra el mejor recurso para un proceso dado.
         
+        Los procesos con la misma clave comparten una cola de recursos
+        ordenada por puntuación, que se crea con el primero de ellos; los
+        demás procesos evalúan todos los recursos.
+        
         Args:
-            proceso: Proceso a asignar
-            recursos: Lista de recursos disponibles
-            recursos_ocupados: Horas ocupadas por recurso
+            i: Índice del proceso a asignar
+            datos: Problema compilado
+            clave: Clave de la cola del proceso (None = sin cola)
+            colas: Colas de recursos por clave
+            horas_ocupadas: Horas ocupadas por recurso
             request: Datos de entrada
             
         Returns:
-            Optional[Recurso]: Mejor recurso encontrado o None
+            Optional[int]: Índice del mejor recurso encontrado o None
         """
-        candidatos = []
+        if clave is None:
+            candidatos = self._puede_asignar_recurso(i, datos, horas_ocupadas, request)
+            
+            if not candidatos.any():
+                return None
+            
+            # Mayor puntuación; a igualdad, el primer recurso de la lista
+            puntuaciones = self._calcular_puntuaciones(i, datos, request)
+            return int(np.argmax(np.where(candidatos, puntuaciones, -np.inf)))
         
-        for recurso in recursos:
-            # Verificar disponibilidad
-            if not self._puede_asignar_recurso(recurso, proceso, recursos_ocupados, request):
-                continue
+        capacidad = datos.capacidad
+        max_horas = request.restricciones.max_horas_por_recurso if request.restricciones else None
+        
+        cola = colas.get(clave)
+        if cola is None:
+            # La capacidad no filtra a los miembros: cada proceso la comprueba al extraer
+            holguras = capacidad if not max_horas else np.minimum(capacidad, max_horas - horas_ocupadas)
+            cola = colas[clave] = _ColaRecursos(self._calcular_puntuaciones(i, datos, request), 
+                                                datos.factible_de(i, 0.0), holguras)
+        
+        duracion = datos.duraciones[i]
+        if not max_horas:
+            return cola.extraer_mejor(duracion, lambda j: capacidad[j], lambda j: True)
+        
+        return cola.extraer_mejor(duracion, 
+                                  lambda j: min(capacidad[j], max_horas - horas_ocupadas[j]), 
+                                  lambda j: horas_ocupadas[j] + duracion <= max_horas)
+    
+    def _encontrar_recurso_balanceado(self, 
+                                     i: int, 
+                                     datos: ProblemaCompilado, 
+                                     clave: Optional[Tuple[int, ...]], 
+                                     colas: Dict[Tuple[int, ...], _ColaCargas],
+                                     horas_ocupadas: np.ndarray,
+                                     horas_dia: np.ndarray,
+                                     request: DistribucionRecursosRequest) -> Optional[int]:
+        """
+        Encuentra el recurso que terminaría antes un proceso.
+        
+        La finalización de un recurso son sus horas ocupadas más las del
+        proceso, divididas por sus horas disponibles por día; así un
+        recurso con jornada más larga absorbe proporcionalmente más carga.
+        
+        Args:
+            i: Índice del proceso a asignar
+            datos: Problema compilado
+            clave: Clave de la cola del proceso (None = sin cola)
+            colas: Colas de recursos por clave
+            horas_ocupadas: Horas ocupadas por recurso
+            horas_dia: Horas disponibles por día de cada recurso
+            request: Datos de entrada
             
-            # Calcular puntuación del recurso
-            puntuacion = self._calcular_puntuacion_recurso(recurso, proceso, request)
-            candidatos.append((recurso, puntuacion))
+        Returns:
+            Optional[int]: Índice del recurso elegido o None
+        """
+        duracion = datos.duraciones[i]
         
-        if not candidatos:
-            return None
+        if clave is None:
+            candidatos = self._puede_asignar_recurso(i, datos, horas_ocupadas, request)
+            
+            if not candidatos.any():
+                return None
+            
+            # Menor finalización; a igualdad, el primer recurso de la lista
+            return int(np.argmin(np.where(candidatos, (horas_ocupadas + duracion) / horas_dia, np.inf)))
+        
+        cola = colas.get(clave)
+        if cola is None:
+            cola = colas[clave] = _ColaCargas(horas_ocupadas, horas_dia, datos.factible_de(i))
         
-        # Ordenar por puntuación (mayor es mejor)
-        candidatos.sort(key=lambda x: x[1], reverse=True)
-        return candidatos[0][0]
+        max_horas = request.restricciones.max_horas_por_recurso if request.restricciones else None
+        return cola.extraer_mejor(horas_ocupadas, duracion, max_horas)
     
-    def _puede_asignar_recurso(self, 
-                              recurso: Recurso, 
-                              proceso: Proceso, 
-                              recursos_ocupados: Dict[str, float],
-                              request: DistribucionRecursosRequest) -> bool:
+    def _calcular_claves_cola(self, 
+                             datos: ProblemaCompilado, 
+                             request: DistribucionRecursosRequest) -> List[Optional[Tuple[int, ...]]]:
         """
-        Verifica si un recurso puede ser asignado a un proceso.
+        Agrupa los procesos que eligen recurso de la misma forma.
+        
+        Dos procesos comparten clave si tienen las mismas puntuaciones por
+        recurso: ambos sin requisitos, o ambos con una única habilidad
+        cubierta requerida el mismo número de veces, y en la misma clase de
+        prioridad cuando la estrategia es PRIORIDAD. Los procesos con
+        varias habilidades distintas (su número de coincidencias cambia el
+        orden entre recursos), sin ningún requisito cubierto o cuya clave
+        comparten menos de _MIN_PROCESOS_POR_COLA procesos no usan cola.
+        La duración no forma parte de estas claves: cada cola comprueba al
+        extraer si el recurso tiene holgura para el proceso.
+        
+        En las estrategias que eligen por finalización solo importan los
+        recursos que admiten al proceso: comparten clave los procesos con
+        el mismo conjunto de habilidades cubiertas cuya duración queda
+        entre las mismas dos capacidades consecutivas de esos recursos.
         
         Args:
-            recurso: Recurso a evaluar
-            proceso: Proceso a asignar
-            recursos_ocupados: Horas ocupadas por recurso
+            datos: Problema compilado
             request: Datos de entrada
             
         Returns:
-            bool: True si el recurso puede ser asignado
+            List[Optional[Tuple[int, ...]]]: Clave de cada proceso
         """
-        # Verificar restricciones de horas
-        if request.restricciones and request.restricciones.max_horas_por_recurso:
-            horas_actuales = recursos_ocupados.get(recurso.id, 0)
-            if horas_actuales + proceso.tiempo_estimado_horas > request.restricciones.max_horas_por_recurso:
-                return False
+        requeridas = datos.requeridas
+        cubiertos = datos.cubiertos
+        if request.estrategia == EstrategiaDistribucion.PRIORIDAD:
+            clases = (datos.prioridades >= 8).astype(int)
+        else:
+            clases = np.zeros(datos.num_procesos, dtype=int)
         
-        # Verificar capacidad del recurso
-        if not recurso.puede_asignarse(proceso.tiempo_estimado_horas):
-            return False
+        # Capacidades ordenadas de los recursos compatibles con cada conjunto de habilidades
+        capacidades: Dict[Tuple[int, ...], np.ndarray] = {}
         
-        # Verificar compatibilidad de habilidades
-        if proceso.recursos_requeridos:
-            if not any(req in recurso.habilidades or req == recurso.nombre for req in proceso.recursos_requeridos):
-                return False
+        claves: List[Optional[Tuple[int, ...]]] = []
+        for i in range(datos.num_procesos):
+            inicio, fin = requeridas.indptr[i], requeridas.indptr[i + 1]
+            if not cubiertos[i]:
+                claves.append(None)
+            elif request.estrategia in self._ESTRATEGIAS_POR_FINALIZACION:
+                habilidades = tuple(sorted(requeridas.indices[inicio:fin].tolist()))
+                if habilidades not in capacidades:
+                    capacidades[habilidades] = np.sort(datos.capacidad[datos.factible_de(i, 0.0)])
+                banda = int(np.searchsorted(capacidades[habilidades], datos.duraciones[i]))
+                claves.append((banda,) + habilidades)
+            elif fin - inicio == 0:
+                claves.append((int(clases[i]), -1, 0))
+            elif fin - inicio == 1:
+                claves.append((int(clases[i]), int(requeridas.indices[inicio]), int(requeridas.data[inicio])))
+            else:
+                claves.append(None)
         
-        return True
+        # Construir una cola solo compensa si la reutilizan varios procesos
+        frecuencias = Counter(claves)
+        return [clave if frecuencias[clave] >= self._MIN_PROCESOS_POR_COLA else None for clave in claves]
     
-    def _calcular_puntuacion_recurso(self, 
-                                    recurso: Recurso, 
-                                    proceso: Proceso, 
-                                    request: DistribucionRecursosRequest) -> float:
+    def _puede_asignar_recurso(self, 
+                              i: int, 
+                              datos: ProblemaCompilado, 
+                              horas_ocupadas: np.ndarray,
+                              request: DistribucionRecursosRequest) -> np.ndarray:
         """
-        Calcula la puntuación de un recurso para un proceso.
+        Verifica qué recursos pueden ser asignados a un proceso.
         
         Args:
-            recurso: Recurso a evaluar
-            proceso: Proceso a asignar
+            i: Índice del proceso a asignar
+            datos: Problema compilado
+            horas_ocupadas: Horas ocupadas por recurso
             request: Datos de entrada
             
         Returns:
-            float: Puntuación del recurso (mayor es mejor)
+            np.ndarray: Máscara de recursos asignables (n_recursos,)
         """
-        puntuacion = 0.0
+        # Capacidad del recurso y compatibilidad de habilidades (precompiladas)
+        asignables = datos.factible_de(i)
         
-        # Puntuación base por disponibilidad
-        puntuacion += recurso.porcentaje_utilizacion * 0.1
+        # Verificar restricciones de horas
+        if request.restricciones and request.restricciones.max_horas_por_recurso:
+            asignables &= (horas_ocupadas + datos.duraciones[i] <= 
+                           request.restricciones.max_horas_por_recurso)
+        
+        return asignables
+    
+    def _calcular_puntuaciones(self, 
+                              i: int, 
+                              datos: ProblemaCompilado, 
+                              request: DistribucionRecursosRequest) -> np.ndarray:
+        """
+        Calcula la puntuación de cada recurso para un proceso.
         
-        # Puntuación por compatibilidad de habilidades
-        if proceso.recursos_requeridos:
-            habilidades_compatibles = sum(1 for req in proceso.recursos_requeridos 
-                                        if req in recurso.habilidades or req == recurso.nombre)
-            puntuacion += habilidades_compatibles * 10
+        Args:
+            i: Índice del proceso
+            datos: Problema compilado
+            request: Datos de entrada
+            
+        Returns:
+            np.ndarray: Puntuaciones (n_recursos,), mayor es mejor
+        """
+        # Puntuación base por disponibilidad y por compatibilidad de habilidades
+        puntuacion = datos.utilizacion * 0.1 + datos.coincidencias_de(i) * 10
         
         # Ajustar según estrategia
         if request.estrategia == EstrategiaDistribucion.COSTO_MINIMO:
             # Preferir recursos más baratos
-            puntuacion += max(0, 100 - recurso.costo_por_hora)
+            puntuacion = puntuacion + np.maximum(0, 100 - datos.costo_hora)
         elif request.estrategia == EstrategiaDistribucion.EFICIENCIA:
             # Preferir recursos con mayor capacidad disponible
-            puntuacion += recurso.capacidad_disponible
+            puntuacion = puntuacion + datos.capacidad
         elif request.estrategia == EstrategiaDistribucion.PRIORIDAD:
             # Preferir recursos de mayor calidad para procesos prioritarios
-            if proceso.prioridad.value >= 8:
-                puntuacion += 50 if recurso.experiencia else 0
+            if datos.prioridades[i] >= 8:
+                puntuacion = puntuacion + np.where(datos.con_experiencia, 50.0, 0.0)
         
         return puntuacion
     
+    def _crear_calendario(self, recursos: List[Recurso], request: DistribucionRecursosRequest) -> CalendarioLaboral:
+        """
+        Crea el calendario de los recursos con los feriados y ausencias de la solicitud.
+        
+        Args:
+            recursos: Recursos a calendarizar
+            request: Solicitud con la fecha de inicio, feriados y ausencias
+            
+        Returns:
+            CalendarioLaboral: Calendario desde la fecha de inicio de la solicitud
+        """
+        return CalendarioLaboral(recursos, request.fecha_inicio or datetime.now(), request.feriados, request.ausencias)
+    
     def _crear_asignacion(self, 
                          proceso: Proceso, 
                          recurso: Recurso, 
-                         fecha_inicio_base: datetime,
-                         horas_ocupadas: float) -> AsignacionRecurso:
+                         fecha_inicio: datetime,
+                         fecha_fin: datetime) -> AsignacionRecurso:
         """
         Crea una asignación de recurso a proceso.
         
         Args:
             proceso: Proceso a asignar
             recurso: Recurso asignado
-            fecha_inicio_base: Fecha base de inicio
-            horas_ocupadas: Horas ya ocupadas del recurso
+            fecha_inicio: Fecha de inicio según el calendario del recurso
+            fecha_fin: Fecha de fin según el calendario del recurso
             
         Returns:
             AsignacionRecurso: Asignación creada
         """
-        # Calcular fechas considerando horas ocupadas
-        from datetime import timedelta
-        
-        # Calcular inicio considerando trabajo previo
-        dias_trabajo_previo = horas_ocupadas / recurso.horas_disponibles_dia
-        fecha_inicio = fecha_inicio_base + timedelta(days=int(dias_trabajo_previo))
-        
-        # Calcular fin
-        dias_necesarios = proceso.tiempo_estimado_horas / recurso.horas_disponibles_dia
-        fecha_fin = fecha_inicio + timedelta(days=int(dias_necesarios) + 1)
-        
         # Calcular costo
         costo_estimado = proceso.tiempo_estimado_horas * recurso.costo_por_hora
         
+        # Retraso previsto respecto de la fecha límite
+        retraso_horas = 0.0
+        if proceso.fecha_limite and fecha_fin > proceso.fecha_limite:
+            retraso_horas = (fecha_fin - proceso.fecha_limite).total_seconds() / 3600
+        
         return AsignacionRecurso(
             proceso_id=proceso.id,
             recurso_id=recurso.id,
@@ -572,53 +1704,10 @@ class DistribuirRecursos:
             fecha_inicio=fecha_inicio,
             fecha_fin=fecha_fin,
             prioridad=proceso.prioridad.value,
-            costo_estimado=costo_estimado
+            costo_estimado=costo_estimado,
+            retraso_horas=retraso_horas
         )
     
-    def _calcular_metricas(self, 
-                          asignaciones: List[AsignacionRecurso], 
-                          request: DistribucionRecursosRequest) -> Dict[str, float]:
-        """
-        Calcula métricas de la distribución.
-        
-        Args:
-            asignaciones: Lista de asignaciones realizadas
-            request: Datos de entrada
-            
-        Returns:
-            Dict[str, float]: Métricas calculadas
-        """
-        if not asignaciones:
-            return {
-                "eficiencia": 0.0,
-                "costo_total": 0.0,
-                "tiempo_total": 0.0,
-                "utilizacion_recursos": 0.0
-            }
-        
-        # Calcular métricas básicas
-        costo_total = sum(a.costo_estimado for a in asignaciones)
-        tiempo_total = max(a.fecha_fin for a in asignaciones) - min(a.fecha_inicio for a in asignaciones)
-        tiempo_total_horas = tiempo_total.total_seconds() / 3600
-        
-        # Calcular eficiencia
-        horas_trabajo_total = sum(a.horas_asignadas for a in asignaciones)
-        recursos_utilizados = len(set(a.recurso_id for a in asignaciones))
-        recursos_totales = len(request.recursos)
-        
-        eficiencia = (horas_trabajo_total / tiempo_total_horas) * 100 if tiempo_total_horas > 0 else 0
-        utilizacion_recursos = (recursos_utilizados / recursos_totales) * 100 if recursos_totales > 0 else 0
-        
-        return {
-            "eficiencia": min(eficiencia, 100.0),
-            "costo_total": costo_total,
-            "tiempo_total": tiempo_total_horas,
-            "utilizacion_recursos": utilizacion_recursos,
-            "horas_trabajo_total": horas_trabajo_total,
-            "recursos_utilizados": recursos_utilizados,
-            "costo_promedio_hora": costo_total / horas_trabajo_total if horas_trabajo_total > 0 else 0
-        }
-    
     def _identificar_procesos_sin_asignar(self, 
                                          procesos_originales: List[Proceso],
                                          asignaciones: List[AsignacionRecurso]) -> List[Proceso]:
@@ -639,7 +1728,8 @@ class DistribuirRecursos:
                                 asignaciones: List[AsignacionRecurso],
                                 procesos_sin_asignar: List[Proceso],
                                 recursos_disponibles: List[Recurso],
-                                request: DistribucionRecursosRequest) -> List[str]:
+                                request: DistribucionRecursosRequest,
+                                metricas: Dict[str, float]) -> List[str]:
         """
         Genera recomendaciones basadas en el resultado de la distribución.
         
@@ -648,6 +1738,7 @@ class DistribuirRecursos:
             procesos_sin_asignar: Lista de procesos sin asignar
             recursos_disponibles: Lista de recursos disponibles
             request: Datos de entrada
+            metricas: Métricas de la distribución
             
         Returns:
             List[str]: Lista de recomendaciones
@@ -658,15 +1749,18 @@ class DistribuirRecursos:
         if procesos_sin_asignar:
             recomendaciones.append(f"Hay {len(procesos_sin_asignar)} procesos sin asignar. Considere añadir más recursos o flexibilizar restricciones.")
         
+        # Recomendaciones por fechas límite
+        if metricas.get("procesos_con_retraso"):
+            recomendaciones.append(f"Hay {int(metricas['procesos_con_retraso'])} procesos que terminarían después de su fecha límite. Considere la estrategia de fecha límite o añadir recursos.")
+        
         # Recomendaciones por utilización de recursos
         if recursos_disponibles:
-            recursos_no_utilizados = len(recursos_disponibles) - len(set(a.recurso_id for a in asignaciones))
+            recursos_no_utilizados = len(recursos_disponibles) - metricas.get("recursos_utilizados", 0)
             if recursos_no_utilizados > 0:
                 recomendaciones.append(f"Hay {recursos_no_utilizados} recursos no utilizados. Considere reasignar o redistribuir la carga.")
         
         # Recomendaciones por eficiencia
         if asignaciones:
-            metricas = self._calcular_metricas(asignaciones, request)
             if metricas["eficiencia"] < 60:
                 recomendaciones.append("La eficiencia es baja. Considere ajustar la estrategia de distribución o las restricciones.")
             elif metricas["eficiencia"] > 90:
@@ -674,8 +1768,26 @@ class DistribuirRecursos:
         
         # Recomendaciones por costos
         if request.optimizar_costos and asignaciones:
-            costo_promedio = sum(a.costo_estimado for a in asignaciones) / len(asignaciones)
+            costo_promedio = metricas["costo_total"] / len(asignaciones)
             if costo_promedio > 1000:  # Umbral configurable
                 recomendaciones.append("Los costos son altos. Considere usar recursos más económicos o revisar la duración de los procesos.")
         
         return recomendaciones
+
+
+# Listas de procesos de un lote y sus compilaciones, instaladas una sola vez en cada proceso trabajador
+_listas_trabajador: List[List[Proceso]] = []
+_compilados_trabajador: List[ProcesosCompilados] = []
+
+
+def _inicializar_trabajador_lote(listas: List[List[Proceso]], compilados: List[ProcesosCompilados]) -> None:
+    """Guarda en el proceso trabajador las listas de procesos del lote y sus compilaciones."""
+    global _listas_trabajador, _compilados_trabajador
+    _listas_trabajador = listas
+    _compilados_trabajador = compilados
+
+
+def _distribuir_escenario(request: DistribucionRecursosRequest, lista: int) -> DistribucionRecursosResponse:
+    """Distribuye un escenario de un lote, cuya lista de procesos ya tiene el trabajador, en un proceso trabajador."""
+    request = replace(request, procesos=_listas_trabajador[lista])
+    return DistribuirRecursos(proceso_repository=None)._distribuir(request, _compilados_trabajador[lista])
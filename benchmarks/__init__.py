@@ -0,0 +1,31 @@
+"""
+Benchmarks de Optimización
+
+Este paquete mide el rendimiento de OptimizadorRecursos y de
+DistribuirRecursos sobre instancias sintéticas reproducibles, y guarda
+los resultados en un archivo JSON que puede compararse entre commits
+para detectar regresiones antes de que lleguen al planificador.
+
+Uso:
+    python -m benchmarks --tamaños pequeña mediana --salida resultados.json
+    python -m benchmarks --salida actual.json --comparar base.json
+    python -m benchmarks --tamaños exacta --algoritmos branch_and_bound
+
+Responsabilidades:
+- Generación de instancias sintéticas con semilla
+- Ejecución de todos los algoritmos y estrategias
+- Registro y comparación de tiempos, memoria y calidad
+"""
+
+from benchmarks.generador_instancias import (
+    ConfiguracionInstancia,
+    CONFIGURACIONES_PREDEFINIDAS,
+    generar_instancia
+)
+from benchmarks.ejecutor import (
+    ResultadoBenchmark,
+    ejecutar_benchmark,
+    guardar_resultados,
+    cargar_resultados,
+    comparar_resultados
+)
@@ -0,0 +1,8 @@
+"""Permite ejecutar los benchmarks con python -m benchmarks."""
+
+import sys
+
+from benchmarks.ejecutor import main
+
+
+sys.exit(main())
@@ -0,0 +1,379 @@
+"""
+Ejecutor de Benchmarks
+
+Este módulo ejecuta cada AlgoritmoOptimizacion de OptimizadorRecursos y
+cada EstrategiaDistribucion de DistribuirRecursos sobre instancias
+sintéticas, registra tiempo de reloj, memoria pico, valor objetivo y
+procesos sin asignar, y guarda los resultados en JSON. Dos archivos de
+resultados pueden compararse para detectar regresiones entre commits.
+
+Autor: Equipo de Desarrollo
+Fecha: 2025-07-07
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, asdict
+from datetime import datetime
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+import scipy
+
+from domain.models.proceso import Proceso
+from domain.models.recurso import Recurso
+from app.services.optimizador import OptimizadorRecursos, ParametrosOptimizacion, AlgoritmoOptimizacion
+from app.use_cases.distribuir_recursos import (
+    DistribuirRecursos, DistribucionRecursosRequest, EstrategiaDistribucion
+)
+from benchmarks.generador_instancias import (
+    ConfiguracionInstancia, CONFIGURACIONES_PREDEFINIDAS, generar_instancia
+)
+
+
+# Configuración de logging
+logger = logging.getLogger(__name__)
+
+VERSION_FORMATO = 1
+
+
+@dataclass
+class ResultadoBenchmark:
+    """
+    Medición de un método sobre una instancia.
+
+    Attributes:
+        instancia: Nombre de la instancia
+        componente: "optimizador" o "distribucion"
+        metodo: Valor del algoritmo o de la estrategia
+        num_procesos: Procesos de la instancia
+        num_recursos: Recursos de la instancia
+        tiempo_segundos: Mediana del tiempo de reloj entre repeticiones
+        memoria_pico_mb: Memoria pico asignada durante una ejecución (0 si no se midió)
+        valor_objetivo: Valor objetivo del optimizador (None para la distribución)
+        costo_total: Costo total de las asignaciones
+        sin_asignar: Procesos que quedaron sin asignar
+        optimo_demostrado: Si el optimizador demostró el óptimo (None si no lo informa)
+        error: Mensaje de error si la ejecución falló
+    """
+    instancia: str
+    componente: str
+    metodo: str
+    num_procesos: int
+    num_recursos: int
+    tiempo_segundos: float = 0.0
+    memoria_pico_mb: float = 0.0
+    valor_objetivo: Optional[float] = None
+    costo_total: Optional[float] = None
+    sin_asignar: Optional[int] = None
+    optimo_demostrado: Optional[bool] = None
+    error: Optional[str] = None
+
+    @property
+    def clave(self) -> Tuple[str, str, str]:
+        """Identifica la medición al comparar archivos de resultados."""
+        return (self.instancia, self.componente, self.metodo)
+
+
+def ejecutar_benchmark(configuraciones: Sequence[ConfiguracionInstancia],
+                       algoritmos: Optional[Sequence[AlgoritmoOptimizacion]] = None,
+                       estrategias: Optional[Sequence[EstrategiaDistribucion]] = None,
+                       repeticiones: int = 1,
+                       medir_memoria: bool = True,
+                       tiempo_limite_segundos: Optional[float] = 30.0) -> List[ResultadoBenchmark]:
+    """
+    Ejecuta todos los métodos sobre todas las instancias.
+
+    Cada ejecución parte de una instancia recién generada. El tiempo es la
+    mediana de las repeticiones sin trazado de memoria; la memoria pico se
+    mide con tracemalloc en una ejecución adicional, ya que el trazado
+    distorsiona los tiempos. Los trabajadores en paralelo no se incluyen
+    en la memoria pico.
+
+    Args:
+        configuraciones: Instancias a medir
+        algoritmos: Algoritmos del optimizador (None = todos)
+        estrategias: Estrategias de distribución (None = todas)
+        repeticiones: Ejecuciones cronometradas por método
+        medir_memoria: Si se mide la memoria pico
+        tiempo_limite_segundos: Plazo por ejecución del optimizador (None = sin límite)
+
+    Returns:
+        List[ResultadoBenchmark]: Una medición por instancia y método
+
+    Raises:
+        ValueError: Si el número de repeticiones no es positivo
+    """
+    if repeticiones <= 0:
+        raise ValueError("El número de repeticiones debe ser mayor a 0")
+
+    algoritmos = list(AlgoritmoOptimizacion) if algoritmos is None else list(algoritmos)
+    estrategias = list(EstrategiaDistribucion) if estrategias is None else list(estrategias)
+    resultados = []
+
+    for configuracion in configuraciones:
+        for algoritmo in algoritmos:
+            parametros = ParametrosOptimizacion(
+                algoritmo=algoritmo,
+                semilla_aleatoria=configuracion.semilla,
+                tiempo_limite_segundos=tiempo_limite_segundos
+            )
+            resultados.append(_medir(
+                configuracion, "optimizador", algoritmo.value,
+                lambda procesos, recursos, p=parametros: _ejecutar_optimizador(procesos, recursos, p),
+                repeticiones, medir_memoria
+            ))
+
+        for estrategia in estrategias:
+            resultados.append(_medir(
+                configuracion, "distribucion", estrategia.value,
+                lambda procesos, recursos, e=estrategia: _ejecutar_distribucion(procesos, recursos, e),
+                repeticiones, medir_memoria
+            ))
+
+    return resultados
+
+
+def _ejecutar_optimizador(procesos: List[Proceso], recursos: List[Recurso], parametros: ParametrosOptimizacion) -> Dict[str, Any]:
+    """Ejecuta el optimizador y extrae las métricas registradas."""
+    solucion = OptimizadorRecursos().optimizar_asignaciones(procesos, recursos, parametros)
+    return {
+        "valor_objetivo": float(solucion.valor_objetivo),
+        "costo_total": float(sum(a.costo_estimado for a in solucion.asignaciones)),
+        "sin_asignar": len(procesos) - len(solucion.asignaciones),
+        "optimo_demostrado": solucion.metricas.get("optimo_demostrado")
+    }
+
+
+def _ejecutar_distribucion(procesos: List[Proceso], recursos: List[Recurso], estrategia: EstrategiaDistribucion) -> Dict[str, Any]:
+    """Ejecuta la distribución de recursos y extrae las métricas registradas."""
+    # La distribución no consulta el repositorio de procesos
+    respuesta = DistribuirRecursos(proceso_repository=None).execute(
+        DistribucionRecursosRequest(procesos=procesos, recursos=recursos, estrategia=estrategia)
+    )
+    return {
+        "costo_total": float(respuesta.costo_total),
+        "sin_asignar": len(respuesta.procesos_sin_asignar)
+    }
+
+
+def _medir(configuracion: ConfiguracionInstancia,
+           componente: str,
+           metodo: str,
+           ejecutar: Callable[[List[Proceso], List[Recurso]], Dict[str, Any]],
+           repeticiones: int,
+           medir_memoria: bool) -> ResultadoBenchmark:
+    """Cronometra un método sobre la instancia y, opcionalmente, mide su memoria pico."""
+    resultado = ResultadoBenchmark(
+        instancia=configuracion.nombre,
+        componente=componente,
+        metodo=metodo,
+        num_procesos=configuracion.num_procesos,
+        num_recursos=configuracion.num_recursos
+    )
+    logger.info(f"Midiendo {componente}/{metodo} en la instancia {configuracion.nombre}")
+
+    try:
+        tiempos = []
+        for _ in range(repeticiones):
+            procesos, recursos = generar_instancia(configuracion)
+            inicio = time.perf_counter()
+            metricas = ejecutar(procesos, recursos)
+            tiempos.append(time.perf_counter() - inicio)
+
+        resultado.tiempo_segundos = statistics.median(tiempos)
+        resultado.valor_objetivo = metricas.get("valor_objetivo")
+        resultado.costo_total = metricas.get("costo_total")
+        resultado.sin_asignar = metricas.get("sin_asignar")
+        resultado.optimo_demostrado = metricas.get("optimo_demostrado")
+
+        if medir_memoria:
+            procesos, recursos = generar_instancia(configuracion)
+            tracemalloc.start()
+            try:
+                ejecutar(procesos, recursos)
+                _, pico = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            resultado.memoria_pico_mb = pico / (1024 * 1024)
+
+    except Exception as e:
+        logger.error(f"Error midiendo {componente}/{metodo}: {str(e)}")
+        resultado.error = str(e)
+
+    return resultado
+
+
+def guardar_resultados(resultados: List[ResultadoBenchmark], ruta: str) -> None:
+    """
+    Guarda los resultados en JSON junto con los metadatos del entorno.
+
+    Args:
+        resultados: Mediciones a guardar
+        ruta: Ruta del archivo de salida
+    """
+    documento = {
+        "version_formato": VERSION_FORMATO,
+        "metadatos": _obtener_metadatos(),
+        "resultados": [asdict(r) for r in resultados]
+    }
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(documento, archivo, ensure_ascii=False, indent=2)
+
+
+def cargar_resultados(ruta: str) -> List[ResultadoBenchmark]:
+    """
+    Carga los resultados guardados por guardar_resultados.
+
+    Args:
+        ruta: Ruta del archivo de resultados
+
+    Returns:
+        List[ResultadoBenchmark]: Mediciones del archivo
+
+    Raises:
+        ValueError: Si el archivo tiene un formato no soportado
+    """
+    with open(ruta, "r", encoding="utf-8") as archivo:
+        documento = json.load(archivo)
+
+    if documento.get("version_formato") != VERSION_FORMATO:
+        raise ValueError(f"Formato de resultados no soportado: {documento.get('version_formato')}")
+
+    return [ResultadoBenchmark(**r) for r in documento["resultados"]]
+
+
+def comparar_resultados(base: List[ResultadoBenchmark],
+                        actual: List[ResultadoBenchmark],
+                        tolerancia_tiempo: float = 0.25,
+                        tolerancia_memoria: float = 0.25,
+                        tolerancia_objetivo: float = 1e-6) -> List[str]:
+    """
+    Compara dos ejecuciones y describe las regresiones encontradas.
+
+    Es una regresión que un método falle cuando antes no fallaba, que deje
+    más procesos sin asignar, que deje de demostrar un óptimo que antes
+    demostraba, que empeore (aumente) su valor objetivo o costo, o que su
+    tiempo o memoria crezcan más que la tolerancia relativa.
+
+    Args:
+        base: Mediciones de referencia
+        actual: Mediciones nuevas
+        tolerancia_tiempo: Aumento relativo de tiempo permitido
+        tolerancia_memoria: Aumento relativo de memoria permitido
+        tolerancia_objetivo: Aumento relativo de valor objetivo o costo permitido
+
+    Returns:
+        List[str]: Descripción de cada regresión (vacía si no hay)
+    """
+    referencia = {r.clave: r for r in base}
+    regresiones = []
+
+    for resultado in actual:
+        anterior = referencia.get(resultado.clave)
+        if anterior is None:
+            continue
+        nombre = "/".join(resultado.clave)
+
+        if resultado.error and not anterior.error:
+            regresiones.append(f"{nombre}: falla con '{resultado.error}'")
+            continue
+        if anterior.error:
+            continue
+
+        if (resultado.sin_asignar or 0) > (anterior.sin_asignar or 0):
+            regresiones.append(f"{nombre}: procesos sin asignar {anterior.sin_asignar} -> {resultado.sin_asignar}")
+
+        if anterior.optimo_demostrado and not resultado.optimo_demostrado:
+            regresiones.append(f"{nombre}: ya no demuestra el óptimo")
+
+        for campo, tolerancia in (("valor_objetivo", tolerancia_objetivo), ("costo_total", tolerancia_objetivo),
+                                  ("tiempo_segundos", tolerancia_tiempo), ("memoria_pico_mb", tolerancia_memoria)):
+            valor_anterior = getattr(anterior, campo)
+            valor_actual = getattr(resultado, campo)
+            if valor_anterior is None or valor_actual is None or not valor_anterior:
+                continue
+            if valor_actual > valor_anterior + tolerancia * abs(valor_anterior):
+                regresiones.append(f"{nombre}: {campo} {valor_anterior:.6g} -> {valor_actual:.6g}")
+
+    return regresiones
+
+
+def _obtener_metadatos() -> Dict[str, Any]:
+    """Describe el entorno y el commit en que se midió."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "fecha": datetime.now().isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "plataforma": platform.platform()
+    }
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    """
+    Punto de entrada de línea de comandos.
+
+    Returns:
+        int: 1 si la comparación encontró regresiones, 0 en otro caso
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks del optimizador y la distribución de recursos")
+    parser.add_argument("--tamaños", nargs="+", choices=list(CONFIGURACIONES_PREDEFINIDAS),
+                        default=["pequeña", "exacta", "mediana"], help="Instancias predefinidas a medir")
+    parser.add_argument("--algoritmos", nargs="+", choices=[a.value for a in AlgoritmoOptimizacion],
+                        help="Algoritmos del optimizador (por defecto todos)")
+    parser.add_argument("--estrategias", nargs="+", choices=[e.value for e in EstrategiaDistribucion],
+                        help="Estrategias de distribución (por defecto todas)")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Ejecuciones cronometradas por método")
+    parser.add_argument("--tiempo-limite", type=float, default=30.0, help="Plazo en segundos por optimización")
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir la memoria pico")
+    parser.add_argument("--salida", default="resultados_benchmark.json", help="Archivo JSON de resultados")
+    parser.add_argument("--comparar", help="Archivo de resultados de referencia")
+    args = parser.parse_args(argumentos)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    resultados = ejecutar_benchmark(
+        [CONFIGURACIONES_PREDEFINIDAS[t] for t in args.tamaños],
+        algoritmos=[AlgoritmoOptimizacion(a) for a in args.algoritmos] if args.algoritmos else None,
+        estrategias=[EstrategiaDistribucion(e) for e in args.estrategias] if args.estrategias else None,
+        repeticiones=args.repeticiones,
+        medir_memoria=not args.sin_memoria,
+        tiempo_limite_segundos=args.tiempo_limite
+    )
+    guardar_resultados(resultados, args.salida)
+
+    for r in resultados:
+        estado = f"ERROR: {r.error}" if r.error else (
+            f"{r.tiempo_segundos:.4f}s  {r.memoria_pico_mb:.1f} MB  "
+            f"objetivo={r.valor_objetivo}  costo={r.costo_total}  sin_asignar={r.sin_asignar}"
+            + (f"  optimo={r.optimo_demostrado}" if r.optimo_demostrado is not None else ""))
+        print(f"{r.instancia:<10} {r.componente:<12} {r.metodo:<20} {estado}")
+    print(f"\nResultados guardados en {args.salida}")
+
+    if args.comparar:
+        regresiones = comparar_resultados(cargar_resultados(args.comparar), resultados)
+        for regresion in regresiones:
+            print(f"REGRESIÓN {regresion}")
+        if regresiones:
+            return 1
+        print("Sin regresiones respecto a la referencia")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
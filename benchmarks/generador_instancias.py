@@ -0,0 +1,149 @@
+"""
+Generador de Instancias Sintéticas
+
+Este módulo construye listas de Proceso y Recurso del dominio a partir
+de una configuración con semilla, de modo que la misma configuración
+produce siempre la misma instancia. Permite variar el tamaño, la
+densidad de habilidades, la dispersión de costos y la holgura de
+capacidad para cubrir desde planes holgados hasta planes ajustados.
+
+Autor: Equipo de Desarrollo
+Fecha: 2025-07-07
+"""
+
+from typing import Dict, List, Tuple
+from dataclasses import dataclass
+import numpy as np
+
+from domain.models.proceso import Proceso, TipoProceso, NivelPrioridad
+from domain.models.recurso import Recurso, TipoRecurso
+
+
+@dataclass
+class ConfiguracionInstancia:
+    """
+    Configuración de una instancia sintética.
+
+    Attributes:
+        nombre: Nombre de la instancia en los resultados
+        num_procesos: Número de procesos a generar
+        num_recursos: Número de recursos a generar
+        num_habilidades: Tamaño del catálogo de habilidades
+        densidad_habilidades: Probabilidad de que un recurso tenga cada habilidad (0-1]
+        dispersion_costos: Variación relativa del costo por hora alrededor de la media [0-1)
+        holgura_capacidad: Capacidad total de los recursos sobre las horas totales de los procesos
+        max_requisitos: Máximo de habilidades requeridas por proceso
+        semilla: Semilla del generador
+    """
+    nombre: str
+    num_procesos: int
+    num_recursos: int
+    num_habilidades: int = 10
+    densidad_habilidades: float = 0.3
+    dispersion_costos: float = 0.5
+    holgura_capacidad: float = 1.5
+    max_requisitos: int = 2
+    semilla: int = 42
+
+    def __post_init__(self):
+        """
+        Valida la configuración.
+
+        Raises:
+            ValueError: Si algún parámetro está fuera de rango
+        """
+        if self.num_procesos <= 0 or self.num_recursos <= 0:
+            raise ValueError("La instancia debe tener al menos un proceso y un recurso")
+
+        if self.num_habilidades <= 0:
+            raise ValueError("El número de habilidades debe ser mayor a 0")
+
+        if not 0 < self.densidad_habilidades <= 1:
+            raise ValueError("La densidad de habilidades debe estar en (0, 1]")
+
+        if not 0 <= self.dispersion_costos < 1:
+            raise ValueError("La dispersión de costos debe estar en [0, 1)")
+
+        if self.holgura_capacidad <= 0:
+            raise ValueError("La holgura de capacidad debe ser mayor a 0")
+
+        if self.max_requisitos < 0:
+            raise ValueError("El máximo de requisitos no puede ser negativo")
+
+
+# Instancias de referencia, de menor a mayor tamaño
+CONFIGURACIONES_PREDEFINIDAS: Dict[str, ConfiguracionInstancia] = {
+    "pequeña": ConfiguracionInstancia("pequeña", num_procesos=20, num_recursos=5),
+    # Capacidad ajustada a la medida de los métodos exactos (ramificación y acotación, MILP)
+    "exacta": ConfiguracionInstancia("exacta", num_procesos=60, num_recursos=10, holgura_capacidad=1.05),
+    "mediana": ConfiguracionInstancia("mediana", num_procesos=100, num_recursos=20),
+    "ajustada": ConfiguracionInstancia("ajustada", num_procesos=100, num_recursos=20,
+                                       holgura_capacidad=1.05, densidad_habilidades=0.15),
+    "grande": ConfiguracionInstancia("grande", num_procesos=500, num_recursos=50,
+                                     num_habilidades=25)
+}
+
+_COSTO_MEDIO_HORA = 50.0
+_DURACIONES_HORAS = np.arange(1.0, 8.5, 0.5)
+_PRIORIDADES = list(NivelPrioridad)
+
+
+def generar_instancia(configuracion: ConfiguracionInstancia) -> Tuple[List[Proceso], List[Recurso]]:
+    """
+    Genera los procesos y recursos de una instancia sintética.
+
+    Cada recurso recibe cada habilidad con probabilidad
+    densidad_habilidades (al menos una) y cada proceso requiere entre una
+    y max_requisitos habilidades del catálogo (ninguna si max_requisitos
+    es 0). La capacidad total de los
+    recursos es holgura_capacidad veces las horas totales de los procesos,
+    repartida de forma desigual entre ellos.
+
+    Args:
+        configuracion: Configuración de la instancia
+
+    Returns:
+        Tuple[List[Proceso], List[Recurso]]: Procesos y recursos generados
+    """
+    rng = np.random.default_rng(configuracion.semilla)
+    habilidades = [f"habilidad_{k}" for k in range(configuracion.num_habilidades)]
+
+    duraciones = rng.choice(_DURACIONES_HORAS, size=configuracion.num_procesos)
+    prioridades = rng.integers(len(_PRIORIDADES), size=configuracion.num_procesos)
+
+    procesos = []
+    for i in range(configuracion.num_procesos):
+        num_requisitos = int(rng.integers(min(1, configuracion.max_requisitos), configuracion.max_requisitos + 1))
+        requisitos = rng.choice(configuracion.num_habilidades, size=num_requisitos, replace=False)
+        procesos.append(Proceso(
+            id=f"P{i:05d}",
+            nombre=f"Proceso {i}",
+            descripcion="Proceso sintético de benchmark",
+            tipo=TipoProceso.RUTINARIO,
+            tiempo_estimado_horas=float(duraciones[i]),
+            prioridad=_PRIORIDADES[prioridades[i]],
+            recursos_requeridos=[habilidades[k] for k in requisitos]
+        ))
+
+    # Reparto desigual de la capacidad total entre los recursos
+    pesos = rng.uniform(0.5, 1.5, size=configuracion.num_recursos)
+    capacidades = configuracion.holgura_capacidad * duraciones.sum() * pesos / pesos.sum()
+    costos = _COSTO_MEDIO_HORA * (1 + configuracion.dispersion_costos *
+                                  rng.uniform(-1.0, 1.0, size=configuracion.num_recursos))
+
+    ofrecidas = rng.random((configuracion.num_recursos, configuracion.num_habilidades)) < configuracion.densidad_habilidades
+    ofrecidas[np.arange(configuracion.num_recursos),
+              rng.integers(configuracion.num_habilidades, size=configuracion.num_recursos)] = True
+
+    recursos = []
+    for j in range(configuracion.num_recursos):
+        recursos.append(Recurso(
+            id=f"R{j:05d}",
+            nombre=f"Recurso {j}",
+            tipo=TipoRecurso.HUMANO,
+            capacidad_maxima=round(float(capacidades[j]), 2),
+            costo_por_hora=round(float(costos[j]), 2),
+            habilidades=[habilidades[k] for k in np.flatnonzero(ofrecidas[j])]
+        ))
+
+    return procesos, recursos
@@ -16,7 +16,7 @@ Fecha: 2025-07-07
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 from enum import Enum
 import uuid
 
@@ -358,16 +358,22 @@ class Proceso:
         
         return datetime.now() > self.fecha_limite
     
-    def puede_ejecutarse(self) -> bool:
+    def puede_ejecutarse(self, procesos_completados: Optional[Set[str]] = None) -> bool:
         """
         Verifica si el proceso puede ejecutarse (no tiene dependencias pendientes).
         
+        Args:
+            procesos_completados: IDs de los procesos ya completados; sin
+                ellos, cualquier dependencia se considera pendiente
+        
         Returns:
-            bool: True si el proceso puede ejecutarse
+            bool: True si el proceso está pendiente y todas sus dependencias se completaron
         """
-        # Por simplicidad, asumimos que puede ejecutarse si está pendiente
-        # En una implementación real, se verificarían las dependencias
-        return self.estado == EstadoProceso.PENDIENTE
+        if self.estado != EstadoProceso.PENDIENTE:
+            return False
+        
+        completados = procesos_completados or set()
+        return all(dependencia in completados for dependencia in self.dependencias)
     
     def tiempo_restante_estimado(self) -> Optional[float]:
         """
@@ -390,10 +396,14 @@ class Proceso:
         
         return None
     
-    def obtener_resumen(self) -> Dict[str, Any]:
+    def obtener_resumen(self, procesos_completados: Optional[Set[str]] = None) -> Dict[str, Any]:
         """
         Obtiene un resumen del proceso para reportes.
         
+        Args:
+            procesos_completados: IDs de los procesos ya completados, para
+                evaluar si el proceso puede ejecutarse
+        
         Returns:
             Dict[str, Any]: Resumen del proceso
         """
@@ -407,7 +417,7 @@ class Proceso:
             "tiempo_real": self.tiempo_real_horas,
             "progreso": self.calcular_progreso(),
             "vencido": self.esta_vencido(),
-            "puede_ejecutarse": self.puede_ejecutarse(),
+            "puede_ejecutarse": self.puede_ejecutarse(procesos_completados),
             "recursos_requeridos": self.recursos_requeridos,
             "fecha_creacion": self.fecha_creacion.isoformat() if self.fecha_creacion else None,
             "fecha_limite": self.fecha_limite.isoformat() if self.fecha_limite else None,
@@ -239,8 +239,9 @@ class SQLAlchemyProcesoRepository(ProcesoRepository):
             List[Proceso]: Lista de procesos ejecutables
         """
         try:
-            # Por simplicidad, devolvemos los procesos pendientes
-            return self.obtener_por_estado(EstadoProceso.PENDIENTE)
+            completados = {p.id for p in self.obtener_por_estado(EstadoProceso.COMPLETADO)}
+            pendientes = self.obtener_por_estado(EstadoProceso.PENDIENTE)
+            return [p for p in pendientes if p.puede_ejecutarse(completados)]
         except Exception as e:
             raise RepositoryError(f"Error al obtener procesos ejecutables: {str(e)}")
     
@@ -8,7 +8,7 @@ capacidad, distribución de recursos y generación de planes optimizados.
 Endpoints disponibles:
 - POST /capacidad: Calcular capacidad semanal
 - POST /distribuir: Distribuir recursos entre procesos
-- POST /optimizar: Optimizar asignaciones usando algoritmos avanzados
+- POST /optimizar: Optimizar asignaciones usando algoritmos avanzados (opcionalmente como Server-Sent Events)
 - GET /planes: Listar planes guardados
 - POST /planes: Guardar plan de trabajo
 - GET /reportes: Generar reportes de planificación
@@ -17,25 +17,31 @@ Autor: Equipo de Desarrollo
 Fecha: 2025-07-07
 """
 
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException
+from typing import List, Optional, Dict, Any, Iterator
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from datetime import datetime, time
+from sqlalchemy.orm import Session
+from datetime import date, datetime, time
+import json
 import logging
 
 # Importar casos de uso y modelos
 from app.use_cases.calcular_capacidad import (
-    CapacidadSemanalRequest, CapacidadSemanalResponse
+    CalcularCapacidadSemanal, CapacidadSemanalRequest
 )
 from app.use_cases.distribuir_recursos import (
-    DistribucionRecursosRequest, DistribucionRecursosResponse,
-    EstrategiaDistribucion, RestriccionDistribucion, AsignacionRecurso
+    DistribuirRecursos, DistribucionRecursosRequest,
+    EstrategiaDistribucion, RestriccionDistribucion
 )
 from app.services.optimizador import (
-    OptimizadorRecursos, ParametrosOptimizacion, AlgoritmoOptimizacion, SolucionOptimizada
+    OptimizadorRecursos, ParametrosOptimizacion, AlgoritmoOptimizacion, SolucionOptimizada, SolucionParcial
 )
 from domain.models.proceso import Proceso, TipoProceso, NivelPrioridad
 from domain.models.recurso import Recurso, TipoRecurso, HorarioTrabajo
+from infrastructure.database.config import get_db
+from infrastructure.repositories.proceso_repository_impl import SQLAlchemyProcesoRepository
 
 
 # Configuración de logging
@@ -83,7 +89,9 @@ def estrategia_distribucion_from_string(estrategia_str: str) -> EstrategiaDistri
         "eficiencia": EstrategiaDistribucion.EFICIENCIA,
         "costo_minimo": EstrategiaDistribucion.COSTO_MINIMO,
         "tiempo_minimo": EstrategiaDistribucion.TIEMPO_MINIMO,
-        "balanceada": EstrategiaDistribucion.BALANCEADA
+        "balanceada": EstrategiaDistribucion.BALANCEADA,
+        "fecha_limite": EstrategiaDistribucion.FECHA_LIMITE,
+        "menor_holgura": EstrategiaDistribucion.MENOR_HOLGURA
     }
     return estrategia_map.get(estrategia_str.lower(), EstrategiaDistribucion.BALANCEADA)
 
@@ -99,6 +107,11 @@ def algoritmo_optimizacion_from_string(algoritmo_str: str) -> AlgoritmoOptimizac
     }
     return algoritmo_map.get(algoritmo_str.lower(), AlgoritmoOptimizacion.GREEDY)
 
+
+def obtener_proceso_repository(db: Session = Depends(get_db)) -> SQLAlchemyProcesoRepository:
+    """Repositorio de procesos sobre la sesión de la petición"""
+    return SQLAlchemyProcesoRepository(db)
+
 # Crear router
 router = APIRouter()
 
@@ -130,6 +143,7 @@ class CapacidadRequest(BaseModel):
     fecha_fin: datetime
     recursos: List[RecursoSimple]
     restricciones: Optional[Dict[str, Any]] = None
+    feriados: List[date] = Field(default_factory=list)
 
 
 class CapacidadResponse(BaseModel):
@@ -140,6 +154,7 @@ class CapacidadResponse(BaseModel):
     tiempo_total_requerido: float
     eficiencia_proyectada: float
     recomendaciones: List[str]
+    cota_superior_procesos: Optional[int] = None
 
 
 class DistribucionRequest(BaseModel):
@@ -149,6 +164,7 @@ class DistribucionRequest(BaseModel):
     estrategia: str = "balanceada"
     fecha_inicio: Optional[datetime] = None
     restricciones: Optional[Dict[str, Any]] = None
+    feriados: List[date] = Field(default_factory=list)
 
 
 class AsignacionResponse(BaseModel):
@@ -179,6 +195,7 @@ class OptimizacionRequest(BaseModel):
     recursos: List[RecursoSimple]
     algoritmo: str = "greedy"
     parametros: Optional[Dict[str, Any]] = None
+    stream: bool = False  # Emitir incumbentes como Server-Sent Events
 
 
 class OptimizacionResponse(BaseModel):
@@ -213,12 +230,14 @@ class ReporteRequest(BaseModel):
 # Endpoints
 
 @router.post("/capacidad", response_model=CapacidadResponse)
-async def calcular_capacidad(request: CapacidadRequest):
+async def calcular_capacidad(request: CapacidadRequest, 
+                             proceso_repository: SQLAlchemyProcesoRepository = Depends(obtener_proceso_repository)):
     """
     Calcula la capacidad semanal de procesamiento.
     
     Args:
         request: Datos para el cálculo de capacidad
+        proceso_repository: Repositorio de los procesos activos a planificar
         
     Returns:
         CapacidadResponse: Resultado del cálculo
@@ -251,25 +270,13 @@ async def calcular_capacidad(request: CapacidadRequest):
             fecha_inicio=request.fecha_inicio,
             fecha_fin=request.fecha_fin,
             recursos_disponibles=recursos,
-            restricciones=request.restricciones
+            restricciones=request.restricciones,
+            feriados=request.feriados
         )
         
-        # Ejecutar caso de uso
-        # caso_uso = CalcularCapacidadSemanal(proceso_repository)
-        # resultado = caso_uso.execute(capacidad_request)
-        
-        # Simular resultado
-        resultado = CapacidadSemanalResponse(
-            total_procesos_posibles=20,
-            capacidad_por_recurso={r.nombre: 5 for r in recursos},
-            tiempo_total_disponible=160.0,
-            tiempo_total_requerido=120.0,
-            eficiencia_proyectada=75.0,
-            recomendaciones=[
-                "La eficiencia es buena. Considere planificar procesos adicionales.",
-                "Distribución balanceada entre recursos."
-            ]
-        )
+        # Ejecutar caso de uso; el empaquetado es intensivo en CPU y se ejecuta fuera del bucle de eventos
+        caso_uso = CalcularCapacidadSemanal(proceso_repository)
+        resultado = await run_in_threadpool(caso_uso.execute, capacidad_request)
         
         response = CapacidadResponse(
             total_procesos_posibles=resultado.total_procesos_posibles,
@@ -277,7 +284,8 @@ async def calcular_capacidad(request: CapacidadRequest):
             tiempo_total_disponible=resultado.tiempo_total_disponible,
             tiempo_total_requerido=resultado.tiempo_total_requerido,
             eficiencia_proyectada=resultado.eficiencia_proyectada,
-            recomendaciones=resultado.recomendaciones
+            recomendaciones=resultado.recomendaciones,
+            cota_superior_procesos=resultado.cota_superior_procesos
         )
         
         logger.info(f"Capacidad calculada: {resultado.total_procesos_posibles} procesos posibles")
@@ -292,12 +300,14 @@ async def calcular_capacidad(request: CapacidadRequest):
 
 
 @router.post("/distribuir", response_model=DistribucionResponse)
-async def distribuir_recursos(request: DistribucionRequest):
+async def distribuir_recursos(request: DistribucionRequest, 
+                              proceso_repository: SQLAlchemyProcesoRepository = Depends(obtener_proceso_repository)):
     """
     Distribuye recursos entre procesos usando la estrategia especificada.
     
     Args:
         request: Datos para la distribución
+        proceso_repository: Repositorio de procesos del caso de uso
         
     Returns:
         DistribucionResponse: Resultado de la distribución
@@ -336,39 +346,13 @@ async def distribuir_recursos(request: DistribucionRequest):
             recursos=recursos,
             estrategia=estrategia_distribucion_from_string(request.estrategia),
             fecha_inicio=request.fecha_inicio or datetime.now(),
-            restricciones=RestriccionDistribucion() if not request.restricciones else None
+            restricciones=RestriccionDistribucion(**request.restricciones) if request.restricciones else RestriccionDistribucion(),
+            feriados=request.feriados
         )
         
-        # Ejecutar caso de uso
-        # caso_uso = DistribuirRecursos(proceso_repository)
-        # resultado = caso_uso.execute(distribucion_request)
-        
-        # Simular resultado
-        asignaciones_simuladas: List[AsignacionRecurso] = []
-        for i, proceso in enumerate(procesos[:min(len(procesos), len(recursos))]):
-            recurso = recursos[i % len(recursos)]
-            asignacion = AsignacionRecurso(
-                proceso_id=proceso.id,
-                recurso_id=recurso.id,
-                horas_asignadas=proceso.tiempo_estimado_horas,
-                fecha_inicio=datetime.now(),
-                fecha_fin=datetime.now(),
-                prioridad=proceso.prioridad.value,
-                costo_estimado=proceso.tiempo_estimado_horas * recurso.costo_por_hora
-            )
-            asignaciones_simuladas.append(asignacion)
-        
-        resultado = DistribucionRecursosResponse(
-            asignaciones=asignaciones_simuladas,
-            procesos_asignados=len(asignaciones_simuladas),
-            procesos_sin_asignar=[],
-            recursos_utilizados=min(len(recursos), len(procesos)),
-            eficiencia_estimada=85.0,
-            costo_total=sum(a.costo_estimado for a in asignaciones_simuladas),
-            tiempo_total=40.0,
-            recomendaciones=["Distribución óptima encontrada"],
-            metricas={"eficiencia": 85.0}
-        )
+        # Ejecutar caso de uso fuera del bucle de eventos
+        caso_uso = DistribuirRecursos(proceso_repository)
+        resultado = await run_in_threadpool(caso_uso.execute, distribucion_request)
         
         # Convertir a response
         asignaciones_response = [
@@ -405,11 +389,74 @@ async def distribuir_recursos(request: DistribucionRequest):
         )
 
 
+def _crear_respuesta_optimizacion(resultado: SolucionOptimizada) -> OptimizacionResponse:
+    """Convierte una solución del optimizador al modelo de respuesta."""
+    asignaciones_response = [
+        AsignacionResponse(
+            proceso_id=a.proceso_id,
+            recurso_id=a.recurso_id,
+            horas_asignadas=a.horas_asignadas,
+            fecha_inicio=a.fecha_inicio,
+            fecha_fin=a.fecha_fin,
+            costo_estimado=a.costo_estimado
+        )
+        for a in resultado.asignaciones
+    ]
+    
+    return OptimizacionResponse(
+        asignaciones=asignaciones_response,
+        valor_objetivo=resultado.valor_objetivo,
+        tiempo_ejecucion=resultado.tiempo_ejecucion,
+        iteraciones=resultado.iteraciones,
+        convergencia=resultado.convergencia,
+        metricas=resultado.metricas
+    )
+
+
+def _evento_sse(evento: str, datos: Dict[str, Any]) -> str:
+    """Formatea un evento Server-Sent Events."""
+    return f"event: {evento}\ndata: {json.dumps(datos, default=str)}\n\n"
+
+
+def _eventos_optimizacion(optimizador: OptimizadorRecursos, 
+                          procesos: List[Proceso], 
+                          recursos: List[Recurso], 
+                          parametros: ParametrosOptimizacion) -> Iterator[str]:
+    """
+    Emite los incumbentes de la optimización como Server-Sent Events.
+    
+    Cada mejora produce un evento "incumbente" y al terminar se emite
+    "solucion" con la respuesta completa. Si el cliente se desconecta, el
+    generador se cierra y la optimización se detiene.
+    """
+    try:
+        for elemento in optimizador.iterar_soluciones(procesos, recursos, parametros):
+            if isinstance(elemento, SolucionParcial):
+                yield _evento_sse("incumbente", {
+                    "valor_objetivo": elemento.valor_objetivo,
+                    "tiempo_transcurrido": elemento.tiempo_transcurrido,
+                    "iteracion": elemento.iteracion,
+                    "procesos_asignados": int((elemento.asignacion >= 0).sum())
+                })
+            else:
+                yield _evento_sse("solucion", _crear_respuesta_optimizacion(elemento).model_dump(mode="json"))
+    except Exception as e:
+        logger.error(f"Error optimizando asignaciones: {str(e)}")
+        yield _evento_sse("error", {"detail": f"Error interno al optimizar asignaciones: {str(e)}"})
+
+
 @router.post("/optimizar", response_model=OptimizacionResponse)
 async def optimizar_asignaciones(request: OptimizacionRequest):
     """
     Optimiza las asignaciones usando algoritmos avanzados.
     
+    Con request.stream la respuesta es un flujo text/event-stream con un
+    evento "incumbente" por cada mejora (valor objetivo y tiempo
+    transcurrido) y un evento final "solucion". El parámetro
+    "tiempo_limite_segundos" acota la latencia en ambos modos. Con el
+    algoritmo "lineal", el parámetro "programacion_entera" resuelve el
+    modelo binario (MILP) en lugar de redondear la relajación continua.
+    
     Args:
         request: Datos para la optimización
         
@@ -429,6 +476,7 @@ async def optimizar_asignaciones(request: OptimizacionRequest):
                 tiempo_estimado_horas=p.tiempo_estimado_horas,
                 prioridad=prioridad_from_string(p.prioridad)
             )
+            proceso.recursos_requeridos = p.recursos_requeridos
             procesos.append(proceso)
         
         recursos: List[Recurso] = []
@@ -439,66 +487,34 @@ async def optimizar_asignaciones(request: OptimizacionRequest):
                 capacidad_maxima=r.capacidad_maxima
             )
             recurso.costo_por_hora = r.costo_por_hora
+            recurso.habilidades = r.habilidades
             recursos.append(recurso)
         
         # Configurar parámetros de optimización
+        opciones = request.parametros or {}
         parametros = ParametrosOptimizacion(
             algoritmo=algoritmo_optimizacion_from_string(request.algoritmo),
-            max_iteraciones=request.parametros.get("max_iteraciones", 1000) if request.parametros else 1000,
-            peso_costo=request.parametros.get("peso_costo", 0.4) if request.parametros else 0.4,
-            peso_tiempo=request.parametros.get("peso_tiempo", 0.3) if request.parametros else 0.3,
-            peso_eficiencia=request.parametros.get("peso_eficiencia", 0.3) if request.parametros else 0.3
+            max_iteraciones=opciones.get("max_iteraciones", 1000),
+            peso_costo=opciones.get("peso_costo", 0.4),
+            peso_tiempo=opciones.get("peso_tiempo", 0.3),
+            peso_eficiencia=opciones.get("peso_eficiencia", 0.3),
+            semilla_aleatoria=opciones.get("semilla_aleatoria"),
+            tiempo_limite_segundos=opciones.get("tiempo_limite_segundos"),
+            programacion_entera=opciones.get("programacion_entera", False)
         )
         
         # Ejecutar optimización
         optimizador = OptimizadorRecursos()
-        # resultado = optimizador.optimizar_asignaciones(procesos, recursos, parametros)
-        
-        # Simular resultado
-        asignaciones_optimizadas: List[AsignacionRecurso] = []
-        for i, proceso in enumerate(procesos[:min(len(procesos), len(recursos))]):
-            recurso = recursos[i % len(recursos)]
-            asignacion = AsignacionRecurso(
-                proceso_id=proceso.id,
-                recurso_id=recurso.id,
-                horas_asignadas=proceso.tiempo_estimado_horas,
-                fecha_inicio=datetime.now(),
-                fecha_fin=datetime.now(),
-                prioridad=proceso.prioridad.value,
-                costo_estimado=proceso.tiempo_estimado_horas * recurso.costo_por_hora
+        if request.stream:
+            return StreamingResponse(
+                _eventos_optimizacion(optimizador, procesos, recursos, parametros),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache"}
             )
-            asignaciones_optimizadas.append(asignacion)
-        
-        resultado = SolucionOptimizada(
-            asignaciones=asignaciones_optimizadas,
-            valor_objetivo=100.5,
-            tiempo_ejecucion=0.5,
-            iteraciones=50,
-            convergencia=True,
-            metricas={"eficiencia": 90.0, "costo_total": 1000.0}
-        )
         
-        # Convertir a response
-        asignaciones_response = [
-            AsignacionResponse(
-                proceso_id=a.proceso_id,
-                recurso_id=a.recurso_id,
-                horas_asignadas=a.horas_asignadas,
-                fecha_inicio=a.fecha_inicio,
-                fecha_fin=a.fecha_fin,
-                costo_estimado=a.costo_estimado
-            )
-            for a in resultado.asignaciones
-        ]
-        
-        response = OptimizacionResponse(
-            asignaciones=asignaciones_response,
-            valor_objetivo=resultado.valor_objetivo,
-            tiempo_ejecucion=resultado.tiempo_ejecucion,
-            iteraciones=resultado.iteraciones,
-            convergencia=resultado.convergencia,
-            metricas=resultado.metricas
-        )
+        # El cálculo es intensivo en CPU: se ejecuta fuera del bucle de eventos
+        resultado = await run_in_threadpool(optimizador.optimizar_asignaciones, procesos, recursos, parametros)
+        response = _crear_respuesta_optimizacion(resultado)
         
         logger.info(f"Optimización completada en {resultado.tiempo_ejecucion:.2f}s")
         return response
@@ -18,10 +18,11 @@ Autor: Equipo de Desarrollo
 Fecha: 2025-07-07
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
 from datetime import datetime
 import logging
 import tempfile
@@ -59,6 +60,12 @@ def tipo_to_string(tipo: TipoProceso) -> str:
     """Convierte enum de tipo a string"""
     return tipo.value
 
+
+def obtener_procesos_completados(db: Session = Depends(get_db)) -> Set[str]:
+    """IDs de los procesos completados, para evaluar sus dependencias"""
+    repositorio = SQLAlchemyProcesoRepository(db)
+    return {proceso.id for proceso in repositorio.obtener_por_estado(EstadoProceso.COMPLETADO)}
+
 # Crear router
 router = APIRouter()
 
@@ -217,12 +224,14 @@ async def listar_procesos(
 
 
 @router.post("/", response_model=ProcesoResponse)
-async def crear_proceso(proceso_data: ProcesoRequest):
+async def crear_proceso(proceso_data: ProcesoRequest, 
+                        procesos_completados: Set[str] = Depends(obtener_procesos_completados)):
     """
     Crea un nuevo proceso.
     
     Args:
         proceso_data: Datos del proceso a crear
+        procesos_completados: IDs de los procesos completados
         
     Returns:
         ProcesoResponse: Proceso creado
@@ -297,7 +306,7 @@ async def crear_proceso(proceso_data: ProcesoRequest):
             asignado_a=proceso.asignado_a,
             notas=proceso.notas,
             progreso=proceso.calcular_progreso(),
-            puede_ejecutarse=proceso.puede_ejecutarse(),
+            puede_ejecutarse=proceso.puede_ejecutarse(procesos_completados),
             vencido=proceso.esta_vencido()
         )
         
@@ -315,12 +324,14 @@ async def crear_proceso(proceso_data: ProcesoRequest):
 
 
 @router.get("/{proceso_id}", response_model=ProcesoResponse)
-async def obtener_proceso(proceso_id: str):
+async def obtener_proceso(proceso_id: str, 
+                          procesos_completados: Set[str] = Depends(obtener_procesos_completados)):
     """
     Obtiene un proceso específico por ID.
     
     Args:
         proceso_id: ID del proceso a obtener
+        procesos_completados: IDs de los procesos completados
         
     Returns:
         ProcesoResponse: Proceso encontrado
@@ -365,7 +376,7 @@ async def obtener_proceso(proceso_id: str):
             asignado_a=proceso.asignado_a,
             notas=proceso.notas,
             progreso=proceso.calcular_progreso(),
-            puede_ejecutarse=proceso.puede_ejecutarse(),
+            puede_ejecutarse=proceso.puede_ejecutarse(procesos_completados),
             vencido=proceso.esta_vencido()
         )
         
@@ -382,13 +393,16 @@ async def obtener_proceso(proceso_id: str):
 
 
 @router.put("/{proceso_id}", response_model=ProcesoResponse)
-async def actualizar_proceso(proceso_id: str, proceso_data: ProcesoRequest):
+async def actualizar_proceso(proceso_id: str, 
+                             proceso_data: ProcesoRequest, 
+                             procesos_completados: Set[str] = Depends(obtener_procesos_completados)):
     """
     Actualiza un proceso existente.
     
     Args:
         proceso_id: ID del proceso a actualizar
         proceso_data: Nuevos datos del proceso
+        procesos_completados: IDs de los procesos completados
         
     Returns:
         ProcesoResponse: Proceso actualizado
@@ -428,7 +442,7 @@ async def actualizar_proceso(proceso_id: str, proceso_data: ProcesoRequest):
             asignado_a=proceso.asignado_a,
             notas=proceso.notas,
             progreso=proceso.calcular_progreso(),
-            puede_ejecutarse=proceso.puede_ejecutarse(),
+            puede_ejecutarse=proceso.puede_ejecutarse(procesos_completados),
             vencido=proceso.esta_vencido()
         )
         